@@ -69,10 +69,11 @@ const CourseDetailPage = () => {
     };
     setStatus('');
     try {
-      await updateStudentGrades(courseId, studentId, payload, token);
+      const updated = await updateStudentGrades(courseId, studentId, payload, token);
       setUsingMockData(false);
+      // The server's grades, which average a category with several scores.
       setStudents((prev) =>
-        prev.map((stu) => (stu.id === studentId ? { ...stu, grades: payload } : stu))
+        prev.map((stu) => (stu.id === studentId ? { ...stu, ...updated } : stu))
       );
       setEditing((prev) => {
         const next = { ...prev };
@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 
+from .sqlite import connection_options
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,6 +47,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'users.timing.ServerTimingMiddleware',
+    'users.routers.ReplicaReadsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -107,15 +111,69 @@ TEMPLATES = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedTokenAuthentication',
+        'users.authentication.ClaimsJWTAuthentication',
     ),
+    # Sliding-window limits for the password-hashing endpoints (users/throttling.py).
+    'DEFAULT_THROTTLE_RATES': {
+        'hashing_ip': '60/min',
+        'login_identity': '10/min',
+    },
 }
 
 AUTH_USER_MODEL = 'users.CustomUser'
 
+AUTHENTICATION_BACKENDS = [
+    'users.backends.EmailOrUsernameBackend',
+]
+
+# In-process LRU of rendered dashboard payloads (see users/cache.py).
+# Set DASHBOARD_CACHE_MAX_ENTRIES to 0 to disable it.
+DASHBOARD_CACHE_MAX_ENTRIES = 2048
+DASHBOARD_CACHE_TIMEOUT = 300  # seconds
+
+# Token -> user snapshots kept by users.authentication.CachedTokenAuthentication.
+# Logout and user saves evict entries in the worker that handled them; the
+# timeout bounds how long other workers may still accept a revoked token.
+TOKEN_AUTH_CACHE_MAX_ENTRIES = 10000
+TOKEN_AUTH_CACHE_TIMEOUT = 60  # seconds
+
+# How long a worker keeps the resolved active Semester. Saves in the same
+# process drop it immediately; other workers pick the change up within this.
+ACTIVE_SEMESTER_CACHE_TIMEOUT = 300  # seconds
+
+# Per-course assessment statistics (users/statistics.py), dropped whenever the
+# course's scores or enrollments change.
+STATISTICS_CACHE_MAX_ENTRIES = 1024
+STATISTICS_CACHE_TIMEOUT = 300  # seconds
+
+# At most this many requests per process hash a password at once (login,
+# registration, JWT obtain); the rest get 429 with Retry-After immediately.
+PASSWORD_HASHING_SLOTS = 4
+PASSWORD_HASHING_RETRY_AFTER = 1  # seconds
+THROTTLE_MAX_KEYS = 50000
+
+# Server-Timing headers (db/auth/view/render/total) on every response, and a
+# warning on the users.timing logger with the most repeated SQL for requests
+# slower than SERVER_TIMING_SLOW_MS.
+SERVER_TIMING_ENABLED = False
+SERVER_TIMING_SLOW_MS = 500
+
+# Opt-in keyset pagination for course rosters (?page_size=N / ?cursor=...).
+ROSTER_PAGE_SIZE = 50
+ROSTER_MAX_PAGE_SIZE = 500
+
+# Rows fetched per round trip when rosters are streamed with ?stream=1.
+STREAMING_CHUNK_SIZE = 500
+
 WSGI_APPLICATION = 'reactauth.wsgi.application'
 
+# Serve the student and lecturer dashboards and the course roster GET from their
+# async views. Turn on only when deploying reactauth.asgi: under WSGI every
+# request to them would spin up its own event loop. Compare the two with
+# `manage.py benchmark_asgi` before switching.
+ASYNC_VIEWS = False
+
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -124,9 +182,39 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests, checked before each reuse. Under
+        # ASGI each request's queries run on a new thread, so nothing is reused.
+        'CONN_MAX_AGE': 0 if ASYNC_VIEWS else 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Optional read replica for dashboard and roster GETs (users/routers.py). The
+# stand-in is a second SQLite file, opened read-only and refreshed from the
+# primary by `manage.py sync_replica --interval N`, so replica reads lag by up
+# to N seconds. Payloads read from it skip the dashboard and statistics caches,
+# which would otherwise keep a pre-sync copy after the sync. None sends every
+# query to default.
+DATABASE_REPLICA_PATH = None  # e.g. BASE_DIR / 'db.replica.sqlite3'
+DATABASE_REPLICA = 'replica' if DATABASE_REPLICA_PATH else None
+if DATABASE_REPLICA:
+    DATABASES[DATABASE_REPLICA] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f'file:{DATABASE_REPLICA_PATH}?mode=ro',
+        'CONN_MAX_AGE': 0 if ASYNC_VIEWS else 60,
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['users.routers.ReplicaRouter']
+
+# WAL journaling, synchronous=NORMAL, busy_timeout, a larger page cache, mmap
+# and in-memory temp tables on every connection, plus BEGIN IMMEDIATE
+# transactions (see reactauth/sqlite.py). Switches the database file to WAL,
+# which persists until it is turned off again.
+SQLITE_PERFORMANCE_PROFILE = False
+if SQLITE_PERFORMANCE_PROFILE:
+    DATABASES['default']['OPTIONS'] = connection_options()
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CustomUser, Course, CourseSchedule, Enrollment, Score
+from .models import ArchivedEnrollment, CustomUser, Course, CourseSchedule, Enrollment, GradeSummary, Score, Semester
 from django.contrib.auth.admin import UserAdmin
 
 
@@ -29,5 +29,8 @@ class CustomUserAdmin(UserAdmin):
 admin.site.register(CustomUser, CustomUserAdmin)
 admin.site.register(Course)
 admin.site.register(CourseSchedule)
+admin.site.register(Semester)
 admin.site.register(Enrollment)
-admin.site.register(Score)
\ No newline at end of file
+admin.site.register(Score)
+admin.site.register(GradeSummary)
+admin.site.register(ArchivedEnrollment)
\ No newline at end of file
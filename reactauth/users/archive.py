@@ -0,0 +1,130 @@
+"""Hot/cold split of enrollments: closed semesters move to ArchivedEnrollment."""
+import json
+from datetime import date
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import dashboard_cache, statistics_cache
+from .models import ArchivedEnrollment, Enrollment, GradeSummary, Score, Semester, letter_grade
+
+
+def archivable_semesters(keep_previous=1, today=None):
+    """Closed semesters older than the active one and the ``keep_previous`` before it."""
+    active = Semester.objects.active()
+    if active is None:
+        return []
+    kept = list(
+        Semester.objects.filter(start_date__lt=active.start_date)
+        .order_by('-start_date')
+        .values_list('pk', flat=True)[:keep_previous]
+    )
+    return list(
+        Semester.objects.filter(start_date__lt=active.start_date, end_date__lt=today or date.today())
+        .exclude(pk__in=kept)
+        .order_by('start_date')
+    )
+
+
+def archive_semester(semester, batch_size=500):
+    """Move every live enrollment of ``semester``, with its scores and summary, into the archive.
+
+    Each batch is copied and deleted in one transaction. Archive rows are
+    written with executemany (bulk_create spends most of its time preparing
+    values), and the live rows are removed with raw DELETEs, because Score and
+    Enrollment deletes through the ORM would refresh summaries and fire cache
+    receivers once per row; the affected caches are dropped here instead.
+    """
+    quote = connection.ops.quote_name
+    fields = ['student', 'course', 'semester', 'enrollment_date', 'classwork', 'midterm', 'finals',
+              'weighted_total', 'scores', 'archived_at']
+    columns = ', '.join(quote(ArchivedEnrollment._meta.get_field(field).column) for field in fields)
+    insert = (
+        f'INSERT INTO {quote(ArchivedEnrollment._meta.db_table)} ({columns}) '
+        f"VALUES ({', '.join(['%s'] * len(fields))})"
+    )
+    archived = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                Enrollment.objects.filter(semester=semester)
+                .order_by('pk')
+                .values_list(
+                    'pk', 'student_id', 'course_id', 'course__lecturer_id', 'enrollment_date',
+                    'grade_summary__classwork', 'grade_summary__midterm', 'grade_summary__finals',
+                    'grade_summary__weighted_total',
+                )[:batch_size]
+            )
+            if not rows:
+                return archived
+            enrollment_ids = [row[0] for row in rows]
+
+            scores = {}
+            for enrollment_id, name, score, weight in (
+                Score.objects.filter(enrollment_id__in=enrollment_ids)
+                .order_by('enrollment_id', 'pk')
+                .values_list('enrollment_id', 'assessment_name', 'score', 'weight')
+            ):
+                scores.setdefault(enrollment_id, []).append([name, str(score), str(weight)])
+
+            now = connection.ops.adapt_datetimefield_value(timezone.now())
+            with connection.cursor() as cursor:
+                cursor.executemany(insert, [
+                    (student_id, course_id, semester.pk, connection.ops.adapt_datetimefield_value(enrollment_date),
+                     classwork or 0, midterm or 0, finals or 0, weighted_total or 0,
+                     json.dumps(scores.get(enrollment_id, [])), now)
+                    for (enrollment_id, student_id, course_id, _lecturer_id, enrollment_date,
+                         classwork, midterm, finals, weighted_total) in rows
+                ])
+            for model, lookup in ((Score, 'enrollment_id__in'), (GradeSummary, 'enrollment_id__in'),
+                                  (Enrollment, 'pk__in')):
+                model.objects.filter(**{lookup: enrollment_ids})._raw_delete(model.objects.db)
+
+        students = {row[1] for row in rows}
+        lecturers = {row[3] for row in rows}
+        dashboard_cache.invalidate_owners((students | lecturers) - {None})
+        statistics_cache.invalidate_owners({row[2] for row in rows})
+        archived += len(rows)
+
+
+def transcript(student):
+    """Every course the student took, live and archived, oldest semester first.
+
+    Two queries: live enrollments with their summary, then archived rows. Both
+    compute the letter grade with the same SQL CASE.
+    """
+    live = (
+        Enrollment.objects.filter(student=student)
+        .with_final_grade()
+        .select_related('course', 'semester', 'grade_summary')
+    )
+    archived = (
+        ArchivedEnrollment.objects.filter(student=student)
+        .annotate(letter_grade=letter_grade('weighted_total'))
+        .select_related('course', 'semester')
+    )
+    entries = []
+    for enrollment in live:
+        summary = getattr(enrollment, 'grade_summary', None)
+        grades = summary.as_grades() if summary else {'classwork': 0, 'midterm': 0, 'finals': 0}
+        entries.append((enrollment, grades, enrollment.final_total, False))
+    for enrollment in archived:
+        total = enrollment.weighted_total
+        if not enrollment.scores:
+            # Ungraded, as with_final_grade() reports the live row.
+            total = enrollment.letter_grade = None
+        entries.append((enrollment, enrollment.as_grades(), total, True))
+    entries.sort(key=lambda entry: (entry[0].semester.start_date, entry[0].course.code))
+
+    return [
+        {
+            'semester': enrollment.semester.name,
+            'code': enrollment.course.code,
+            'name': enrollment.course.name,
+            'grades': grades,
+            'weightedTotal': None if total is None else float(total),
+            'letterGrade': enrollment.letter_grade,
+            'archived': is_archived,
+        }
+        for enrollment, grades, total, is_archived in entries
+    ]
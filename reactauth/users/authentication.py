@@ -0,0 +1,174 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .cache import token_cache
+from .timing import timed
+
+User = get_user_model()
+
+# Columns kept per cached token. Anything else (password, last_login, ...) is
+# deferred and loaded from the database only if a view actually touches it.
+SNAPSHOT_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'full_name', 'major', 'role',
+    'is_active', 'is_staff', 'is_superuser', 'is_student', 'is_lecturer',
+)
+TOKEN_FIELDS = tuple(field.attname for field in Token._meta.concrete_fields)
+
+# JWT claims (see CustomTokenObtainPairSerializer.get_token) -> CustomUser columns.
+CLAIM_FIELDS = {
+    'username': 'username',
+    'email': 'email',
+    'full_name': 'full_name',
+    'major': 'major',
+    'role': 'role',
+    'is_staff': 'is_staff',
+    'is_student': 'is_student',
+    'is_lecturer': 'is_lecturer',
+}
+
+
+def user_from_columns(columns):
+    """An unsaved-looking CustomUser built from known column values; the rest stay deferred."""
+    field_names = [field.attname for field in User._meta.concrete_fields if field.attname in columns]
+    return User.from_db(DEFAULT_DB_ALIAS, field_names, [columns[name] for name in field_names])
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that remembers token -> user snapshots in ``token_cache``.
+
+    A hit builds a fresh ``CustomUser`` from the cached columns without a query.
+    ``users.signals`` evicts a token when it is deleted (logout) and every token
+    of a user whose row is saved, which covers deactivation.
+    """
+
+    def authenticate(self, request):
+        key = self.get_key(request)
+        if key is None:
+            return None
+        with timed('auth'):
+            return self.authenticate_credentials(key)
+
+    async def aauthenticate(self, request):
+        """``authenticate()`` for async views; a cache miss loads the token with ``afirst()``."""
+        key = self.get_key(request)
+        if key is None:
+            return None
+        with timed('auth'):
+            cached = token_cache.get(key)
+            if cached is None:
+                cached = self._remember(key, await self._token_query(key).afirst())
+            return self._credentials(key, cached)
+
+    def get_key(self, request):
+        """The key from ``Authorization: Token <key>``, with TokenAuthentication's header checks."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) == 1:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+        if len(auth) > 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header. Token string should not contain invalid characters.')
+            )
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is None:
+            cached = self._remember(key, self._token_query(key).first())
+        return self._credentials(key, cached)
+
+    def _token_query(self, key):
+        return (
+            Token.objects.select_related('user')
+            .only('key', 'created', *(f'user__{field}' for field in SNAPSHOT_FIELDS))
+            .filter(key=key)
+        )
+
+    def _remember(self, key, token):
+        if token is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        cached = ({field: getattr(token.user, field) for field in SNAPSHOT_FIELDS}, token.created)
+        if token.user.is_active:
+            token_cache.set(key, cached, owner=token.user_id)
+        return cached
+
+    def _credentials(self, key, cached):
+        columns, created = cached
+        user = user_from_columns(columns)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+
+        token_values = {'key': key, 'user_id': user.pk, 'created': created}
+        token = Token.from_db(DEFAULT_DB_ALIAS, TOKEN_FIELDS, tuple(token_values[field] for field in TOKEN_FIELDS))
+        token.user = user
+        return (user, token)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that trusts the signed role claims instead of loading the user.
+
+    A request falls back to the regular database load when any of these hold:
+
+    * it is a write (not a safe method), so deactivated users cannot change data
+      while an already-issued access token is still valid;
+    * the token predates the role claims in ``CLAIM_FIELDS``;
+    * SIMPLE_JWT['CHECK_REVOKE_TOKEN'] is on, which needs the stored password hash.
+
+    Otherwise deactivation and role changes take effect when the access token
+    expires: the token/refresh/ endpoint (CustomTokenRefreshSerializer) reissues
+    the claims from the user row and refuses inactive users.
+    """
+
+    def authenticate(self, request):
+        raw_token = self.raw_token(request)
+        if raw_token is None:
+            return None
+
+        with timed('auth'):
+            validated_token = self.get_validated_token(raw_token)
+            if self.needs_database(request, validated_token):
+                return self.get_user(validated_token), validated_token
+            return self.user_from_claims(validated_token), validated_token
+
+    async def aauthenticate(self, request):
+        """``authenticate()`` for async views; only the database fallback leaves the event loop."""
+        raw_token = self.raw_token(request)
+        if raw_token is None:
+            return None
+
+        with timed('auth'):
+            validated_token = self.get_validated_token(raw_token)
+            if self.needs_database(request, validated_token):
+                return await sync_to_async(self.get_user)(validated_token), validated_token
+            return self.user_from_claims(validated_token), validated_token
+
+    def raw_token(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        return self.get_raw_token(header)
+
+    def needs_database(self, request, validated_token):
+        return (
+            request.method not in SAFE_METHODS
+            or jwt_settings.CHECK_REVOKE_TOKEN
+            or any(claim not in validated_token for claim in (jwt_settings.USER_ID_CLAIM, *CLAIM_FIELDS))
+        )
+
+    def user_from_claims(self, validated_token):
+        columns = {field: validated_token[claim] for claim, field in CLAIM_FIELDS.items()}
+        columns[jwt_settings.USER_ID_FIELD] = validated_token[jwt_settings.USER_ID_CLAIM]
+        columns['is_active'] = True
+        return user_from_columns(columns)
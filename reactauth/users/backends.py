@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+User = get_user_model()
+
+
+class EmailOrUsernameBackend(ModelBackend):
+    """Accepts a username or a case-insensitive email and hashes the password exactly once.
+
+    The user is resolved with one query against the username unique index and
+    the ``Lower(email)`` expression index; a username match wins if the
+    identifier happens to be both.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+
+        user = self.get_user_by_identifier(username.strip())
+        if user is None:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user (#20760).
+            User().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def get_user_by_identifier(self, identifier):
+        if '@' not in identifier:
+            return User._default_manager.filter(username=identifier).first()
+
+        candidates = (
+            User._default_manager.alias(email_lower=Lower('email'))
+            .filter(Q(username=identifier) | Q(email_lower=identifier.lower()))[:2]
+        )
+        return min(candidates, key=lambda user: user.username != identifier, default=None)
@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class ScopedLRUCache:
+    """Bounded in-process LRU with a TTL whose entries can be dropped per owner.
+
+    Every entry belongs to one owner: ``key[1]`` by default (a user id for
+    dashboard keys ``(kind, user id, semester, ...)``, a course id for statistics
+    keys ``('course', course id)``), or the ``owner`` passed to ``set()``.
+    Entries are evicted by the signal handlers in ``users.signals`` whenever a row
+    feeding them changes. Those signals only fire in the process that made the
+    write, so ``timeout`` bounds how long another worker can serve a stale copy.
+    """
+
+    def __init__(self, max_entries=1024, timeout=300):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._keys_by_owner = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._discard(key)
+            self.misses += 1
+            return None
+
+    def set(self, key, value, owner=None):
+        if self.max_entries <= 0:
+            return
+        if owner is None:
+            owner = key[1]
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (time.monotonic() + self.timeout, value, owner)
+            self._keys_by_owner.setdefault(owner, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+                self.invalidations += 1
+
+    def invalidate_owners(self, owners):
+        with self._lock:
+            for owner in owners:
+                for key in self._keys_by_owner.pop(owner, ()):
+                    if self._entries.pop(key, None) is not None:
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_owner.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        owner = entry[2]
+        keys = self._keys_by_owner.get(owner)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_owner[owner]
+
+
+dashboard_cache = ScopedLRUCache(
+    max_entries=getattr(settings, 'DASHBOARD_CACHE_MAX_ENTRIES', 1024),
+    timeout=getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 300),
+)
+
+# Token key -> user snapshot for users.authentication.CachedTokenAuthentication,
+# owned by the user.
+token_cache = ScopedLRUCache(
+    max_entries=getattr(settings, 'TOKEN_AUTH_CACHE_MAX_ENTRIES', 10000),
+    timeout=getattr(settings, 'TOKEN_AUTH_CACHE_TIMEOUT', 60),
+)
+
+# ('course', course id) -> per-assessment statistics from users.statistics,
+# owned by the course.
+statistics_cache = ScopedLRUCache(
+    max_entries=getattr(settings, 'STATISTICS_CACHE_MAX_ENTRIES', 1024),
+    timeout=getattr(settings, 'STATISTICS_CACHE_TIMEOUT', 300),
+)
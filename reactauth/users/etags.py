@@ -0,0 +1,93 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.http import parse_etags
+
+from .models import Course, Enrollment
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def etag_matches(request, etag):
+    """Weak If-None-Match comparison against ``etag``."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    candidates = parse_etags(header)
+    return '*' in candidates or etag.removeprefix('W/') in {tag.removeprefix('W/') for tag in candidates}
+
+
+def _student_dashboard_version(user, semester_id):
+    # Score writes bump GradeSummary.updated_at; the count and newest enrollment
+    # date catch drops and adds that leave every remaining summary untouched;
+    # the schedule count does the same for a deleted schedule.
+    # User.updated_at covers the names and emails the payloads show.
+    return Enrollment.objects.filter(student=user, semester_id=semester_id), {
+        'enrollment_count': Count('pk', distinct=True),
+        'last_enrolled': Max('enrollment_date'),
+        'last_graded': Max('grade_summary__updated_at'),
+        'course_updated': Max('course__updated_at'),
+        'schedule_updated': Max('course__schedules__updated_at'),
+        'schedule_count': Count('course__schedules', distinct=True),
+        'lecturer_updated': Max('course__lecturer__updated_at'),
+    }
+
+
+def _lecturer_dashboard_version(user):
+    return Course.objects.filter(lecturer=user), {
+        'course_count': Count('pk', distinct=True),
+        'course_updated': Max('updated_at'),
+        'schedule_updated': Max('schedules__updated_at'),
+        'schedule_count': Count('schedules', distinct=True),
+        'enrollment_count': Count('enrollments', distinct=True),
+        'last_enrolled': Max('enrollments__enrollment_date'),
+        'last_graded': Max('enrollments__grade_summary__updated_at'),
+        'student_updated': Max('enrollments__student__updated_at'),
+    }
+
+
+def _course_roster_version(course):
+    return Enrollment.objects.filter(course=course), {
+        'enrollment_count': Count('pk'),
+        'last_enrolled': Max('enrollment_date'),
+        'last_graded': Max('grade_summary__updated_at'),
+        'student_updated': Max('student__updated_at'),
+    }
+
+
+def student_dashboard_etag(user, semester_id):
+    queryset, aggregates = _student_dashboard_version(user, semester_id)
+    return make_etag('student', user.pk, semester_id, sorted(queryset.aggregate(**aggregates).items()))
+
+
+def lecturer_dashboard_etag(user):
+    queryset, aggregates = _lecturer_dashboard_version(user)
+    return make_etag('lecturer', user.pk, sorted(queryset.aggregate(**aggregates).items()))
+
+
+def course_roster_etag(course):
+    queryset, aggregates = _course_roster_version(course)
+    return make_etag('roster', course.pk, sorted(queryset.aggregate(**aggregates).items()))
+
+
+# Async twins for the Async*View classes in users.views; same query, same tag.
+
+async def astudent_dashboard_etag(user, semester_id):
+    queryset, aggregates = _student_dashboard_version(user, semester_id)
+    version = await queryset.aaggregate(**aggregates)
+    return make_etag('student', user.pk, semester_id, sorted(version.items()))
+
+
+async def alecturer_dashboard_etag(user):
+    queryset, aggregates = _lecturer_dashboard_version(user)
+    version = await queryset.aaggregate(**aggregates)
+    return make_etag('lecturer', user.pk, sorted(version.items()))
+
+
+async def acourse_roster_etag(course):
+    queryset, aggregates = _course_roster_version(course)
+    version = await queryset.aaggregate(**aggregates)
+    return make_etag('roster', course.pk, sorted(version.items()))
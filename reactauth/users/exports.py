@@ -0,0 +1,77 @@
+import csv
+import tempfile
+from decimal import Decimal
+from itertools import groupby
+
+from .models import Score
+from .streaming import CHUNK_SIZE, buffered
+
+try:
+    import xlsxwriter
+except ImportError:  # XLSX export is optional
+    xlsxwriter = None
+
+STUDENT_COLUMNS = ['course', 'semester', 'student_id', 'username', 'name', 'email']
+
+
+class _Echo:
+    """File-like object whose write() hands the CSV line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def gradebook_rows(enrollments):
+    """Yield a header and then one row per enrollment with one column per assessment.
+
+    Enrollment/score pairs are read through a single chunked iterator ordered
+    by enrollment, so only one student's scores are held at a time.
+    """
+    assessments = list(
+        Score.objects.filter(enrollment__in=enrollments)
+        .order_by('assessment_name')
+        .values_list('assessment_name', flat=True)
+        .distinct()
+    )
+    yield STUDENT_COLUMNS + assessments + ['weighted_total']
+
+    pairs = (
+        enrollments.order_by('course__code', 'student_id', 'pk')
+        .values_list(
+            'pk', 'course__code', 'semester__name', 'student_id', 'student__username',
+            'student__full_name', 'student__email', 'grade_summary__weighted_total',
+            'scores__assessment_name', 'scores__score',
+        )
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for _pk, group in groupby(pairs, key=lambda pair: pair[0]):
+        scores = {}
+        for pair in group:
+            student, weighted_total, (assessment_name, score) = list(pair[1:7]), pair[7], pair[8:]
+            if assessment_name is not None:
+                scores[assessment_name] = score
+        total = '' if weighted_total is None else weighted_total
+        yield student + [scores.get(name, '') for name in assessments] + [total]
+
+
+def csv_chunks(rows):
+    writer = csv.writer(_Echo())
+    return buffered(writer.writerow(row).encode() for row in rows)
+
+
+def write_xlsx(rows):
+    """Write ``rows`` to a temporary .xlsx file and return it rewound for reading.
+
+    xlsxwriter's constant_memory mode flushes each row to disk once the next
+    one starts, so memory use does not depend on the number of rows.
+    """
+    output = tempfile.TemporaryFile()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True, 'in_memory': False})
+    worksheet = workbook.add_worksheet('Grades')
+    for row_number, row in enumerate(rows):
+        for column, value in enumerate(row):
+            if value != '':
+                worksheet.write(row_number, column, float(value) if isinstance(value, Decimal) else value)
+    workbook.close()
+    output.seek(0)
+    return output
@@ -0,0 +1,154 @@
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+from .models import Enrollment, Score
+
+# Gradebook column -> (Score.assessment_name, default weight)
+SCORE_MAP = {
+    'classwork': ('Classwork', 30.0),
+    'midterm': ('Midterm', 30.0),
+    'finals': ('Final Exam', 40.0),
+}
+
+MIN_SCORE = Decimal('0')
+MAX_SCORE = Decimal('100')
+
+
+def parse_gradebook_csv(text):
+    """Rows of a CSV gradebook with a header such as ``student_id,classwork,midterm,finals``."""
+    reader = csv.DictReader(io.StringIO(text))
+    return [
+        {key.strip(): value.strip() for key, value in row.items() if key and value not in (None, '')}
+        for row in reader
+    ]
+
+
+class GradebookImport:
+    """Validates a whole-course gradebook in one pass and applies it in one transaction.
+
+    Rows identify a student by ``student_id`` or ``email`` and carry any of the
+    ``SCORE_MAP`` columns; grades go to the student's enrollment in ``semester``.
+    Validation fails the whole upload; nothing is written unless every row is valid.
+    """
+
+    def __init__(self, course, rows, semester):
+        self.course = course
+        self.rows = rows
+        self.semester = semester
+        self.errors = []
+        self.created = 0
+        self.updated = 0
+        self._grades = {}  # enrollment id -> {column: Decimal}
+
+    def is_valid(self):
+        by_student_id = {}
+        by_email = {}
+        enrollments = (
+            Enrollment.objects.filter(course=self.course, semester=self.semester)
+            .values_list('pk', 'student_id', 'student__email')
+        )
+        for enrollment_id, student_id, email in enrollments:
+            by_student_id[student_id] = enrollment_id
+            by_email[email.lower()] = enrollment_id
+
+        if not isinstance(self.rows, list) or not self.rows:
+            self.errors.append({'row': None, 'errors': ['Gradebook must contain at least one row.']})
+            return False
+
+        seen = {}
+        for number, row in enumerate(self.rows, start=1):
+            row_errors = []
+            if not isinstance(row, dict):
+                self.errors.append({'row': number, 'errors': ['Row must be an object.']})
+                continue
+
+            enrollment_id = None
+            if row.get('student_id') not in (None, ''):
+                try:
+                    enrollment_id = by_student_id.get(int(row['student_id']))
+                except (TypeError, ValueError):
+                    row_errors.append('student_id must be an integer.')
+            elif row.get('email'):
+                enrollment_id = by_email.get(str(row['email']).strip().lower())
+            else:
+                row_errors.append('Either student_id or email is required.')
+
+            if enrollment_id is None and not row_errors:
+                row_errors.append('Student is not enrolled in this course.')
+            elif enrollment_id in seen:
+                row_errors.append(f'Duplicate of row {seen[enrollment_id]}.')
+
+            grades = {}
+            for column in SCORE_MAP:
+                if row.get(column) in (None, ''):
+                    continue
+                try:
+                    value = Decimal(str(row[column]))
+                except InvalidOperation:
+                    row_errors.append(f'{column} must be a number.')
+                    continue
+                if not value.is_finite() or not MIN_SCORE <= value <= MAX_SCORE:
+                    row_errors.append(f'{column} must be between {MIN_SCORE} and {MAX_SCORE}.')
+                    continue
+                grades[column] = value.quantize(Decimal('0.01'))
+
+            if not grades and not row_errors:
+                row_errors.append(f"Row has no grades; expected any of: {', '.join(SCORE_MAP)}.")
+
+            if row_errors:
+                self.errors.append({'row': number, 'errors': row_errors})
+            else:
+                seen[enrollment_id] = number
+                self._grades[enrollment_id] = grades
+
+        return not self.errors
+
+    def save(self):
+        self.created, self.updated = write_scores(self._grades)
+        return len(self._grades)
+
+
+@transaction.atomic
+def write_scores(grades):
+    """Set ``{enrollment id: {column: value}}`` grades on the ``SCORE_MAP`` scores.
+
+    Missing scores are created with the default weight, and existing ones with no
+    weight get it too. The Score bulk paths refresh the GradeSummary rows once for
+    the new scores and once for the changed ones, not after every score. Returns
+    ``(created, updated)`` counts.
+    """
+    labels = {label: column for column, (label, _weight) in SCORE_MAP.items()}
+    existing = {}
+    scores = (
+        Score.objects.filter(enrollment_id__in=grades, assessment_name__in=labels)
+        .order_by('-pk')
+    )
+    # Newest first, so the oldest duplicate wins like get_or_create() would.
+    for score in scores:
+        existing[(score.enrollment_id, labels[score.assessment_name])] = score
+
+    to_create = []
+    to_update = []
+    for enrollment_id, columns in grades.items():
+        for column, value in columns.items():
+            label, default_weight = SCORE_MAP[column]
+            score = existing.get((enrollment_id, column))
+            if score is None:
+                to_create.append(Score(
+                    enrollment_id=enrollment_id,
+                    assessment_name=label,
+                    score=value,
+                    weight=default_weight,
+                ))
+                continue
+            score.score = value
+            if score.weight in (None, 0):
+                score.weight = default_weight
+            to_update.append(score)
+
+    Score.objects.bulk_create(to_create, batch_size=500)
+    Score.objects.bulk_update(to_update, ['score', 'weight'], batch_size=500)
+    return len(to_create), len(to_update)
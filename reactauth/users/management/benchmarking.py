@@ -0,0 +1,55 @@
+"""Throwaway data shared by the benchmark_* management commands."""
+from datetime import time as clock_time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from users.models import Course, CourseSchedule, Enrollment, Score, Semester
+
+User = get_user_model()
+
+BENCH_COURSE = 'BENCH1'
+BENCH_LECTURER = 'bench.lecturer'
+
+
+@transaction.atomic
+def seed_course(size, semester='Fall 2023'):
+    """Create BENCH_COURSE taught by BENCH_LECTURER with ``size`` graded students."""
+    cleanup()
+    lecturer = User.objects.create(
+        username=BENCH_LECTURER, email='bench.lecturer@prasetiyamulya.ac.id',
+        full_name='Bench Lecturer', role='instructor', is_lecturer=True, password='!',
+    )
+    course = Course.objects.create(code=BENCH_COURSE, name='Benchmark Course', lecturer=lecturer)
+    CourseSchedule.objects.create(
+        course=course, day='Mon', start_time=clock_time(9), end_time=clock_time(11), room='B201',
+    )
+    semester = Semester.objects.named(semester)
+    students = User.objects.bulk_create(
+        [
+            User(
+                username=f'bench.student{index}', email=f'bench.student{index}@student.prasetiyamulya.ac.id',
+                full_name=f'Bench Student {index}', role='student', is_student=True, password='!',
+            )
+            for index in range(size)
+        ],
+        batch_size=1000,
+    )
+    enrollments = Enrollment.objects.bulk_create(
+        [Enrollment(student=student, course=course, semester=semester) for student in students],
+        batch_size=1000,
+    )
+    Score.objects.bulk_create(
+        [
+            Score(enrollment=enrollment, assessment_name=name, score=Decimal(60 + index % 40), weight=weight)
+            for index, enrollment in enumerate(enrollments)
+            for name, weight in (('Classwork', 30), ('Midterm', 30), ('Final Exam', 40))
+        ],
+        batch_size=1000,
+    )
+    return course
+
+
+def cleanup():
+    User.objects.filter(username__startswith='bench.').delete()
+    Course.objects.filter(code=BENCH_COURSE).delete()
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+from users.archive import archivable_semesters, archive_semester
+from users.models import Enrollment
+
+
+class Command(BaseCommand):
+    help = (
+        'Moves enrollments, scores and grade summaries of closed semesters into ArchivedEnrollment, '
+        'keeping only the active semester and the ones just before it in the live tables'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep-previous', type=int, default=1, help='Semesters before the active one to keep live')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--dry-run', action='store_true', help='Only list what would be archived')
+        parser.add_argument('--vacuum', action='store_true', help='VACUUM and ANALYZE afterwards to shrink the indexes')
+
+    def handle(self, *args, **options):
+        semesters = archivable_semesters(keep_previous=max(0, options['keep_previous']))
+        if not semesters:
+            self.stdout.write('Nothing to archive.')
+            return
+
+        total = 0
+        for semester in semesters:
+            if options['dry_run']:
+                count = Enrollment.objects.filter(semester=semester).count()
+                self.stdout.write(f'{semester}: {count} enrollments would be archived')
+                continue
+            count = archive_semester(semester, batch_size=options['batch_size'])
+            self.stdout.write(f'{semester}: archived {count} enrollments')
+            total += count
+
+        if options['vacuum'] and not options['dry_run']:
+            with connection.cursor() as cursor:
+                cursor.execute('VACUUM')
+                cursor.execute('ANALYZE')
+        if not options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'Archived {total} enrollments from {len(semesters)} semesters'))
@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from users.management.serving import run_server
+from users.management.synthetic import SyntheticDataset
+from users.models import Course, Enrollment, Semester
+
+MODES = ('wsgi', 'asgi', 'asgi-async')
+# Share of requests per endpoint: dashboards are what every page load hits.
+MIX = {'student_dashboard': 8, 'course_students': 1, 'lecturer_dashboard': 1}
+SAMPLE_STUDENTS = 200
+
+
+class Command(BaseCommand):
+    help = (
+        'Serves a mix of dashboard and roster GETs to concurrent clients through reactauth.wsgi on a '
+        'thread pool, reactauth.asgi with the sync views, and reactauth.asgi with ASYNC_VIEWS, one '
+        'process per mode, and reports throughput and latency'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=32, help='Requests in flight at once')
+        parser.add_argument('--threads', type=int, default=8, help='WSGI worker threads')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per mode')
+        parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+        parser.add_argument('--students', type=int, default=2000)
+        parser.add_argument('--courses', type=int, default=50)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('This benchmark copies the SQLite database file.')
+
+        with tempfile.TemporaryDirectory() as directory:
+            database = str(Path(directory) / 'serving.sqlite3')
+            SyntheticDataset(
+                students=options['students'], lecturers=max(1, options['courses'] // 5),
+                courses=options['courses'], semesters=1, courses_per_student=min(5, options['courses']),
+            ).create()
+            try:
+                requests = self.requests()
+                with connection.cursor() as cursor:
+                    cursor.execute('VACUUM INTO %s', [database])
+            finally:
+                SyntheticDataset.cleanup()
+            with sqlite3.connect(database) as copy:
+                copy.execute('PRAGMA journal_mode = DELETE')
+
+            self.stdout.write(
+                f"{options['concurrency']} clients, {options['threads']} WSGI threads, "
+                f"{options['duration']:.0f}s per mode\n"
+            )
+            self.stdout.write(
+                f"{'mode':<11} {'route':<19} {'requests':>9} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'failed':>7}"
+            )
+            for mode in options['modes']:
+                latencies, failures = self.run_mode(database, mode, requests, options)
+                for route in MIX:
+                    self.report(mode, route, latencies.get(route, []), '', options['duration'])
+                everything = [latency for by_route in latencies.values() for latency in by_route]
+                self.report(mode, 'all', everything, failures, options['duration'])
+
+    def requests(self):
+        """Weighted (route name, path, Authorization header) triples over the synthetic accounts."""
+        semester = Semester.objects.active()
+        students = list(
+            Enrollment.objects.filter(student__username__startswith='load.', semester=semester)
+            .order_by('student_id').values_list('student_id', flat=True).distinct()
+        )
+        courses = list(
+            Course.objects.filter(lecturer__username__startswith='load.').values_list('code', 'lecturer_id')
+        )
+        if not students or not courses:
+            raise CommandError('The synthetic dataset has no enrollments.')
+        students = random.Random(0).sample(students, min(SAMPLE_STUDENTS, len(students)))
+        tokens = {
+            token.user_id: f'Token {token.key}'
+            for token in Token.objects.bulk_create(
+                Token(user_id=user_id, key=Token.generate_key())
+                for user_id in {*students, *(lecturer_id for _code, lecturer_id in courses)}
+            )
+        }
+
+        by_route = {
+            'student_dashboard': [(reverse('student_dashboard'), tokens[student]) for student in students],
+            'course_students': [
+                (reverse('course_students', args=[code]), tokens[lecturer_id]) for code, lecturer_id in courses
+            ],
+            'lecturer_dashboard': [
+                (reverse('lecturer_dashboard'), tokens[lecturer_id])
+                for lecturer_id in sorted({lecturer_id for _code, lecturer_id in courses})
+            ],
+        }
+        rng = random.Random(1)
+        return [
+            (route, path, authorization)
+            for route, weight in MIX.items()
+            for path, authorization in rng.choices(by_route[route], k=100 * weight)
+        ]
+
+    def run_mode(self, database, mode, requests, options):
+        # A fresh process per mode, like a freshly started server.
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        settings_module = os.environ.get('DJANGO_SETTINGS_MODULE', 'reactauth.settings')
+        server = context.Process(target=run_server, args=(
+            settings_module, database, mode, requests, options['concurrency'], options['threads'],
+            options['duration'], results,
+        ))
+        server.start()
+        _mode, latencies, failures = results.get()
+        server.join()
+        return latencies, failures
+
+    def report(self, mode, route, latencies, failures, duration):
+        if len(latencies) >= 2:
+            cuts = statistics.quantiles(latencies, n=100)
+            p50, p99 = cuts[49] * 1000, cuts[98] * 1000
+        else:
+            p50 = p99 = (latencies[0] * 1000) if latencies else 0.0
+        self.stdout.write(
+            f'{mode:<11} {route:<19} {len(latencies):>9} {len(latencies) / duration:>8.1f} '
+            f'{p50:>8.2f} {p99:>8.2f} {failures:>7}'
+        )
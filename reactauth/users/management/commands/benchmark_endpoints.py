@@ -0,0 +1,234 @@
+import json
+import statistics
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from users import urls as users_urls
+from users.authentication import CachedTokenAuthentication
+from users.cache import dashboard_cache, statistics_cache
+from users.exports import xlsxwriter
+from users.management.synthetic import SyntheticDataset
+from users.models import Course, Enrollment, Semester
+from users.statistics import np
+from users.throttling import throttle_store
+
+SIZES = {
+    'small': {'students': 12, 'courses': 3, 'courses_per_student': 2},
+    'medium': {'students': 120, 'courses': 6, 'courses_per_student': 3},
+    'large': {'students': 480, 'courses': 12, 'courses_per_student': 4},
+}
+SEMESTER = 'Fall 2023'
+# The gradebook upload always carries this many rows, so its cost reflects the
+# course size rather than the payload (bulk_update batches grow with the latter).
+GRADEBOOK_ROWS = 20
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+class Command(BaseCommand):
+    help = (
+        'Hits every users endpoint against small, medium and large datasets, records query count, '
+        'latency and response size, and fails if queries grow with the data or latency regresses'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per endpoint; the median is kept')
+        parser.add_argument('--output', help='Write the results as JSON to this path')
+        parser.add_argument('--baseline', help='JSON from an earlier run to compare latency against')
+        parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed slowdown over the baseline (0.5 = 50%%)')
+        parser.add_argument('--min-delta-ms', type=float, default=10.0, help='Ignore slowdowns smaller than this')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            try:
+                baseline = json.loads(Path(options['baseline']).read_text())['results']
+            except (OSError, ValueError, KeyError) as exc:
+                raise CommandError(f"Could not read baseline {options['baseline']}: {exc}")
+
+        # Password hashing would swamp every other cost on the auth endpoints.
+        with override_settings(PASSWORD_HASHERS=FAST_HASHERS, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            results = {}
+            try:
+                for size in options['sizes']:
+                    context = self.seed(size)
+                    for scenario in self.scenarios(context):
+                        results.setdefault(scenario['label'], {})[size] = self.measure(
+                            context, scenario, max(1, options['repeat']),
+                        )
+            finally:
+                SyntheticDataset.cleanup()
+
+        failures = self.check_status(results) + self.check_growth(results, options['sizes'])
+        if baseline is not None:
+            failures += self.check_baseline(results, baseline, options['tolerance'], options['min_delta_ms'])
+
+        self.report(results, options['sizes'])
+        if options['output']:
+            Path(options['output']).write_text(json.dumps({
+                'created': datetime.now(timezone.utc).isoformat(),
+                'repeat': options['repeat'],
+                'sizes': {size: SIZES[size] for size in options['sizes']},
+                'results': results,
+                'failures': failures,
+            }, indent=2))
+        if failures:
+            for failure in failures:
+                self.stderr.write(failure)
+            raise CommandError(f'{len(failures)} endpoint regression(s).')
+
+    def seed(self, size):
+        SyntheticDataset(lecturers=1, semesters=1, seed=1, **SIZES[size]).create()
+        lecturer_course = Course.objects.filter(lecturer__username__startswith='load.').order_by('pk').first()
+        enrollments = list(
+            Enrollment.objects.filter(course=lecturer_course).select_related('student').order_by('student_id')
+        )
+        student = enrollments[0].student
+        lecturer = lecturer_course.lecturer
+        # A warm worker has already resolved the active semester.
+        Semester.objects.active()
+        return {
+            'size': size,
+            'lecturer': lecturer,
+            'student': student,
+            'course': lecturer_course,
+            'roster': [enrollment.student_id for enrollment in enrollments],
+            'tokens': {
+                'lecturer': Token.objects.create(user=lecturer).key,
+                'student': Token.objects.create(user=student).key,
+            },
+        }
+
+    def scenarios(self, context):
+        """One request per route in users/urls.py (two for the per-format exports)."""
+        lecturer, student, course = context['lecturer'], context['student'], context['course']
+        registration = {
+            'username': 'load.register', 'password': 'register-secret', 'first_name': 'Load', 'last_name': 'Register',
+            'email': 'load.register@student.prasetiyamulya.ac.id',
+        }
+        gradebook = [{'student_id': student_id, 'classwork': 81, 'midterm': 72, 'finals': 93}
+                     for student_id in context['roster'][:GRADEBOOK_ROWS]]
+        scenarios = [
+            ('register', 'post', None, {}, registration, 201),
+            ('register_student', 'post', None, {}, registration, 201),
+            ('register_lecturer', 'post', None, {}, registration, 201),
+            ('login', 'post', None, {}, {'username': student.email, 'password': 'student123'}, 200),
+            ('logout', 'post', 'student', {}, None, 200),
+            ('token_obtain_pair', 'post', None, {}, {'username': lecturer.username, 'password': 'lecturer123'}, 200),
+            ('token_refresh', 'post', None, {}, {'refresh': str(RefreshToken.for_user(lecturer))}, 200),
+            ('student_dashboard', 'get', 'student', {}, None, 200),
+            ('student_transcript', 'get', 'student', {}, None, 200),
+            ('lecturer_dashboard', 'get', 'lecturer', {}, None, 200),
+            ('lecturer_statistics', 'get', 'lecturer', {}, None, 200 if np is not None else 503),
+            ('course_students', 'get', 'lecturer', {'course_id': course.code}, None, 200),
+            ('course_student_grades', 'patch', 'lecturer',
+             {'course_id': course.code, 'student_id': student.pk}, {'midterm': 88}, 200),
+            ('course_gradebook', 'post', 'lecturer', {'course_id': course.code}, {'grades': gradebook}, 200),
+            ('semester_gradebook_export', 'get', 'lecturer', {'semester': SEMESTER, 'file_format': 'csv'}, None, 200),
+        ]
+        for file_format in ('csv', 'xlsx') if xlsxwriter is not None else ('csv',):
+            scenarios.append(('course_gradebook_export', 'get', 'lecturer',
+                              {'course_id': course.code, 'file_format': file_format}, None, 200))
+
+        covered = {name for name, *_rest in scenarios}
+        missing = [pattern.name for pattern in users_urls.urlpatterns if pattern.name not in covered]
+        if missing:
+            raise CommandError(f"No benchmark scenario for: {', '.join(missing)}")
+
+        return [
+            {
+                'label': f"{name}[{kwargs['file_format']}]" if name == 'course_gradebook_export' else name,
+                'route': name, 'method': method, 'as_user': as_user, 'kwargs': kwargs,
+                'payload': payload, 'expected_status': expected_status,
+            }
+            for name, method, as_user, kwargs, payload, expected_status in scenarios
+        ]
+
+    def measure(self, context, scenario, repeat):
+        url = reverse(scenario['route'], kwargs=scenario['kwargs'])
+        timings = []
+        queries = 0
+        # The first, untimed run pays for imports and URL resolver warm-up.
+        for run in range(repeat + 1):
+            client = APIClient()
+            if scenario['as_user']:
+                key = context['tokens'][scenario['as_user']]
+                # Keep auth out of the budget, as a warm worker would.
+                CachedTokenAuthentication().authenticate_credentials(key)
+                client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+            dashboard_cache.clear()
+            statistics_cache.clear()
+            throttle_store.clear()
+
+            with transaction.atomic(), CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = getattr(client, scenario['method'])(url, scenario['payload'], format='json')
+                if response.streaming:
+                    size = sum(len(chunk) for chunk in response.streaming_content)
+                else:
+                    size = len(response.content)
+                if run:
+                    timings.append(time.perf_counter() - started)
+                # Every run sees the same data.
+                transaction.set_rollback(True)
+            queries = max(queries, len(captured))
+
+        return {
+            'method': scenario['method'].upper(),
+            'status': response.status_code,
+            'expected_status': scenario['expected_status'],
+            'queries': queries,
+            'ms': round(statistics.median(timings) * 1000, 3),
+            'bytes': size,
+        }
+
+    def check_status(self, results):
+        return [
+            f"{label} [{size}]: status {result['status']}, expected {result['expected_status']}"
+            for label, by_size in results.items()
+            for size, result in by_size.items()
+            if result['status'] != result['expected_status']
+        ]
+
+    def check_growth(self, results, sizes):
+        failures = []
+        for label, by_size in results.items():
+            smallest = by_size[sizes[0]]['queries']
+            for size in sizes[1:]:
+                if by_size[size]['queries'] > smallest:
+                    failures.append(
+                        f"{label}: {by_size[size]['queries']} queries at {size} vs {smallest} at {sizes[0]}"
+                    )
+        return failures
+
+    def check_baseline(self, results, baseline, tolerance, min_delta_ms):
+        failures = []
+        for label, by_size in results.items():
+            for size, result in by_size.items():
+                previous = baseline.get(label, {}).get(size)
+                if previous is None:
+                    continue
+                if result['ms'] > previous['ms'] * (1 + tolerance) and result['ms'] - previous['ms'] > min_delta_ms:
+                    failures.append(f"{label} [{size}]: {result['ms']:.1f} ms vs baseline {previous['ms']:.1f} ms")
+                if result['queries'] > previous['queries']:
+                    failures.append(f"{label} [{size}]: {result['queries']} queries vs baseline {previous['queries']}")
+        return failures
+
+    def report(self, results, sizes):
+        self.stdout.write(f"{'endpoint':<30} {'size':<7} {'status':>6} {'queries':>7} {'ms':>9} {'KiB':>9}")
+        for label, by_size in results.items():
+            for size in sizes:
+                result = by_size[size]
+                self.stdout.write(
+                    f"{label:<30} {size:<7} {result['status']:>6} {result['queries']:>7} "
+                    f"{result['ms']:>9.2f} {result['bytes'] / 1024:>9.1f}"
+                )
@@ -0,0 +1,47 @@
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory, force_authenticate
+from users.management.benchmarking import BENCH_COURSE, BENCH_LECTURER, cleanup, seed_course
+from users.views import CourseGradebookExportView
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Measures gradebook export time and peak Python heap as the roster grows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[30, 3000, 30000])
+        parser.add_argument('--formats', nargs='+', choices=['csv', 'xlsx'], default=['csv', 'xlsx'])
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'rows':>7} {'format':<6} {'total ms':>9} {'us/row':>7} {'KiB out':>9} {'heap KiB':>9}")
+        try:
+            for size in options['sizes']:
+                seed_course(size)
+                lecturer = User.objects.get(username=BENCH_LECTURER)
+                for file_format in options['formats']:
+                    elapsed, output, heap_peak = self.measure(lecturer, file_format)
+                    self.stdout.write(
+                        f'{size:>7} {file_format:<6} {elapsed * 1000:>9.1f} {elapsed / size * 1e6:>7.1f} '
+                        f'{output / 1024:>9.1f} {heap_peak / 1024:>9.1f}'
+                    )
+        finally:
+            cleanup()
+
+    def measure(self, lecturer, file_format):
+        request = APIRequestFactory().get(f'/api/auth/courses/{BENCH_COURSE}/gradebook/export/{file_format}/')
+        force_authenticate(request, user=lecturer)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        response = CourseGradebookExportView.as_view()(request, course_id=BENCH_COURSE, file_format=file_format)
+        output = sum(len(chunk) for chunk in response.streaming_content)
+        elapsed = time.perf_counter() - started
+        _current, heap_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        response.close()
+        return elapsed, output, heap_peak
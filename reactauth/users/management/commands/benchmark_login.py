@@ -0,0 +1,55 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.management.base import BaseCommand
+from users.backends import EmailOrUsernameBackend
+
+User = get_user_model()
+
+BENCH_USERNAME = 'bench.login'
+BENCH_EMAIL = 'bench.login@student.prasetiyamulya.ac.id'
+BENCH_PASSWORD = 'bench-password'
+
+
+def legacy_login(identifier, password):
+    """The old UserLoginView flow: try the identifier as a username, then resolve it as an email."""
+    backend = ModelBackend()
+    user = backend.authenticate(None, username=identifier, password=password)
+    if user is None and '@' in identifier:
+        match = User.objects.filter(email__iexact=identifier).first()
+        if match is not None:
+            user = backend.authenticate(None, username=match.username, password=password)
+    return user
+
+
+def single_hash_login(identifier, password):
+    return EmailOrUsernameBackend().authenticate(None, username=identifier, password=password)
+
+
+class Command(BaseCommand):
+    help = 'Compares email-login throughput of the legacy two-step flow and EmailOrUsernameBackend'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+
+    def handle(self, *args, **options):
+        User.objects.filter(username=BENCH_USERNAME).delete()
+        User.objects.create_user(username=BENCH_USERNAME, email=BENCH_EMAIL, password=BENCH_PASSWORD, is_student=True)
+        try:
+            self.stdout.write(f"{'flow':<12} {'identifier':<9} {'ms/login':>9} {'logins/s':>9}")
+            for name, login in (('legacy', legacy_login), ('single-hash', single_hash_login)):
+                for label, identifier in (('username', BENCH_USERNAME), ('email', BENCH_EMAIL.upper())):
+                    elapsed = self.measure(login, identifier, options['iterations'])
+                    self.stdout.write(
+                        f'{name:<12} {label:<9} {elapsed * 1000:>9.1f} {1 / elapsed:>9.1f}'
+                    )
+        finally:
+            User.objects.filter(username=BENCH_USERNAME).delete()
+
+    def measure(self, login, identifier, iterations):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            if login(identifier, BENCH_PASSWORD) is None:
+                raise RuntimeError(f'{login.__name__} rejected {identifier}')
+        return (time.perf_counter() - started) / iterations
@@ -0,0 +1,84 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models.functions import Lower, Upper
+from users.management.synthetic import SyntheticDataset
+from users.models import Course, Enrollment, Score
+
+User = get_user_model()
+
+# (model, index name) added for the hot lookups; dropped inside a rolled-back
+# transaction to show the "before" plans.
+HOT_INDEXES = [
+    (Course, 'course_code_upper_idx'),
+    (Enrollment, 'enrollment_student_sem_idx'),
+    (Score, 'score_enrollment_name_idx'),
+    (User, 'user_email_lower_idx'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Shows query plans and timings of the hot lookups with and without their indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=5000, help='Five enrollments per semester, four semesters')
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--keep', action='store_true', help='Keep the synthetic dataset')
+
+    def handle(self, *args, **options):
+        SyntheticDataset(students=options['students'], lecturers=100, courses=300, semesters=4).create()
+        try:
+            enrollment = Enrollment.objects.select_related('student', 'course').order_by('-pk').first()
+            self.stdout.write(
+                f'{Enrollment.objects.count()} enrollments, {Score.objects.count()} scores, '
+                f'{Course.objects.count()} courses, {User.objects.count()} users\n'
+            )
+            cases = self.cases(enrollment)
+
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for _model, name in HOT_INDEXES:
+                        cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+                before = {label: self.measure(legacy, options['iterations']) for label, legacy, _current in cases}
+                transaction.set_rollback(True)
+            after = {label: self.measure(current, options['iterations']) for label, _legacy, current in cases}
+
+            for label, _legacy, _current in cases:
+                for phase, (plan, seconds) in (('before', before[label]), ('after', after[label])):
+                    self.stdout.write(f'{label} [{phase}] {seconds * 1e6:.1f} us/query')
+                    for line in plan.splitlines():
+                        self.stdout.write(f'    {line}')
+                self.stdout.write('')
+        finally:
+            if not options['keep']:
+                SyntheticDataset.cleanup()
+
+    def cases(self, enrollment):
+        """(label, query shape before, query shape after) for each hot lookup."""
+        student, course = enrollment.student, enrollment.course
+        code, email = course.code.lower(), student.email.upper()
+        student_dashboard = Enrollment.objects.filter(student=student, semester=enrollment.semester)
+        score_lookup = Score.objects.filter(enrollment=enrollment, assessment_name='Midterm')
+        return [
+            ('student dashboard enrollments', student_dashboard, student_dashboard),
+            ('roster PATCH score lookup', score_lookup, score_lookup),
+            ('find_course',
+             Course.objects.filter(code__iexact=code),
+             Course.objects.alias(code_upper=Upper('code')).filter(code_upper=code.upper())),
+            ('login by email',
+             User.objects.filter(email__iexact=email),
+             User.objects.alias(email_lower=Lower('email')).filter(email_lower=email.lower())),
+        ]
+
+    def measure(self, queryset, iterations):
+        # Time the compiled SQL alone; ORM overhead would hide the index effect.
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                cursor.execute(sql, params)
+                cursor.fetchall()
+            elapsed = time.perf_counter() - started
+        return queryset.explain(), elapsed / iterations
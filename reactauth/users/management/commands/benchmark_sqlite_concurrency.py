@@ -0,0 +1,116 @@
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from reactauth.sqlite import connection_options
+from users.management.concurrency import run_worker
+from users.management.synthetic import SyntheticDataset
+from users.models import Enrollment, Semester
+
+MODES = {
+    'stock': {},
+    'profile': connection_options(),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs concurrent dashboard readers and grade writers in separate processes against copies '
+        'of a synthetic database, with and without the SQLite performance profile'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per mode')
+        parser.add_argument('--students', type=int, default=2000)
+        parser.add_argument('--courses', type=int, default=50)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('This benchmark only applies to SQLite.')
+
+        with tempfile.TemporaryDirectory() as directory:
+            SyntheticDataset(
+                students=options['students'], lecturers=max(1, options['courses'] // 5),
+                courses=options['courses'], semesters=1, courses_per_student=min(5, options['courses']),
+            ).create()
+            try:
+                work = self.work()
+                databases = {}
+                for mode in MODES:
+                    databases[mode] = str(Path(directory) / f'{mode}.sqlite3')
+                    with connection.cursor() as cursor:
+                        cursor.execute('VACUUM INTO %s', [databases[mode]])
+            finally:
+                SyntheticDataset.cleanup()
+            # Each copy starts in rollback-journal mode; the profile switches its own to WAL.
+            for database in databases.values():
+                with sqlite3.connect(database) as copy:
+                    copy.execute('PRAGMA journal_mode = DELETE')
+
+            self.stdout.write(
+                f"{options['readers']} readers, {options['writers']} writers, {options['duration']:.0f}s per mode, "
+                f"{len(work['enrollments'])} enrollments\n"
+            )
+            self.stdout.write(f"{'mode':<8} {'role':<6} {'ops':>7} {'ops/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+            for mode, options_for_mode in MODES.items():
+                for role, latencies, errors in self.run_mode(databases[mode], options_for_mode, work, options):
+                    self.report(mode, role, latencies, errors, options['duration'])
+
+    def work(self):
+        semester = Semester.objects.active()
+        enrollments = list(
+            Enrollment.objects.filter(student__username__startswith='load.', semester=semester)
+            .values_list('pk', 'student_id', 'course_id')
+        )
+        if not enrollments:
+            raise CommandError('The synthetic dataset has no enrollments.')
+        return {
+            'semester': semester.pk,
+            'enrollments': [pk for pk, _student, _course in enrollments],
+            'students': sorted({student for _pk, student, _course in enrollments}),
+            'courses': sorted({course for _pk, _student, course in enrollments}),
+        }
+
+    def run_mode(self, database, options_for_mode, work, options):
+        # Spawned, so no worker inherits this process's SQLite handle.
+        context = multiprocessing.get_context('spawn')
+        roles = ['read'] * options['readers'] + ['write'] * options['writers']
+        barrier = context.Barrier(len(roles))
+        results = context.Queue()
+        settings_module = os.environ.get('DJANGO_SETTINGS_MODULE', 'reactauth.settings')
+        workers = [
+            context.Process(target=run_worker, args=(
+                settings_module, database, options_for_mode, role, work, seed, options['duration'], barrier, results,
+            ))
+            for seed, role in enumerate(roles)
+        ]
+        for worker in workers:
+            worker.start()
+        collected = [results.get() for _worker in workers]
+        for worker in workers:
+            worker.join()
+
+        by_role = {}
+        for role, latencies, errors in collected:
+            merged = by_role.setdefault(role, ([], [0]))
+            merged[0].extend(latencies)
+            merged[1][0] += errors
+        return [(role, latencies, errors[0]) for role, (latencies, errors) in by_role.items()]
+
+    def report(self, mode, role, latencies, errors, duration):
+        if len(latencies) >= 2:
+            cuts = statistics.quantiles(latencies, n=100)
+            p50, p99 = cuts[49] * 1000, cuts[98] * 1000
+        else:
+            p50 = p99 = (latencies[0] * 1000) if latencies else 0.0
+        self.stdout.write(
+            f'{mode:<8} {role:<6} {len(latencies):>7} {len(latencies) / duration:>8.1f} '
+            f'{p50:>8.2f} {p99:>8.2f} {errors:>7}'
+        )
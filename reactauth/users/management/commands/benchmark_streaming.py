@@ -0,0 +1,89 @@
+import json
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework.test import APIRequestFactory, force_authenticate
+from users.cache import dashboard_cache
+from users.management.benchmarking import BENCH_COURSE, BENCH_LECTURER, cleanup, seed_course
+from users.views import CourseStudentsView, LecturerDashboardView
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Compares time-to-first-byte and peak memory of buffered and streamed roster/dashboard responses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, default=5000)
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded benchmark course')
+        # Internal: measure one mode in a fresh process so peak RSS is not shared.
+        parser.add_argument('--measure', nargs=2, metavar=('ENDPOINT', 'MODE'), help='Internal use')
+
+    def handle(self, *args, **options):
+        if options['measure']:
+            self.stdout.write(json.dumps(self.measure(*options['measure'])))
+            return
+
+        seed_course(options['students'])
+        try:
+            self.stdout.write(
+                f"{'endpoint':<10} {'mode':<9} {'ttfb ms':>9} {'total ms':>9} {'MiB out':>8} "
+                f"{'heap MiB':>9} {'rss MiB':>8}"
+            )
+            for endpoint in ('roster', 'dashboard'):
+                for mode in ('buffered', 'stream'):
+                    output = subprocess.run(
+                        [sys.executable, sys.argv[0], 'benchmark_streaming', '--measure', endpoint, mode],
+                        check=True, capture_output=True, text=True,
+                    ).stdout
+                    result = json.loads(output.strip().splitlines()[-1])
+                    self.stdout.write(
+                        f"{endpoint:<10} {mode:<9} {result['ttfb'] * 1000:>9.1f} {result['total'] * 1000:>9.1f} "
+                        f"{result['bytes'] / 2 ** 20:>8.2f} {result['heap_peak'] / 2 ** 20:>9.1f} "
+                        f"{result['max_rss'] / 2 ** 10:>8.1f}"
+                    )
+        finally:
+            if not options['keep']:
+                cleanup()
+
+    def measure(self, endpoint, mode):
+        dashboard_cache.max_entries = 0
+        lecturer = User.objects.get(username=BENCH_LECTURER)
+        query = {'stream': '1'} if mode == 'stream' else {}
+        factory = APIRequestFactory()
+        if endpoint == 'roster':
+            request = factory.get(f'/api/auth/courses/{BENCH_COURSE}/students/', query)
+            view, kwargs = CourseStudentsView.as_view(), {'course_id': BENCH_COURSE}
+        else:
+            request = factory.get('/api/auth/dashboard/lecturer/', query)
+            view, kwargs = LecturerDashboardView.as_view(), {}
+        force_authenticate(request, user=lecturer)
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        response = view(request, **kwargs)
+        if response.streaming:
+            chunks = iter(response.streaming_content)
+            size = len(next(chunks))
+            ttfb = time.perf_counter() - started
+            size += sum(len(chunk) for chunk in chunks)
+        else:
+            size = len(response.render().content)
+            ttfb = time.perf_counter() - started
+        total = time.perf_counter() - started
+        _current, heap_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'ttfb': ttfb,
+            'total': total,
+            'bytes': size,
+            'heap_peak': heap_peak,
+            # ru_maxrss is reported in KiB on Linux.
+            'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        }
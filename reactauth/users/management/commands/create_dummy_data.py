@@ -1,15 +1,56 @@
-from django.core.management.base import BaseCommand
+import time as clock
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from users.models import Course, CourseSchedule, Enrollment, Score
+from users.management.synthetic import SyntheticDataset
+from users.models import Course, CourseSchedule, Enrollment, Score, Semester
 from datetime import time, timedelta
 
 User = get_user_model()
 
+SCALE_OPTIONS = ('students', 'lecturers', 'courses', 'semesters')
+
+
 class Command(BaseCommand):
-    help = 'Creates dummy data for testing'
+    help = (
+        'Creates dummy data for testing. Pass any of --students/--lecturers/--courses/--semesters '
+        'to generate a deterministic synthetic dataset of that size instead'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--students', type=int, help='Synthetic students (default 1000)')
+        parser.add_argument('--lecturers', type=int, help='Synthetic lecturers (default 50)')
+        parser.add_argument('--courses', type=int, help='Synthetic courses (default 100)')
+        parser.add_argument('--semesters', type=int, help='Semesters ending with Fall 2023 (default 2)')
+        parser.add_argument('--courses-per-student', type=int, default=5, help='Enrollments per student per semester')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if all(options[name] is None for name in SCALE_OPTIONS):
+            self.create_fixtures()
+            return
+
+        dataset = SyntheticDataset(
+            students=options['students'] if options['students'] is not None else 1000,
+            lecturers=options['lecturers'] if options['lecturers'] is not None else 50,
+            courses=options['courses'] if options['courses'] is not None else 100,
+            semesters=options['semesters'] if options['semesters'] is not None else 2,
+            courses_per_student=options['courses_per_student'],
+            seed=options['seed'],
+        )
+        try:
+            dataset.validate()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        started = clock.perf_counter()
+        counts = dataset.create()
+        elapsed = clock.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            ', '.join(f'{count} {name}' for name, count in counts.items()) + f' created in {elapsed:.1f}s'
+        ))
 
-    def handle(self, *args, **kwargs):
+    def create_fixtures(self):
         # Create lecturers
         lecturers = [
             {
@@ -146,7 +187,10 @@ class Command(BaseCommand):
         ]
 
         # Create courses and schedules
-        current_semester = "Fall 2023"
+        current_semester = Semester.objects.named('Fall 2023')
+        if not Semester.objects.filter(is_active=True).exists():
+            current_semester.is_active = True
+            current_semester.save(update_fields=['is_active'])
         for course_data in courses_data:
             schedule_data = course_data.pop('schedule')
             course, created = Course.objects.get_or_create(
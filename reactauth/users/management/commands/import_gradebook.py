@@ -0,0 +1,59 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from users.gradebook import GradebookImport, parse_gradebook_csv
+from users.models import Semester
+from users.views import find_course
+
+
+class Command(BaseCommand):
+    help = 'Imports a CSV or JSON gradebook for a whole course in one transaction'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course', help='Course code, e.g. DBT201')
+        parser.add_argument('path', help='CSV with a student_id or email column, or a JSON list of rows')
+        parser.add_argument('--format', choices=['csv', 'json'], help='Defaults to the file extension')
+        parser.add_argument('--semester', help='Semester name, e.g. "Fall 2023"; defaults to the active semester')
+
+    def handle(self, *args, **options):
+        course = find_course(options['course'])
+        if course is None:
+            raise CommandError(f"Course {options['course']} not found.")
+
+        if options['semester']:
+            semester = Semester.objects.filter(name=options['semester']).first()
+            if semester is None:
+                raise CommandError(f"Semester {options['semester']} not found.")
+        else:
+            semester = Semester.objects.active()
+            if semester is None:
+                raise CommandError('There is no active semester; pass --semester.')
+
+        path = Path(options['path'])
+        try:
+            text = path.read_text(encoding='utf-8-sig')
+        except OSError as exc:
+            raise CommandError(f'Could not read {path}: {exc}')
+
+        file_format = options['format'] or path.suffix.lstrip('.').lower()
+        if file_format == 'json':
+            rows = json.loads(text)
+            if isinstance(rows, dict):
+                rows = rows.get('grades')
+        elif file_format == 'csv':
+            rows = parse_gradebook_csv(text)
+        else:
+            raise CommandError('Use --format to choose csv or json.')
+
+        gradebook = GradebookImport(course, rows, semester)
+        if not gradebook.is_valid():
+            for error in gradebook.errors:
+                self.stderr.write(f"Row {error['row']}: {'; '.join(error['errors'])}")
+            raise CommandError('Gradebook contains errors; nothing was saved.')
+
+        students = gradebook.save()
+        self.stdout.write(self.style.SUCCESS(
+            f'Graded {students} students in {course.code} {semester.name} '
+            f'({gradebook.created} scores created, {gradebook.updated} updated)'
+        ))
@@ -0,0 +1,133 @@
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models.functions import Lower
+from rest_framework.authtoken.models import Token
+from users.management.provisioning import hash_passwords, init_worker
+from users.models import role_for_email
+
+User = get_user_model()
+
+REQUIRED_COLUMNS = ('username', 'email', 'password')
+
+
+class Command(BaseCommand):
+    help = 'Creates student and lecturer accounts with tokens from a CSV, hashing passwords in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='CSV with username, email and password columns; first_name, last_name, full_name and major are optional',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Hashing processes; 1 hashes inline')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        try:
+            with path.open(encoding='utf-8-sig', newline='') as handle:
+                reader = csv.DictReader(handle)
+                missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or ())]
+                if missing:
+                    raise CommandError(f"{path} is missing columns: {', '.join(missing)}")
+                rows = [{key: (value or '').strip() for key, value in row.items() if key} for row in reader]
+        except OSError as exc:
+            raise CommandError(f'Could not read {path}: {exc}')
+
+        started = time.perf_counter()
+        accepted, skipped = self.filter_rows(rows)
+        batch_size = options['batch_size']
+        workers = max(1, options['workers'])
+
+        created = 0
+        executor = None
+        if workers > 1 and len(accepted) > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=init_worker,
+                initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'reactauth.settings'),),
+            )
+        try:
+            for offset in range(0, len(accepted), batch_size):
+                batch = accepted[offset:offset + batch_size]
+                hashes = self.hash_batch(executor, workers, [row['password'] for row in batch])
+                created += self.create_batch(batch, hashes)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        elapsed = time.perf_counter() - started
+        for number, reason in skipped:
+            self.stderr.write(f'Row {number}: skipped, {reason}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {created} users, skipped {len(skipped)} of {len(rows)} rows '
+            f'in {elapsed:.1f}s ({len(rows) / elapsed if elapsed else 0:.0f} rows/s)'
+        ))
+
+    def filter_rows(self, rows):
+        """Split rows into new accounts and (row number, reason) for everything else."""
+        usernames = list({row.get('username', '') for row in rows})
+        emails = list({row.get('email', '').lower() for row in rows})
+        taken_usernames = set()
+        taken_emails = set()
+        # Chunked to stay under SQLite's bound-parameter limit.
+        for start in range(0, max(len(usernames), len(emails)), 500):
+            taken_usernames.update(
+                User.objects.filter(username__in=usernames[start:start + 500]).values_list('username', flat=True)
+            )
+            taken_emails.update(
+                User.objects.alias(email_lower=Lower('email'))
+                .filter(email_lower__in=emails[start:start + 500])
+                .values_list(Lower('email'), flat=True)
+            )
+
+        accepted = []
+        skipped = []
+        for number, row in enumerate(rows, start=2):  # row 1 is the header
+            username, email = row.get('username', ''), row.get('email', '').lower()
+            if not all(row.get(column) for column in REQUIRED_COLUMNS):
+                skipped.append((number, 'username, email and password are required'))
+            elif role_for_email(email) is None:
+                skipped.append((number, f'{email} is not a Prasetiya Mulya address'))
+            elif username in taken_usernames or email in taken_emails:
+                skipped.append((number, f'{username} or {email} already exists'))
+            else:
+                taken_usernames.add(username)
+                taken_emails.add(email)
+                accepted.append(row)
+        return accepted, skipped
+
+    def hash_batch(self, executor, workers, passwords):
+        if executor is None:
+            return hash_passwords(passwords)
+        size = -(-len(passwords) // workers)
+        chunks = [passwords[start:start + size] for start in range(0, len(passwords), size)]
+        return [hashed for chunk in executor.map(hash_passwords, chunks) for hashed in chunk]
+
+    @transaction.atomic
+    def create_batch(self, rows, hashes):
+        users = []
+        for row, hashed in zip(rows, hashes):
+            email = row['email'].lower()
+            role = role_for_email(email)
+            first_name, last_name = row.get('first_name', ''), row.get('last_name', '')
+            users.append(User(
+                username=row['username'],
+                email=email,
+                password=hashed,
+                first_name=first_name,
+                last_name=last_name,
+                full_name=row.get('full_name') or f'{first_name} {last_name}'.strip(),
+                major=row.get('major') or None,
+                role=role,
+                is_student=role == 'student',
+                is_lecturer=role == 'lecturer',
+            ))
+        users = User.objects.bulk_create(users)
+        Token.objects.bulk_create([Token(user=user, key=Token.generate_key()) for user in users])
+        return len(users)
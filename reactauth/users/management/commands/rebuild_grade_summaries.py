@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from users.models import Enrollment, GradeSummary
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the denormalized grade summary row of every enrollment'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', help='Only rebuild enrollments of this course code')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        enrollments = Enrollment.objects.order_by('pk')
+        if options['course']:
+            enrollments = enrollments.filter(course__code__iexact=options['course'])
+
+        batch_size = options['batch_size']
+        enrollment_ids = list(enrollments.values_list('pk', flat=True))
+        rebuilt = 0
+        for start in range(0, len(enrollment_ids), batch_size):
+            rebuilt += GradeSummary.objects.refresh(enrollment_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rebuilt} grade summaries'))
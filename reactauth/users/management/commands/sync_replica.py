@@ -0,0 +1,41 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = 'Copies the primary SQLite database into the read replica file (DATABASE_REPLICA_PATH)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--replica', help='Replica file to write; defaults to DATABASE_REPLICA_PATH')
+        parser.add_argument('--interval', type=float, default=0, help='Copy every N seconds until interrupted')
+
+    def handle(self, *args, **options):
+        path = options['replica'] or getattr(settings, 'DATABASE_REPLICA_PATH', None)
+        if not path:
+            raise CommandError('Set DATABASE_REPLICA_PATH or pass --replica.')
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('sync_replica copies SQLite files only.')
+
+        while True:
+            started = time.perf_counter()
+            self.copy(primary, path)
+            self.stdout.write(f'Copied {primary.settings_dict["NAME"]} to {path} in {time.perf_counter() - started:.2f}s')
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
+
+    def copy(self, primary, path):
+        # The backup API copies a consistent snapshot page by page while the
+        # primary stays writable, and replica readers see either the old or
+        # the new copy.
+        primary.ensure_connection()
+        with sqlite3.connect(path) as replica:
+            primary.connection.backup(replica)
+            # Replica connections are read-only and cannot create WAL files.
+            replica.execute('PRAGMA journal_mode = DELETE')
+        replica.close()
@@ -0,0 +1,58 @@
+"""Reader and writer processes for the benchmark_sqlite_concurrency command."""
+import random
+import time
+
+from users.management.provisioning import init_worker
+
+
+def run_worker(settings_module, database, options, role, work, seed, duration, barrier, results):
+    """Hit ``database`` with dashboard reads or grade writes for ``duration`` seconds.
+
+    Puts ``(role, latencies in seconds, errors)`` on ``results``. ``work`` holds
+    the ids to pick from; the barrier starts every worker at the same moment.
+    """
+    init_worker(settings_module)
+    from django.db import OperationalError, connections, transaction
+    from users.models import Enrollment, Score
+    from users.views import StudentDashboardView
+
+    connection = connections['default']
+    connection.settings_dict.update(NAME=database, OPTIONS=options)
+    rng = random.Random(seed)
+    dashboard = StudentDashboardView()
+
+    def read():
+        if rng.random() < 0.5:
+            dashboard.get_classes(rng.choice(work['students']), work['semester'])
+        else:
+            list(
+                Enrollment.objects.filter(course_id=rng.choice(work['courses']))
+                .with_final_grade()
+                .select_related('student', 'grade_summary')
+            )
+
+    def write():
+        # The roster PATCH: look the score up, save it, refresh the summary.
+        with transaction.atomic():
+            score = Score.objects.filter(enrollment_id=rng.choice(work['enrollments']), assessment_name='Midterm').first()
+            if score is not None:
+                score.score = rng.randint(40, 100)
+                score.save()
+
+    operation = read if role == 'read' else write
+    connection.ensure_connection()
+    latencies = []
+    errors = 0
+    barrier.wait()
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            operation()
+        except OperationalError:
+            # "database is locked": the transaction was rolled back.
+            errors += 1
+        else:
+            latencies.append(time.perf_counter() - started)
+    connection.close()
+    results.put((role, latencies, errors))
@@ -0,0 +1,16 @@
+"""Password hashing for the provision_users command, safe to run in worker processes."""
+import os
+
+
+def init_worker(settings_module):
+    """Make sure Django is configured in a freshly spawned worker (a no-op after fork)."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+
+    django.setup()
+
+
+def hash_passwords(passwords):
+    from django.contrib.auth.hashers import make_password
+
+    return [make_password(password) for password in passwords]
@@ -0,0 +1,147 @@
+"""In-process WSGI and ASGI servers for the benchmark_asgi command.
+
+No server package (gunicorn, uvicorn, daphne) is needed: ``concurrency``
+clients run on an event loop and call the project's WSGI application on a
+fixed pool of threads, as a threaded WSGI server would, or await its ASGI
+application directly. Socket I/O and HTTP parsing are left out of both.
+"""
+import asyncio
+import io
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from users.management.provisioning import init_worker
+
+HOST = 'localhost'
+
+
+def wsgi_get(application, path, authorization):
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'SCRIPT_NAME': '',
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': HOST,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': HOST,
+        'HTTP_AUTHORIZATION': authorization,
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    status = []
+    body = application(environ, lambda status_line, headers, exc_info=None: status.append(status_line))
+    try:
+        for _chunk in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    return int(status[0].split()[0])
+
+
+async def asgi_get(application, path, authorization):
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [(b'host', HOST.encode()), (b'authorization', authorization.encode())],
+        'client': ('127.0.0.1', 50000),
+        'server': (HOST, 80),
+    }
+    finished = asyncio.Event()
+    requested = False
+    status = None
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Django listens for a disconnect while the view runs.
+        await finished.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body' and not message.get('more_body'):
+            finished.set()
+
+    await application(scope, receive, send)
+    return status
+
+
+def run_server(settings_module, database, mode, requests, concurrency, threads, duration, results):
+    """Serve ``requests`` (route name, path, Authorization header) for ``duration`` seconds.
+
+    ``mode`` is ``wsgi``, ``asgi`` (sync views behind the ASGI handler) or
+    ``asgi-async`` (ASYNC_VIEWS). Puts ``(mode, {route: latencies in seconds},
+    failures)`` on ``results``; a failure is any response other than 200.
+    """
+    init_worker(settings_module)
+    from django.db import connections
+    from django.test.utils import override_settings
+    from users.cache import dashboard_cache
+
+    # Shared by the connection every thread opens.
+    connections['default'].settings_dict.update(NAME=database)
+    if mode != 'wsgi':
+        # Each ASGI request runs its sync code in a fresh thread, so a kept-open
+        # connection would never be reused.
+        connections['default'].settings_dict.update(CONN_MAX_AGE=0)
+    # Before users.urls is imported, which picks the views from ASYNC_VIEWS.
+    override_settings(DEBUG=False, ALLOWED_HOSTS=[HOST], ASYNC_VIEWS=mode == 'asgi-async').enable()
+    # Every request renders its payload; the token cache stays warm, as in a live worker.
+    dashboard_cache.max_entries = 0
+
+    if mode == 'wsgi':
+        from reactauth.wsgi import application
+        pool = ThreadPoolExecutor(max_workers=threads)
+
+        async def get(path, authorization):
+            return await asyncio.get_running_loop().run_in_executor(pool, wsgi_get, application, path, authorization)
+    else:
+        from reactauth.asgi import application
+
+        async def get(path, authorization):
+            return await asgi_get(application, path, authorization)
+
+    async def client(seed, deadline, latencies):
+        rng = random.Random(seed)
+        failures = 0
+        while time.perf_counter() < deadline:
+            route, path, authorization = rng.choice(requests)
+            started = time.perf_counter()
+            if await get(path, authorization) != 200:
+                failures += 1
+            elif latencies is not None:
+                latencies.setdefault(route, []).append(time.perf_counter() - started)
+        return failures
+
+    async def serve():
+        # Warm-up: URL resolver, imports, token cache, one connection per thread.
+        await asyncio.gather(*(client(-seed, time.perf_counter() + 1, None) for seed in range(1, concurrency + 1)))
+        latencies = {}
+        deadline = time.perf_counter() + duration
+        failures = await asyncio.gather(*(client(seed, deadline, latencies) for seed in range(concurrency)))
+        return latencies, sum(failures)
+
+    latencies, failures = asyncio.run(serve())
+    if mode == 'wsgi':
+        pool.shutdown()
+    results.put((mode, latencies, failures))
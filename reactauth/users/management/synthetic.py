@@ -0,0 +1,204 @@
+"""Deterministic, production-sized data for load testing (create_dummy_data --students ...)."""
+import random
+from datetime import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+from users.models import Course, CourseSchedule, Enrollment, GradeSummary, Score, Semester, classify_assessment
+
+User = get_user_model()
+
+PREFIX = 'load.'
+BATCH_SIZE = 2000
+
+FIRST_NAMES = [
+    'Andi', 'Budi', 'Citra', 'Dewi', 'Eka', 'Fajar', 'Gita', 'Hadi', 'Indah', 'Joko',
+    'Kartika', 'Lestari', 'Made', 'Nadia', 'Oka', 'Putri', 'Rizky', 'Sari', 'Teguh', 'Wulan',
+]
+LAST_NAMES = [
+    'Santoso', 'Wijaya', 'Halim', 'Gunawan', 'Irawan', 'Kusuma', 'Lim', 'Nugroho',
+    'Pratama', 'Setiawan', 'Sunaryo', 'Tan', 'Utomo', 'Wibowo', 'Yulianto',
+]
+# (course code prefix, CustomUser.major)
+PROGRAMS = [
+    ('AIR', 'artificial_intelligence_and_robotics'),
+    ('BM', 'business_mathematics'),
+    ('DBT', 'digital_business_technology'),
+    ('PDI', 'product_design_innovation'),
+    ('EBT', 'energy_business_technology'),
+    ('FBT', 'food_business_technology'),
+]
+TOPICS = [
+    'Foundations', 'Analytics', 'Systems', 'Studio', 'Modelling', 'Operations',
+    'Strategy', 'Programming', 'Statistics', 'Design', 'Innovation', 'Research Methods',
+]
+DAYS = [day for day, _label in CourseSchedule.DAY_CHOICES]
+SLOTS = [(time(8, 0), time(9, 30)), (time(9, 45), time(11, 15)), (time(11, 30), time(13, 0)),
+         (time(13, 30), time(15, 0)), (time(15, 15), time(16, 45))]
+ROOMS = [f'{building}{floor}{room:02d}' for building in 'ABC' for floor in (1, 2, 3) for room in (1, 2, 3, 4)]
+ASSESSMENTS = [('Classwork', Decimal('30')), ('Midterm', Decimal('30')), ('Final Exam', Decimal('40'))]
+
+
+def semester_names(count, last='Fall 2023'):
+    """``count`` consecutive semester names, oldest first, ending with ``last``."""
+    term, year = last.split()
+    year = int(year)
+    names = []
+    for _ in range(count):
+        names.append(f'{term} {year}')
+        if term == 'Fall':
+            term = 'Spring'
+        else:
+            term, year = 'Fall', year - 1
+    return names[::-1]
+
+
+class SyntheticDataset:
+    """Generates lecturers, students, courses, schedules, enrollments, scores and grade summaries.
+
+    Everything is drawn from ``random.Random(seed)``, so the same options always
+    produce the same rows. Accounts are named ``load.*`` and are replaced, with
+    the courses they teach, every time ``create()`` runs.
+    """
+
+    def __init__(self, students, lecturers, courses, semesters, courses_per_student=5, seed=42):
+        self.students = students
+        self.lecturers = lecturers
+        self.courses = courses
+        self.semesters = semesters
+        self.courses_per_student = courses_per_student
+        self.seed = seed
+        self._passwords = {}
+
+    def validate(self):
+        if min(self.students, self.courses_per_student) < 0 or min(self.lecturers, self.courses, self.semesters) < 1:
+            raise ValueError('Need at least one lecturer, course and semester.')
+        if self.courses_per_student > self.courses:
+            raise ValueError('--courses-per-student cannot exceed --courses.')
+
+    @transaction.atomic
+    def create(self):
+        rng = random.Random(self.seed)
+        self.cleanup()
+
+        lecturers = User.objects.bulk_create(
+            [self.make_user(rng, index, 'lecturer') for index in range(self.lecturers)], batch_size=BATCH_SIZE,
+        )
+        students = User.objects.bulk_create(
+            [self.make_user(rng, index, 'student') for index in range(self.students)], batch_size=BATCH_SIZE,
+        )
+
+        courses = []
+        for index in range(self.courses):
+            prefix, _major = PROGRAMS[index % len(PROGRAMS)]
+            courses.append(Course(
+                code=f'{prefix}{1000 + index}',
+                name=f'{rng.choice(TOPICS)} {index // len(PROGRAMS) + 1}',
+                lecturer=lecturers[index % len(lecturers)],
+                description='Synthetic load-test course',
+            ))
+        courses = Course.objects.bulk_create(courses, batch_size=BATCH_SIZE)
+
+        schedules = []
+        for course in courses:
+            for day in rng.sample(DAYS, rng.choice((1, 2))):
+                start, end = rng.choice(SLOTS)
+                schedules.append(CourseSchedule(
+                    course=course, day=day, start_time=start, end_time=end, room=rng.choice(ROOMS),
+                ))
+        CourseSchedule.objects.bulk_create(schedules, batch_size=BATCH_SIZE)
+
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        semesters = [Semester.objects.named(name).pk for name in semester_names(self.semesters)]
+        pairs = [
+            (student.pk, course.pk, semester_id)
+            for semester_id in semesters
+            for student in students
+            for course in rng.sample(courses, self.courses_per_student)
+        ]
+        insert_rows(Enrollment, ['student', 'course', 'semester', 'enrollment_date'],
+                    [pair + (now,) for pair in pairs])
+        enrollment_ids = Enrollment.objects.filter(course__in=courses).order_by('pk').values_list('pk', flat=True)
+
+        ability = {student.pk: rng.gauss(0, 8) for student in students}
+        scores = []
+        summaries = []
+        for enrollment_id, (student_id, _course_id, _semester) in zip(enrollment_ids, pairs):
+            grades = {'classwork': 0, 'midterm': 0, 'finals': 0}
+            weighted_total = Decimal('0')
+            for name, weight in ASSESSMENTS:
+                score = self.make_score(rng, 74 + ability[student_id])
+                category = classify_assessment(name)
+                scores.append((enrollment_id, name, category, score, weight, now))
+                grades[category] = score
+                weighted_total += score * weight / 100
+            summaries.append((enrollment_id, grades['classwork'], grades['midterm'], grades['finals'],
+                              weighted_total.quantize(Decimal('0.01')), now))
+        insert_rows(Score, ['enrollment', 'assessment_name', 'category', 'score', 'weight', 'date_added'], scores)
+        # Written directly rather than through GradeSummary.objects.refresh(), which
+        # would read every score back; the values are computed the same way.
+        insert_rows(GradeSummary, ['enrollment', 'classwork', 'midterm', 'finals', 'weighted_total', 'updated_at'],
+                    summaries)
+
+        return {
+            'lecturers': len(lecturers),
+            'students': len(students),
+            'courses': len(courses),
+            'schedules': len(schedules),
+            'enrollments': len(pairs),
+            'scores': len(scores),
+        }
+
+    def make_user(self, rng, index, role):
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        if role == 'lecturer':
+            username = f'{PREFIX}lecturer{index:05d}'
+            return User(
+                username=username, email=f'{username}@prasetiyamulya.ac.id', password=self.password('lecturer123'),
+                first_name=first_name, last_name=last_name, full_name=f'Dr. {first_name} {last_name}',
+                role='instructor', is_lecturer=True,
+            )
+        username = f'{PREFIX}student{index:06d}'
+        return User(
+            username=username, email=f'{username}@student.prasetiyamulya.ac.id', password=self.password('student123'),
+            first_name=first_name, last_name=last_name, full_name=f'{first_name} {last_name}',
+            role='student', is_student=True, major=rng.choice(PROGRAMS)[1],
+        )
+
+    def password(self, raw):
+        # One hash per role: hashing every synthetic account would dominate the run time.
+        if raw not in self._passwords:
+            self._passwords[raw] = make_password(raw)
+        return self._passwords[raw]
+
+    @staticmethod
+    def make_score(rng, mean):
+        value = min(100.0, max(0.0, rng.gauss(mean, 10)))
+        return Decimal(str(round(value, 2)))
+
+    @staticmethod
+    def cleanup():
+        # Score and Enrollment deletes send per-row signals and summary refreshes
+        # through the ORM, so the bulk tables are cleared with plain DELETEs first.
+        enrollments = Enrollment.objects.filter(student__username__startswith=PREFIX).values('pk')
+        subquery, params = enrollments.query.sql_with_params()
+        with connection.cursor() as cursor:
+            for model, column in ((Score, 'enrollment_id'), (GradeSummary, 'enrollment_id'), (Enrollment, 'id')):
+                table = connection.ops.quote_name(model._meta.db_table)
+                cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({subquery})', params)
+        Course.objects.filter(lecturer__username__startswith=PREFIX).delete()
+        User.objects.filter(username__startswith=PREFIX).delete()
+
+
+def insert_rows(model, fields, rows):
+    """INSERT plain tuples with executemany, skipping model instantiation for the bulk tables."""
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(model._meta.get_field(field).column) for field in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    sql = f'INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({placeholders})'
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), BATCH_SIZE):
+            cursor.executemany(sql, rows[start:start + BATCH_SIZE])
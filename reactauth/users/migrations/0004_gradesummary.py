@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:13
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+def classify_assessment(assessment_name):
+    # Frozen copy of users.models.classify_assessment().
+    label = assessment_name.lower()
+    if 'class' in label or 'assignment' in label:
+        return 'classwork'
+    if 'mid' in label:
+        return 'midterm'
+    if 'final' in label:
+        return 'finals'
+    return None
+
+
+def populate_grade_summaries(apps, schema_editor):
+    Enrollment = apps.get_model('users', 'Enrollment')
+    GradeSummary = apps.get_model('users', 'GradeSummary')
+    Score = apps.get_model('users', 'Score')
+
+    summaries = {pk: GradeSummary(enrollment_id=pk) for pk in Enrollment.objects.values_list('pk', flat=True)}
+    scores = Score.objects.order_by('pk').values_list('enrollment_id', 'assessment_name', 'score', 'weight')
+    for enrollment_id, assessment_name, score, weight in scores.iterator():
+        summary = summaries[enrollment_id]
+        category = classify_assessment(assessment_name)
+        if category:
+            setattr(summary, category, score)
+        summary.weighted_total += score * weight / 100
+
+    for summary in summaries.values():
+        summary.weighted_total = summary.weighted_total.quantize(Decimal('0.01'))
+    GradeSummary.objects.bulk_create(summaries.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_course_enrollment_score_courseschedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GradeSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('classwork', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=5)),
+                ('midterm', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=5)),
+                ('finals', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=5)),
+                ('weighted_total', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=8)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('enrollment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='grade_summary', to='users.enrollment')),
+            ],
+            options={
+                'verbose_name_plural': 'grade summaries',
+            },
+        ),
+        migrations.RunPython(populate_grade_summaries, migrations.RunPython.noop),
+    ]
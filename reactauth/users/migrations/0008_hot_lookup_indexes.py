@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:46
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_customuser_email_lower_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(django.db.models.functions.text.Upper('code'), name='course_code_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', 'semester'], name='enrollment_student_sem_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='score',
+            index=models.Index(fields=['enrollment', 'assessment_name'], name='score_enrollment_name_idx'),
+        ),
+    ]
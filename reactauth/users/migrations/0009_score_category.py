@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:48
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Avg, F, Q, Sum
+
+
+def classify_assessment(assessment_name):
+    # Frozen copy of users.models.classify_assessment().
+    label = assessment_name.lower()
+    if 'class' in label or 'assignment' in label:
+        return 'classwork'
+    if 'mid' in label:
+        return 'midterm'
+    if 'final' in label:
+        return 'finals'
+    return None
+
+
+def to_cents(value, scale=1):
+    # Frozen copy of users.models.to_cents().
+    if value is None:
+        return Decimal('0.00')
+    return (Decimal(value) / scale).quantize(Decimal('0.000001')).quantize(Decimal('0.01'))
+
+
+def classify_scores(apps, schema_editor):
+    Score = apps.get_model('users', 'Score')
+    for name in Score.objects.order_by().values_list('assessment_name', flat=True).distinct():
+        category = classify_assessment(name)
+        if category:
+            Score.objects.filter(assessment_name=name).update(category=category)
+
+
+def rebuild_grade_summaries(apps, schema_editor):
+    # Categories with several scores are now averaged rather than last-one-wins.
+    Enrollment = apps.get_model('users', 'Enrollment')
+    GradeSummary = apps.get_model('users', 'GradeSummary')
+    totals = Enrollment.objects.values('pk').annotate(
+        classwork=Avg('scores__score', filter=Q(scores__category='classwork')),
+        midterm=Avg('scores__score', filter=Q(scores__category='midterm')),
+        finals=Avg('scores__score', filter=Q(scores__category='finals')),
+        weighted_points=Sum(F('scores__score') * F('scores__weight')),
+    ).values_list('pk', 'classwork', 'midterm', 'finals', 'weighted_points')
+    GradeSummary.objects.bulk_create(
+        [
+            GradeSummary(
+                enrollment_id=pk, classwork=to_cents(classwork), midterm=to_cents(midterm),
+                finals=to_cents(finals), weighted_total=to_cents(weighted_points, scale=100),
+            )
+            for pk, classwork, midterm, finals, weighted_points in totals.iterator()
+        ],
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['enrollment'],
+        update_fields=['classwork', 'midterm', 'finals', 'weighted_total', 'updated_at'],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_hot_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='score',
+            name='category',
+            field=models.CharField(blank=True, choices=[('classwork', 'Classwork'), ('midterm', 'Midterm'), ('finals', 'Finals')], default='', editable=False, max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='score',
+            index=models.Index(fields=['enrollment', 'category'], name='score_enrollment_category_idx'),
+        ),
+        migrations.RunPython(classify_scores, migrations.RunPython.noop),
+        migrations.RunPython(rebuild_grade_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,113 @@
+from datetime import date
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def semester_dates(name):
+    # Frozen copy of users.models.semester_dates().
+    term, _, year = name.rpartition(' ')
+    try:
+        year = int(year)
+    except ValueError:
+        year = date.today().year
+    if term == 'Spring':
+        return date(year, 1, 1), date(year, 7, 31)
+    if term == 'Fall':
+        return date(year, 8, 1), date(year, 12, 31)
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def create_semesters(apps, schema_editor):
+    Enrollment = apps.get_model('users', 'Enrollment')
+    Semester = apps.get_model('users', 'Semester')
+    semesters = {}
+    for name in Enrollment.objects.order_by().values_list('semester', flat=True).distinct():
+        start_date, end_date = semester_dates(name)
+        semesters[name] = Semester.objects.create(name=name, start_date=start_date, end_date=end_date)
+    if semesters:
+        # The dashboard used the latest term, so it starts out active.
+        latest = max(semesters.values(), key=lambda semester: semester.start_date)
+        Semester.objects.filter(pk=latest.pk).update(is_active=True)
+    for name, semester in semesters.items():
+        Enrollment.objects.filter(semester=name).update(semester_ref=semester)
+
+
+def restore_semester_names(apps, schema_editor):
+    Enrollment = apps.get_model('users', 'Enrollment')
+    Semester = apps.get_model('users', 'Semester')
+    for semester in Semester.objects.all():
+        Enrollment.objects.filter(semester_ref=semester).update(semester=semester.name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_score_category'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='enrollment',
+            unique_together=set(),
+        ),
+        migrations.RemoveIndex(
+            model_name='enrollment',
+            name='enrollment_student_sem_idx',
+        ),
+        migrations.CreateModel(
+            name='Semester',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=20, unique=True)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('is_active', models.BooleanField(default=False)),
+            ],
+            options={
+                'constraints': [
+                    models.UniqueConstraint(
+                        condition=models.Q(('is_active', True)), fields=('is_active',), name='one_active_semester',
+                    ),
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='semester_ref',
+            field=models.ForeignKey(
+                null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='users.semester',
+            ),
+        ),
+        migrations.RunPython(create_semesters, restore_semester_names),
+        # Lets the reverse migration re-add the column before the names are restored.
+        migrations.AlterField(
+            model_name='enrollment',
+            name='semester',
+            field=models.CharField(default='', max_length=20),
+        ),
+        migrations.RemoveField(
+            model_name='enrollment',
+            name='semester',
+        ),
+        migrations.RenameField(
+            model_name='enrollment',
+            old_name='semester_ref',
+            new_name='semester',
+        ),
+        migrations.AlterField(
+            model_name='enrollment',
+            name='semester',
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT, related_name='enrollments', to='users.semester',
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name='enrollment',
+            unique_together={('student', 'course', 'semester')},
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', 'semester'], name='enrollment_student_sem_idx'),
+        ),
+    ]
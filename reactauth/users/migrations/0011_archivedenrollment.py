@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:57
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_semester'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEnrollment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('enrollment_date', models.DateTimeField()),
+                ('classwork', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=5)),
+                ('midterm', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=5)),
+                ('finals', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=5)),
+                ('weighted_total', models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=8)),
+                ('scores', models.JSONField(default=list)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_enrollments', to='users.course')),
+                ('semester', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_enrollments', to='users.semester')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_enrollments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('student', 'course', 'semester')},
+            },
+        ),
+    ]
@@ -1,5 +1,66 @@
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Avg, Case, Exists, F, OuterRef, Q, Sum, Value, When
+from django.db.models.functions import Lower, Upper
+from django.dispatch import Signal
+
+# Sent with ``enrollment_ids`` after GradeSummary rows are recomputed for them.
+grade_summaries_refreshed = Signal()
+
+# Lowest weighted total for each letter grade, best first; anything below is an E.
+LETTER_GRADES = (
+    ('A', 85), ('A-', 80), ('B+', 75), ('B', 70), ('B-', 65), ('C+', 60), ('C', 55), ('D', 45),
+)
+FAILING_GRADE = 'E'
+
+
+def classify_assessment(assessment_name):
+    """Map a free-text assessment name onto a grade summary column (Score.category)."""
+    label = assessment_name.lower()
+    if 'class' in label or 'assignment' in label:
+        return 'classwork'
+    if 'mid' in label:
+        return 'midterm'
+    if 'final' in label:
+        return 'finals'
+    return None
+
+
+def letter_grade(field):
+    """CASE expression mapping the weighted total in ``field`` to its LETTER_GRADES letter.
+
+    NULL (no grade summary) falls through to the failing grade.
+    """
+    return Case(
+        *[When(**{f'{field}__gte': minimum}, then=Value(letter)) for letter, minimum in LETTER_GRADES],
+        default=Value(FAILING_GRADE),
+    )
+
+
+def semester_dates(name):
+    """(start, end) dates for a "Fall 2023" / "Spring 2024" style semester name."""
+    term, _, year = name.rpartition(' ')
+    year = int(year)
+    if term == 'Spring':
+        return date(year, 1, 1), date(year, 7, 31)
+    if term == 'Fall':
+        return date(year, 8, 1), date(year, 12, 31)
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+def role_for_email(email):
+    """'student' or 'lecturer' from a Prasetiya Mulya address, or None for any other domain."""
+    email = email.strip().lower()
+    if email.endswith('@student.prasetiyamulya.ac.id'):
+        return 'student'
+    if email.endswith('@prasetiyamulya.ac.id'):
+        return 'lecturer'
+    return None
 
 
 class CustomUser(AbstractUser):
@@ -23,10 +84,18 @@ class CustomUser(AbstractUser):
     role = models.CharField(max_length=50, blank=True, null=True, choices=ROLE_CHOICES)
     is_student = models.BooleanField(default=False)
     is_lecturer = models.BooleanField(default=False)
+    # Read by the dashboard ETags (users.etags), which show names and emails.
+    updated_at = models.DateTimeField(auto_now=True)
 
     USERNAME_FIELD = 'username'
     REQUIRED_FIELDS = ['email']
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Case-insensitive email login (users.backends.EmailOrUsernameBackend).
+            models.Index(Lower('email'), name='user_email_lower_idx'),
+        ]
+
     def __str__(self):
         return self.email or self.username
 
@@ -36,6 +105,13 @@ class Course(models.Model):
     name = models.CharField(max_length=255)
     lecturer = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, related_name='courses_taught')
     description = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # find_course() matches codes case-insensitively on UPPER(code).
+            models.Index(Upper('code'), name='course_code_upper_idx'),
+        ]
 
     def __str__(self):
         return f"{self.code} - {self.name}"
@@ -55,6 +131,7 @@ class CourseSchedule(models.Model):
     start_time = models.TimeField()
     end_time = models.TimeField()
     room = models.CharField(max_length=10)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ['course', 'day', 'start_time']
@@ -63,25 +140,311 @@ class CourseSchedule(models.Model):
         return f"{self.course.code} - {self.day} {self.start_time}-{self.end_time}"
 
 
+class SemesterManager(models.Manager):
+    # (expires at, semester) shared by every request in the process.
+    _active = None
+
+    def active(self):
+        """The semester flagged active, or the latest one if none is; None without semesters.
+
+        Resolved with one query and then kept in-process until a Semester is saved
+        or deleted (see users.signals) or ``ACTIVE_SEMESTER_CACHE_TIMEOUT`` passes,
+        which bounds how long other workers keep the previous one.
+        """
+        cached = SemesterManager._active
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        return self._remember_active(self.order_by('-is_active', '-start_date').first())
+
+    async def aactive(self):
+        """Async ``active()``, sharing its in-process cache."""
+        cached = SemesterManager._active
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        return self._remember_active(await self.order_by('-is_active', '-start_date').afirst())
+
+    def _remember_active(self, semester):
+        timeout = getattr(settings, 'ACTIVE_SEMESTER_CACHE_TIMEOUT', 300)
+        SemesterManager._active = (time.monotonic() + timeout, semester)
+        return semester
+
+    def forget_active(self):
+        SemesterManager._active = None
+
+    def named(self, name):
+        """Get or create the semester called ``name``, with dates derived from it."""
+        start_date, end_date = semester_dates(name)
+        semester, _created = self.get_or_create(
+            name=name, defaults={'start_date': start_date, 'end_date': end_date},
+        )
+        return semester
+
+
+class Semester(models.Model):
+    name = models.CharField(max_length=20, unique=True)  # e.g., "Fall 2023"
+    start_date = models.DateField()
+    end_date = models.DateField()
+    is_active = models.BooleanField(default=False)
+
+    objects = SemesterManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['is_active'], condition=Q(is_active=True), name='one_active_semester'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            if self.is_active:
+                Semester.objects.filter(is_active=True).exclude(pk=self.pk).update(is_active=False)
+            super().save(*args, **kwargs)
+
+
+class EnrollmentQuerySet(models.QuerySet):
+    def with_final_grade(self):
+        """Annotate ``final_total`` and ``letter_grade`` from the GradeSummary row, in SQL.
+
+        ``weighted_total`` is SUM(score * weight) / 100 as of the last refresh, so
+        a roster gets every student's final grade from the query that lists it.
+        Both are NULL until the enrollment has a summary and at least one score,
+        rather than a 0 and an E nobody earned.
+        """
+        graded = Q(Exists(Score.objects.filter(enrollment=OuterRef('pk'))), grade_summary__isnull=False)
+        return self.annotate(
+            final_total=Case(
+                When(graded, then='grade_summary__weighted_total'),
+                output_field=models.DecimalField(max_digits=8, decimal_places=2),
+            ),
+            letter_grade=Case(
+                When(graded, then=letter_grade('grade_summary__weighted_total')),
+                output_field=models.CharField(),
+            ),
+        )
+
+
 class Enrollment(models.Model):
     student = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='enrollments')
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='enrollments')
-    semester = models.CharField(max_length=20)  # e.g., "Fall 2023"
+    semester = models.ForeignKey(Semester, on_delete=models.PROTECT, related_name='enrollments')
     enrollment_date = models.DateTimeField(auto_now_add=True)
 
+    objects = EnrollmentQuerySet.as_manager()
+
     class Meta:
         unique_together = ['student', 'course', 'semester']
+        indexes = [
+            # Course rosters are filtered by course and paged by student id.
+            models.Index(fields=['course', 'student'], name='enrollment_course_student_idx'),
+            # The student dashboard and its ETag filter on (student, semester).
+            models.Index(fields=['student', 'semester'], name='enrollment_student_sem_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student.username} - {self.course.code}"
 
 
+class ScoreQuerySet(models.QuerySet):
+    """Keeps Score.category and GradeSummary rows current for writes that bypass Score.save()/delete()."""
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.category = classify_assessment(obj.assessment_name) or ''
+        objs = super().bulk_create(objs, *args, **kwargs)
+        GradeSummary.objects.refresh(obj.enrollment_id for obj in objs)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if 'assessment_name' in fields:
+            objs = list(objs)
+            for obj in objs:
+                obj.category = classify_assessment(obj.assessment_name) or ''
+            fields = [*fields, 'category']
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    # bulk_update() is implemented on top of update(), so it is covered here.
+    def update(self, **kwargs):
+        if isinstance(kwargs.get('assessment_name'), str):
+            kwargs['category'] = classify_assessment(kwargs['assessment_name']) or ''
+        enrollment_ids = set(self.values_list('enrollment_id', flat=True))
+        rows = super().update(**kwargs)
+        moved_to = kwargs.get('enrollment_id', kwargs.get('enrollment'))
+        if moved_to is not None:
+            enrollment_ids.add(getattr(moved_to, 'pk', moved_to))
+        GradeSummary.objects.refresh(enrollment_ids)
+        return rows
+
+    def delete(self):
+        enrollment_ids = set(self.values_list('enrollment_id', flat=True))
+        result = super().delete()
+        GradeSummary.objects.refresh(enrollment_ids)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
 class Score(models.Model):
+    CATEGORY_CHOICES = (
+        ('classwork', 'Classwork'),
+        ('midterm', 'Midterm'),
+        ('finals', 'Finals'),
+    )
+
     enrollment = models.ForeignKey(Enrollment, on_delete=models.CASCADE, related_name='scores')
     assessment_name = models.CharField(max_length=100)  # e.g., "Midterm", "Final", "Assignment 1"
+    # Derived from assessment_name on every write; blank for uncategorised assessments.
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, blank=True, default='', editable=False)
     score = models.DecimalField(max_digits=5, decimal_places=2)
     weight = models.DecimalField(max_digits=5, decimal_places=2)  # Percentage weight of this score
     date_added = models.DateTimeField(auto_now_add=True)
 
+    objects = ScoreQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Per-assessment lookups such as the roster PATCH get_or_create().
+            models.Index(fields=['enrollment', 'assessment_name'], name='score_enrollment_name_idx'),
+            models.Index(fields=['enrollment', 'category'], name='score_enrollment_category_idx'),
+        ]
+
     def __str__(self):
         return f"{self.enrollment} - {self.assessment_name}: {self.score}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded enrollment so a reassigned score refreshes both summaries.
+        instance._loaded_enrollment_id = instance.__dict__.get('enrollment_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.category = classify_assessment(self.assessment_name) or ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'assessment_name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'category'}
+        super().save(*args, **kwargs)
+        previous_enrollment_id = getattr(self, '_loaded_enrollment_id', None)
+        GradeSummary.objects.refresh({self.enrollment_id, previous_enrollment_id})
+        self._loaded_enrollment_id = self.enrollment_id
+
+    def delete(self, *args, **kwargs):
+        enrollment_id = self.enrollment_id
+        result = super().delete(*args, **kwargs)
+        GradeSummary.objects.refresh([enrollment_id])
+        return result
+
+
+def to_cents(value, scale=1):
+    """Quantize an aggregate (divided by ``scale``) to 0.01, dropping SQLite's float noise first."""
+    if value is None:
+        return Decimal('0.00')
+    return (Decimal(value) / scale).quantize(Decimal('0.000001')).quantize(Decimal('0.01'))
+
+
+class GradeSummaryManager(models.Manager):
+    def refresh(self, enrollment_ids, batch_size=500):
+        """Recompute the summary rows for the given enrollments from their scores."""
+        enrollment_ids = set(enrollment_ids) - {None}
+        if not enrollment_ids:
+            return 0
+
+        # One grouped query; the LEFT JOIN keeps enrollments without scores at zero.
+        # score * weight is summed in SQL and divided by 100 here, because SQLite
+        # stores whole decimals as integers and would divide them as integers.
+        # A category with several scores (e.g. "Assignment 1" and "Assignment 2")
+        # averages them.
+        totals = (
+            Enrollment.objects.filter(pk__in=enrollment_ids)
+            .values('pk')
+            .annotate(
+                classwork=Avg('scores__score', filter=Q(scores__category='classwork')),
+                midterm=Avg('scores__score', filter=Q(scores__category='midterm')),
+                finals=Avg('scores__score', filter=Q(scores__category='finals')),
+                weighted_points=Sum(F('scores__score') * F('scores__weight')),
+            )
+            .values_list('pk', 'classwork', 'midterm', 'finals', 'weighted_points')
+        )
+        summaries = {
+            enrollment_id: GradeSummary(
+                enrollment_id=enrollment_id,
+                classwork=to_cents(classwork),
+                midterm=to_cents(midterm),
+                finals=to_cents(finals),
+                weighted_total=to_cents(weighted_points, scale=100),
+            )
+            for enrollment_id, classwork, midterm, finals, weighted_points in totals
+        }
+
+        self.bulk_create(
+            summaries.values(),
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['enrollment'],
+            update_fields=['classwork', 'midterm', 'finals', 'weighted_total', 'updated_at'],
+        )
+        grade_summaries_refreshed.send(sender=GradeSummary, enrollment_ids=set(summaries))
+        return len(summaries)
+
+
+class GradeSummary(models.Model):
+    """Denormalized per-enrollment grades, rebuilt whenever the enrollment's scores change."""
+
+    enrollment = models.OneToOneField(Enrollment, on_delete=models.CASCADE, related_name='grade_summary')
+    classwork = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0'))
+    midterm = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0'))
+    finals = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0'))
+    weighted_total = models.DecimalField(max_digits=8, decimal_places=2, default=Decimal('0'))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = GradeSummaryManager()
+
+    class Meta:
+        verbose_name_plural = 'grade summaries'
+
+    def __str__(self):
+        return f"{self.enrollment} - {self.weighted_total}"
+
+    def as_grades(self):
+        return {
+            'classwork': float(self.classwork),
+            'midterm': float(self.midterm),
+            'finals': float(self.finals),
+        }
+
+
+class ArchivedEnrollment(models.Model):
+    """An Enrollment from a closed semester with its GradeSummary and scores folded into one row.
+
+    ``manage.py archive_semesters`` moves enrollments here so the live Enrollment,
+    Score and GradeSummary tables (and their indexes) only hold recent terms.
+    Transcripts read both through ``users.archive.transcript()``.
+    """
+
+    student = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='archived_enrollments')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='archived_enrollments')
+    semester = models.ForeignKey(Semester, on_delete=models.PROTECT, related_name='archived_enrollments')
+    enrollment_date = models.DateTimeField()
+    classwork = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0'))
+    midterm = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0'))
+    finals = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0'))
+    weighted_total = models.DecimalField(max_digits=8, decimal_places=2, default=Decimal('0'))
+    # [[assessment name, score, weight], ...] with decimals as strings.
+    scores = models.JSONField(default=list)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ['student', 'course', 'semester']
+
+    def __str__(self):
+        return f"{self.student.username} - {self.course.code} ({self.semester})"
+
+    def as_grades(self):
+        return {
+            'classwork': float(self.classwork),
+            'midterm': float(self.midterm),
+            'finals': float(self.finals),
+        }
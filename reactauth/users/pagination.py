@@ -0,0 +1,32 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class RosterCursorPagination(CursorPagination):
+    """Opt-in keyset pagination over a course's enrollments, ordered by student id.
+
+    Each page filters on ``student_id > <cursor position>`` through the
+    ``(course, student)`` index, so deep pages cost the same as the first one.
+    """
+
+    ordering = ('student_id', 'pk')
+    page_size = getattr(settings, 'ROSTER_PAGE_SIZE', 50)
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'ROSTER_MAX_PAGE_SIZE', 500)
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def first_page_next_link(self, base_url, enrollments, page_size):
+        """Cursor link to the page after ``enrollments``, fetched as the first ``page_size + 1`` rows."""
+        self.base_url = replace_query_param(base_url, self.page_size_query_param, page_size)
+        self.page_size = page_size
+        self.cursor = None
+        self.page = list(enrollments[:page_size])
+        self.has_next = len(enrollments) > page_size
+        self.has_previous = False
+        if self.has_next:
+            self.next_position = self._get_position_from_instance(enrollments[page_size], self.ordering)
+        return self.get_next_link()
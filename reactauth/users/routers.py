@@ -0,0 +1,107 @@
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS
+
+_routing = ContextVar('replica_routing', default=None)
+
+# Authentication runs inside the view, after replica reads are switched on. A
+# token or user row missing from a lagging replica would turn a fresh login
+# into a 401, so these always read the primary.
+PRIMARY_ONLY_APPS = {'auth', 'authtoken'}
+
+
+class RequestRouting:
+    """Per-request replica state: may this request read from the replica, and has it written?"""
+
+    def __init__(self):
+        self.replica_reads = False
+        self.pinned = False
+
+
+def reading_replica():
+    """True while the current request's reads go to the replica, which may lag the primary.
+
+    Results read this way must not be cached past the request: a write clears
+    the caches at once, but the replica only catches up at the next sync.
+    """
+    routing = _routing.get()
+    return routing is not None and routing.replica_reads and not routing.pinned
+
+
+class ReplicaRouter:
+    """Sends reads of replica-enabled GET requests to ``DATABASE_REPLICA``.
+
+    Everything else uses the primary: writes, reads outside a request
+    (management commands, shell), other views, every read that follows a
+    write in the same request, so a request always sees its own writes, and
+    the token and user lookups of authentication.
+    """
+
+    def db_for_read(self, model, **hints):
+        if reading_replica() and not self.authenticates(model):
+            return settings.DATABASE_REPLICA
+        # Explicit, so related lookups on a replica-loaded instance do not stay there.
+        return DEFAULT_DB_ALIAS
+
+    def authenticates(self, model):
+        return model._meta.app_label in PRIMARY_ONLY_APPS or model._meta.label == settings.AUTH_USER_MODEL
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, settings.DATABASE_REPLICA}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary file (manage.py sync_replica).
+        return db != settings.DATABASE_REPLICA
+
+
+class ReplicaReadsMiddleware:
+    """Lets GET/HEAD requests to views with ``replica_reads = True`` read from the replica.
+
+    Only installed when ``DATABASE_REPLICA`` is set. Streaming bodies are
+    produced after the request has left the middleware and read the primary.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'DATABASE_REPLICA', None):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _routing.set(RequestRouting())
+        try:
+            return self.get_response(request)
+        finally:
+            _routing.reset(token)
+
+    async def __acall__(self, request):
+        # sync_to_async copies the context, so the ORM threads see this state too.
+        token = _routing.set(RequestRouting())
+        try:
+            return await self.get_response(request)
+        finally:
+            _routing.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        routing = _routing.get()
+        view_class = getattr(view_func, 'cls', None)
+        if routing is not None and request.method in ('GET', 'HEAD') and getattr(view_class, 'replica_reads', False):
+            routing.replica_reads = True
@@ -1,11 +1,26 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 import re
 
 User = get_user_model()
 
 
+def add_user_claims(token, user):
+    """Profile and role claims; ClaimsJWTAuthentication authorizes reads from them."""
+    token['email'] = user.email
+    token['full_name'] = user.full_name
+    token['major'] = user.major
+    token['role'] = user.role
+    token['username'] = user.username
+    token['is_staff'] = user.is_staff
+    token['is_student'] = user.is_student
+    token['is_lecturer'] = user.is_lecturer
+    return token
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     password_confirmation = serializers.CharField(
         write_only=True,
@@ -79,16 +94,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     @classmethod
     
     def get_token(cls, user):
-        token = super().get_token(user)
-
-        
-        # Add custom claims
-        token['email'] = user.email
-        token['full_name'] = user.full_name
-        token['major'] = user.major
-        token['role'] = user.role
-
-        return token
+        return add_user_claims(super().get_token(user), user)
 
     def validate(self, attrs):
         data = super().validate(attrs)
@@ -108,3 +114,36 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         })
 
         return data
+
+
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh that reissues the claims from the user row instead of copying them.
+
+    The stock serializer copies every claim of the refresh token into the new
+    access token, so a revoked role kept authorizing reads for the whole
+    refresh lifetime rather than the access lifetime.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = User.objects.filter(
+            **{jwt_settings.USER_ID_FIELD: refresh.payload.get(jwt_settings.USER_ID_CLAIM)}
+        ).first()
+        if user is None or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        add_user_claims(refresh, user)
+
+        data = {'access': str(refresh.access_token)}
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    # rest_framework_simplejwt.token_blacklist is not installed.
+                    pass
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+        return data
@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .cache import dashboard_cache, statistics_cache, token_cache
+from .models import Course, CourseSchedule, Enrollment, Semester, grade_summaries_refreshed
+
+User = get_user_model()
+
+
+def course_audience(course_ids):
+    """User ids whose dashboards show any of the given courses."""
+    lecturer_ids = Course.objects.filter(pk__in=course_ids).values_list('lecturer_id', flat=True)
+    student_ids = Enrollment.objects.filter(course_id__in=course_ids).values_list('student_id', flat=True)
+    return {*lecturer_ids, *student_ids} - {None}
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def invalidate_enrollment(sender, instance, **kwargs):
+    lecturer_ids = Course.objects.filter(pk=instance.course_id).values_list('lecturer_id', flat=True)
+    dashboard_cache.invalidate_owners({instance.student_id, *lecturer_ids} - {None})
+    statistics_cache.invalidate_owners([instance.course_id])
+
+
+@receiver(grade_summaries_refreshed)
+def invalidate_scores(sender, enrollment_ids, **kwargs):
+    rows = list(
+        Enrollment.objects.filter(pk__in=enrollment_ids).values_list('student_id', 'course__lecturer_id', 'course_id')
+    )
+    dashboard_cache.invalidate_owners({user_id for row in rows for user_id in row[:2]} - {None})
+    statistics_cache.invalidate_owners({course_id for _student, _lecturer, course_id in rows})
+
+
+@receiver(pre_save, sender=Course)
+def remember_course_lecturer(sender, instance, **kwargs):
+    instance._previous_lecturer_id = (
+        Course.objects.filter(pk=instance.pk).values_list('lecturer_id', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course(sender, instance, **kwargs):
+    affected = course_audience([instance.pk])
+    affected.update({instance.lecturer_id, getattr(instance, '_previous_lecturer_id', None)})
+    dashboard_cache.invalidate_owners(affected - {None})
+    statistics_cache.invalidate_owners([instance.pk])
+
+
+@receiver(post_save, sender=CourseSchedule)
+@receiver(post_delete, sender=CourseSchedule)
+def invalidate_schedule(sender, instance, **kwargs):
+    dashboard_cache.invalidate_owners(course_audience([instance.course_id]))
+
+
+@receiver(post_save, sender=User)
+def invalidate_user(sender, instance, update_fields=None, **kwargs):
+    # Logging in only touches last_login, which no dashboard shows.
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    course_ids = {
+        *Course.objects.filter(lecturer=instance).values_list('pk', flat=True),
+        *Enrollment.objects.filter(student=instance).values_list('course_id', flat=True),
+    }
+    dashboard_cache.invalidate_owners(course_audience(course_ids) | {instance.pk})
+
+
+@receiver(post_save, sender=Semester)
+@receiver(post_delete, sender=Semester)
+def forget_active_semester(sender, **kwargs):
+    # Student dashboard cache keys include the semester id, so entries for the
+    # previous semester simply stop being read.
+    Semester.objects.forget_active()
+
+
+@receiver(post_delete, sender=Token)
+def forget_token(sender, instance, **kwargs):
+    token_cache.delete(instance.key)
+
+
+@receiver(post_save, sender=User)
+def forget_user_tokens(sender, instance, update_fields=None, **kwargs):
+    # Deactivation, role and profile changes all go through here; last_login is not cached.
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    token_cache.invalidate_owners([instance.pk])
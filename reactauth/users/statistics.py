@@ -0,0 +1,85 @@
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+
+from .models import Score
+
+try:
+    import numpy as np
+except ImportError:  # Course statistics are optional
+    np = None
+
+PERCENTILES = (10, 25, 75, 90)
+# Ten 10-point bins over 0-100; a perfect score lands in the last one.
+HISTOGRAM_BINS = 10
+HISTOGRAM_WIDTH = 10
+
+
+def score_columns(course_ids):
+    """(course ids, assessment names, scores) of every score in the courses as flat NumPy arrays."""
+    rows = (
+        Score.objects.filter(enrollment__course_id__in=course_ids)
+        .order_by()
+        # Floats straight from the database skip a Decimal per row.
+        .values_list('enrollment__course_id', 'assessment_name', Cast('score', FloatField()))
+    )
+    columns = list(zip(*rows)) or [(), (), ()]
+    return (
+        np.array(columns[0], dtype=np.int64),
+        np.array(columns[1], dtype=object),
+        np.array(columns[2], dtype=np.float64),
+    )
+
+
+def course_statistics(course_ids):
+    """{course id: [statistics per assessment]} for the given courses, from one query.
+
+    Scores are grouped by (course, assessment name) and every statistic is
+    computed for all groups at once: means and standard deviations (population)
+    with ``bincount``, medians and percentiles by linear interpolation into one
+    group-sorted array, histograms with a single ``bincount`` over group x bin.
+    """
+    course_ids = list(course_ids)
+    statistics = {course_id: [] for course_id in course_ids}
+    courses, names, scores = score_columns(course_ids)
+    if not len(scores):
+        return statistics
+
+    name_labels, name_codes = np.unique(names, return_inverse=True)
+    group_keys, groups, counts = np.unique(
+        courses * len(name_labels) + name_codes, return_inverse=True, return_counts=True,
+    )
+
+    means = np.bincount(groups, weights=scores) / counts
+    stds = np.sqrt(np.bincount(groups, weights=(scores - means[groups]) ** 2) / counts)
+
+    ordered = scores[np.lexsort((scores, groups))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    def percentile(q):
+        position = starts + (counts - 1) * (q / 100)
+        low = np.floor(position).astype(np.int64)
+        high = np.ceil(position).astype(np.int64)
+        return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+    medians = percentile(50)
+    percentiles = {q: percentile(q) for q in PERCENTILES}
+    bins = np.clip((scores // HISTOGRAM_WIDTH).astype(np.int64), 0, HISTOGRAM_BINS - 1)
+    histograms = np.bincount(groups * HISTOGRAM_BINS + bins, minlength=len(group_keys) * HISTOGRAM_BINS)
+    histograms = histograms.reshape(len(group_keys), HISTOGRAM_BINS)
+    edges = [HISTOGRAM_WIDTH * index for index in range(HISTOGRAM_BINS + 1)]
+
+    # group_keys is sorted by course and then assessment name.
+    for index, key in enumerate(group_keys.tolist()):
+        course_id, name_code = divmod(key, len(name_labels))
+        statistics[course_id].append({
+            'name': name_labels[name_code],
+            'count': int(counts[index]),
+            'mean': round(float(means[index]), 2),
+            'median': round(float(medians[index]), 2),
+            'std': round(float(stds[index]), 2),
+            'min': float(ordered[starts[index]]),
+            'max': float(ordered[starts[index] + counts[index] - 1]),
+            'percentiles': {str(q): round(float(values[index]), 2) for q, values in percentiles.items()},
+            'histogram': {'edges': edges, 'counts': histograms[index].tolist()},
+        })
+    return statistics
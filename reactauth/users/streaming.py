@@ -0,0 +1,85 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+_renderer = JSONRenderer()
+
+# Rows fetched per database round trip while streaming.
+CHUNK_SIZE = getattr(settings, 'STREAMING_CHUNK_SIZE', 500)
+
+# Flush to the client roughly every 64 KiB instead of once per row.
+BUFFER_SIZE = 64 * 1024
+
+
+def render_json(data):
+    """Bytes identical to what ``Response(data)`` renders with the default JSONRenderer."""
+    return _renderer.render(data)
+
+
+def json_array_chunks(items):
+    yield b'['
+    for index, item in enumerate(items):
+        if index:
+            yield b','
+        yield render_json(item)
+    yield b']'
+
+
+def json_object_chunks(head, key, items):
+    """Render ``{**head, key: [*items]}`` with the array written incrementally."""
+    opening = render_json(head)[:-1]
+    if head:
+        opening += b','
+    yield opening + render_json(key) + b':'
+    yield from json_array_chunks(items)
+    yield b'}'
+
+
+async def ajson_array_chunks(items):
+    """``json_array_chunks()`` over an async iterable, e.g. ``QuerySet.aiterator()``."""
+    yield b'['
+    index = 0
+    async for item in items:
+        if index:
+            yield b','
+        yield render_json(item)
+        index += 1
+    yield b']'
+
+
+async def ajson_object_chunks(head, key, items):
+    opening = render_json(head)[:-1]
+    if head:
+        opening += b','
+    yield opening + render_json(key) + b':'
+    async for chunk in ajson_array_chunks(items):
+        yield chunk
+    yield b'}'
+
+
+def buffered(chunks, size=BUFFER_SIZE):
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+async def abuffered(chunks, size=BUFFER_SIZE):
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def streaming_json_response(chunks):
+    """Stream ``chunks``, a generator or (from async views) an async generator, in buffered writes."""
+    body = abuffered(chunks) if hasattr(chunks, '__aiter__') else buffered(chunks)
+    return StreamingHttpResponse(body, content_type=JSONRenderer.media_type)
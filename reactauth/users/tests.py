@@ -1,3 +1,1558 @@
-from django.test import TestCase
+from datetime import date, time
 
-# Create your tests here.
+from decimal import Decimal
+import csv
+import io
+import json
+import sqlite3
+import tempfile
+import zipfile
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import MD5PasswordHasher
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import call_command
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.db.models.functions import Upper
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from asgiref.sync import async_to_sync, sync_to_async
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reactauth.sqlite import PRAGMAS, connection_options
+
+from .authentication import CachedTokenAuthentication
+from .cache import ScopedLRUCache, dashboard_cache, statistics_cache, token_cache
+from .models import ArchivedEnrollment, Course, CourseSchedule, Enrollment, GradeSummary, Score, Semester
+from .statistics import course_statistics, np
+from .throttling import LoginIdentityThrottle, SlidingWindowStore, hashing_slots, throttle_store
+from .routers import ReplicaReadsMiddleware, ReplicaRouter
+from .serializers import CustomTokenObtainPairSerializer
+from .timing import RequestTimings, ServerTimingMiddleware
+from .views import (
+    AsyncCourseStudentsView,
+    AsyncLecturerDashboardView,
+    AsyncStudentDashboardView,
+    LecturerStatisticsView,
+    StudentDashboardView,
+    UserLoginView,
+    find_course,
+)
+
+User = get_user_model()
+
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+COUNTING_HASHERS = ['users.tests.CountingMD5PasswordHasher']
+
+
+class CountingMD5PasswordHasher(MD5PasswordHasher):
+    """MD5 hasher that counts how many times a password was hashed."""
+
+    calls = 0
+
+    def encode(self, password, salt):
+        type(self).calls += 1
+        return super().encode(password, salt)
+
+
+def make_lecturer(username='lecturer'):
+    return User.objects.create_user(
+        username=username,
+        password='lecturer123',
+        email=f'{username}@prasetiyamulya.ac.id',
+        full_name=f'Dr. {username.title()}',
+        role='instructor',
+        is_lecturer=True,
+    )
+
+
+def make_student(username='student'):
+    return User.objects.create_user(
+        username=username,
+        password='student123',
+        email=f'{username}@student.prasetiyamulya.ac.id',
+        full_name=username.title(),
+        role='student',
+        is_student=True,
+    )
+
+
+def make_course(code, lecturer, schedules=2):
+    course = Course.objects.create(code=code, name=f'Course {code}', lecturer=lecturer)
+    for index in range(schedules):
+        CourseSchedule.objects.create(
+            course=course,
+            day=('Mon', 'Wed', 'Fri')[index % 3],
+            start_time=time(8 + index, 0),
+            end_time=time(9 + index, 30),
+            room=f'R{index}',
+        )
+    return course
+
+
+def enroll(student, course, semester='Fall 2023', scores=(('Classwork', 80, 30), ('Midterm', 70, 30), ('Final Exam', 90, 40))):
+    enrollment = Enrollment.objects.create(student=student, course=course, semester=Semester.objects.named(semester))
+    for name, value, weight in scores:
+        Score.objects.create(enrollment=enrollment, assessment_name=name, score=value, weight=weight)
+    return enrollment
+
+
+def authenticated_client(user):
+    """Client whose token is already in the auth cache, so query budgets only count the view."""
+    client = APIClient()
+    token, _ = Token.objects.get_or_create(user=user)
+    CachedTokenAuthentication().authenticate_credentials(token.key)
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class DashboardQueryBudgetTests(TestCase):
+    # ETag fingerprint + enrollments/grade summaries + schedules
+    STUDENT_QUERIES = 3
+    # ETag fingerprint + courses + schedules + enrollments/students + scores
+    LECTURER_QUERIES = 5
+
+    def setUp(self):
+        dashboard_cache.clear()
+        self.lecturer = make_lecturer()
+        self.student = make_student()
+        Semester.objects.named('Fall 2023')
+        Semester.objects.active()  # resolved once per process, outside the budget
+
+    def _grow(self, courses, students_per_course):
+        start = Course.objects.count()
+        for offset in range(courses):
+            course = make_course(f'C{start + offset:03d}', self.lecturer)
+            enroll(self.student, course)
+            for index in range(students_per_course):
+                enroll(make_student(f'{course.code.lower()}_s{index}'), course)
+
+    def test_student_dashboard_query_count_is_constant(self):
+        client = authenticated_client(self.student)
+        url = reverse('student_dashboard')
+
+        self._grow(courses=1, students_per_course=1)
+        with self.assertNumQueries(self.STUDENT_QUERIES):
+            small = client.get(url)
+
+        self._grow(courses=5, students_per_course=3)
+        with self.assertNumQueries(self.STUDENT_QUERIES):
+            large = client.get(url)
+
+        self.assertEqual(len(small.json()), 1)
+        self.assertEqual(len(large.json()), 6)
+        first = large.json()[0]
+        self.assertEqual(first['schedule'], {'day': 'Mon', 'start': '08:00', 'end': '09:30', 'room': 'R0'})
+        self.assertEqual(first['grades'], {'classwork': 80.0, 'midterm': 70.0, 'finals': 90.0})
+        self.assertEqual(first['lecturer'], '')
+
+    def test_lecturer_dashboard_query_count_is_constant(self):
+        client = authenticated_client(self.lecturer)
+        url = reverse('lecturer_dashboard')
+
+        self._grow(courses=1, students_per_course=1)
+        with self.assertNumQueries(self.LECTURER_QUERIES):
+            small = client.get(url)
+
+        self._grow(courses=5, students_per_course=4)
+        with self.assertNumQueries(self.LECTURER_QUERIES):
+            large = client.get(url)
+
+        self.assertEqual(len(small.json()), 1)
+        self.assertEqual(len(large.json()), 6)
+        course = large.json()[-1]
+        self.assertEqual(course['totalStudents'], 5)
+        self.assertEqual(course['schedule']['room'], 'R0')
+        self.assertEqual(
+            course['students'][0]['scores'][0],
+            {'name': 'Classwork', 'score': 80.0, 'weight': 30.0},
+        )
+
+    def test_dashboards_reject_wrong_role(self):
+        self.assertEqual(authenticated_client(self.lecturer).get(reverse('student_dashboard')).status_code, 403)
+        self.assertEqual(authenticated_client(self.student).get(reverse('lecturer_dashboard')).status_code, 403)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class SemesterTests(TestCase):
+    def setUp(self):
+        dashboard_cache.clear()
+        self.spring = Semester.objects.named('Spring 2024')
+        self.fall = Semester.objects.named('Fall 2023')
+        self.student = make_student()
+        course = make_course('DBT201', make_lecturer())
+        enroll(self.student, course, semester='Fall 2023')
+        enroll(self.student, make_course('DBT202', course.lecturer), semester='Spring 2024')
+
+    def test_named_derives_dates(self):
+        self.assertEqual((self.fall.start_date, self.fall.end_date), (date(2023, 8, 1), date(2023, 12, 31)))
+        self.assertEqual(Semester.objects.named('Fall 2023'), self.fall)
+
+    def test_active_semester_is_resolved_once_until_a_semester_changes(self):
+        self.assertEqual(Semester.objects.active(), self.spring)  # latest when none is flagged
+        with self.assertNumQueries(0):
+            self.assertEqual(Semester.objects.active(), self.spring)
+
+        self.fall.is_active = True
+        self.fall.save()
+        self.assertEqual(Semester.objects.active(), self.fall)
+
+        self.spring.is_active = True
+        self.spring.save()
+        self.assertEqual(list(Semester.objects.filter(is_active=True)), [self.spring])
+
+    def test_student_dashboard_shows_the_active_semester(self):
+        client = authenticated_client(self.student)
+        self.assertEqual([row['code'] for row in client.get(reverse('student_dashboard')).json()], ['DBT202'])
+
+        self.fall.is_active = True
+        self.fall.save()
+        self.assertEqual([row['code'] for row in client.get(reverse('student_dashboard')).json()], ['DBT201'])
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ArchiveTests(TestCase):
+    def setUp(self):
+        dashboard_cache.clear()
+        self.student = make_student()
+        lecturer = make_lecturer()
+        self.old = enroll(self.student, make_course('DBT101', lecturer), semester='Spring 2023',
+                          scores=(('Midterm', 50, 30), ('Final Exam', 60, 40)))
+        enroll(self.student, make_course('DBT201', lecturer), semester='Fall 2023')
+        current = Semester.objects.named('Spring 2024')
+        current.is_active = True
+        current.save()
+        enroll(self.student, make_course('DBT301', lecturer), semester='Spring 2024')
+        self.client = authenticated_client(self.student)
+
+    def test_closed_semesters_move_to_the_archive(self):
+        before = self.client.get(reverse('student_transcript')).json()
+
+        call_command('archive_semesters', stdout=StringIO())
+
+        self.assertEqual(
+            list(Enrollment.objects.order_by('pk').values_list('semester__name', flat=True)),
+            ['Fall 2023', 'Spring 2024'],
+        )
+        self.assertFalse(Score.objects.filter(enrollment_id=self.old.pk).exists())
+        self.assertFalse(GradeSummary.objects.filter(enrollment_id=self.old.pk).exists())
+        archived = ArchivedEnrollment.objects.get()
+        self.assertEqual(archived.scores, [['Midterm', '50.00', '30.00'], ['Final Exam', '60.00', '40.00']])
+        self.assertEqual(archived.weighted_total, Decimal('39.00'))
+
+        # live enrollments + archived enrollments
+        with self.assertNumQueries(2):
+            after = self.client.get(reverse('student_transcript')).json()
+        self.assertEqual([row['code'] for row in after], ['DBT101', 'DBT201', 'DBT301'])
+        self.assertEqual([row['archived'] for row in after], [True, False, False])
+        for row in before + after:
+            row.pop('archived')
+        self.assertEqual(after, before)
+        self.assertEqual((after[0]['weightedTotal'], after[0]['letterGrade']), (39.0, 'E'))
+
+    def test_ungraded_enrollment_stays_ungraded_in_the_archive(self):
+        enroll(self.student, make_course('AIR101', make_lecturer('other')), semester='Spring 2023', scores=())
+        before = self.client.get(reverse('student_transcript')).json()
+        call_command('archive_semesters', stdout=StringIO())
+        after = self.client.get(reverse('student_transcript')).json()
+
+        row = next(row for row in after if row['code'] == 'AIR101')
+        self.assertEqual((row['weightedTotal'], row['letterGrade'], row['archived']), (None, None, True))
+        for row in before + after:
+            row.pop('archived')
+        self.assertEqual(after, before)
+
+    def test_dry_run_and_keep_previous(self):
+        out = StringIO()
+        call_command('archive_semesters', '--dry-run', '--keep-previous', '0', stdout=out)
+        self.assertIn('Spring 2023: 1 enrollments would be archived', out.getvalue())
+        self.assertIn('Fall 2023: 1 enrollments would be archived', out.getvalue())
+        self.assertFalse(ArchivedEnrollment.objects.exists())
+
+        call_command('archive_semesters', '--keep-previous', '0', '--batch-size', '1', stdout=StringIO())
+        self.assertEqual(Enrollment.objects.count(), 1)
+        self.assertEqual(ArchivedEnrollment.objects.count(), 2)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class GradeSummaryTests(TestCase):
+    def setUp(self):
+        self.lecturer = make_lecturer()
+        self.course = make_course('DBT201', self.lecturer)
+        self.enrollment = enroll(make_student(), self.course, scores=())
+
+    def summary(self):
+        return GradeSummary.objects.get(enrollment=self.enrollment)
+
+    def test_save_and_delete_keep_summary_current(self):
+        midterm = Score.objects.create(enrollment=self.enrollment, assessment_name='Midterm', score=70, weight=30)
+        Score.objects.create(enrollment=self.enrollment, assessment_name='Final Exam', score=90, weight=40)
+        self.assertEqual(self.summary().as_grades(), {'classwork': 0.0, 'midterm': 70.0, 'finals': 90.0})
+        self.assertEqual(self.summary().weighted_total, Decimal('57.00'))
+
+        midterm.score = 80
+        midterm.save()
+        self.assertEqual(self.summary().midterm, Decimal('80'))
+
+        midterm.delete()
+        self.assertEqual(self.summary().midterm, Decimal('0'))
+        self.assertEqual(self.summary().weighted_total, Decimal('36.00'))
+
+    def test_category_follows_assessment_name_on_every_write_path(self):
+        score = Score.objects.create(enrollment=self.enrollment, assessment_name='Quiz', score=70, weight=10)
+        self.assertEqual(score.category, '')
+
+        score.assessment_name = 'Final Exam'
+        score.save(update_fields=['assessment_name'])
+        self.assertEqual(Score.objects.get(pk=score.pk).category, 'finals')
+
+        Score.objects.filter(pk=score.pk).update(assessment_name='Midterm')
+        self.assertEqual(Score.objects.get(pk=score.pk).category, 'midterm')
+
+        score = Score.objects.get(pk=score.pk)
+        score.assessment_name = 'Assignment 3'
+        Score.objects.bulk_update([score], ['assessment_name'])
+        self.assertEqual(Score.objects.get(pk=score.pk).category, 'classwork')
+
+        created, = Score.objects.bulk_create([
+            Score(enrollment=self.enrollment, assessment_name='Mid-semester test', score=50, weight=10),
+        ])
+        self.assertEqual(Score.objects.get(pk=created.pk).category, 'midterm')
+
+    def test_refresh_averages_a_category_in_one_query(self):
+        Score.objects.bulk_create([
+            Score(enrollment=self.enrollment, assessment_name='Assignment 1', score=60, weight=15),
+            Score(enrollment=self.enrollment, assessment_name='Assignment 2', score=91, weight=15),
+            Score(enrollment=self.enrollment, assessment_name='Final Exam', score=70, weight=40),
+        ])
+        other = enroll(make_student('bob'), self.course, scores=())
+
+        with CaptureQueriesContext(connection) as queries:
+            GradeSummary.objects.refresh([self.enrollment.pk, other.pk])
+
+        # The other SELECT is the dashboard cache receiver looking up affected users.
+        self.assertEqual(len([query for query in queries if 'users_score' in query['sql']]), 1)
+        self.assertEqual(self.summary().classwork, Decimal('75.50'))
+        self.assertEqual(self.summary().weighted_total, Decimal('50.65'))
+        self.assertEqual(GradeSummary.objects.get(enrollment=other).weighted_total, Decimal('0'))
+
+    def test_bulk_paths_keep_summary_current(self):
+        Score.objects.bulk_create([
+            Score(enrollment=self.enrollment, assessment_name='Assignment 1', score=60, weight=30),
+            Score(enrollment=self.enrollment, assessment_name='Midterm', score=50, weight=30),
+        ])
+        self.assertEqual(self.summary().as_grades(), {'classwork': 60.0, 'midterm': 50.0, 'finals': 0.0})
+
+        Score.objects.filter(assessment_name='Midterm').update(score=65)
+        self.assertEqual(self.summary().midterm, Decimal('65'))
+
+        scores = list(self.enrollment.scores.all())
+        for score in scores:
+            score.score = 100
+        Score.objects.bulk_update(scores, ['score'])
+        self.assertEqual(self.summary().weighted_total, Decimal('60.00'))
+
+        Score.objects.filter(enrollment=self.enrollment).delete()
+        self.assertEqual(self.summary().weighted_total, Decimal('0.00'))
+
+    def test_rebuild_command_restores_missing_rows(self):
+        Score.objects.create(enrollment=self.enrollment, assessment_name='Classwork', score=88, weight=30)
+        GradeSummary.objects.all()._raw_delete(GradeSummary.objects.db)
+
+        call_command('rebuild_grade_summaries', stdout=StringIO())
+        self.assertEqual(self.summary().classwork, Decimal('88'))
+
+    def test_roster_reads_grades_from_summary(self):
+        Score.objects.create(enrollment=self.enrollment, assessment_name='Classwork', score=75, weight=30)
+        client = authenticated_client(self.lecturer)
+        url = reverse('course_students', args=['dbt201'])
+
+        # course + ETag fingerprint + enrollments/students/grade summaries
+        with self.assertNumQueries(3):
+            response = client.get(url)
+        self.assertEqual(response.json()[0]['grades'], {'classwork': 75.0, 'midterm': 0.0, 'finals': 0.0})
+
+        response = client.patch(
+            reverse('course_student_grades', args=['DBT201', self.enrollment.student_id]),
+            {'midterm': 66},
+            format='json',
+        )
+        self.assertEqual(response.json()['grades']['midterm'], 66.0)
+        self.assertEqual(self.summary().midterm, Decimal('66'))
+
+    def test_patch_returns_the_grades_the_roster_shows(self):
+        for name in ('Assignment 1', 'Assignment 2'):
+            Score.objects.create(enrollment=self.enrollment, assessment_name=name, score=85, weight=15)
+        client = authenticated_client(self.lecturer)
+
+        patched = client.patch(
+            reverse('course_student_grades', args=['DBT201', self.enrollment.student_id]),
+            {'classwork': 50},
+            format='json',
+        ).json()
+        listed = client.get(reverse('course_students', args=['DBT201'])).json()[0]
+        self.assertEqual(patched['grades'], listed['grades'])
+        self.assertEqual(patched['grades']['classwork'], 73.33)
+
+    def test_patch_refreshes_the_summary_once(self):
+        client = authenticated_client(self.lecturer)
+        url = reverse('course_student_grades', args=['DBT201', self.enrollment.student_id])
+        client.patch(url, {'classwork': 1, 'midterm': 1, 'finals': 1}, format='json')
+
+        # course + enrollment + savepoint, the scores, bulk_update's id read and UPDATE,
+        # one summary refresh (SELECT + upsert) + the dashboard cache receiver,
+        # release, and the response read: 11, not four per assessment.
+        with CaptureQueriesContext(connection) as queries:
+            response = client.patch(url, {'classwork': 50, 'midterm': 60, 'finals': 70}, format='json')
+        self.assertEqual(len(queries), 11)
+        self.assertEqual(len([query for query in queries if 'INSERT INTO "users_gradesummary"' in query['sql']]), 1)
+        self.assertEqual((response.json()['weightedTotal'], self.summary().classwork), (61.0, Decimal('50')))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class FinalGradeTests(TestCase):
+    def setUp(self):
+        dashboard_cache.clear()
+        self.lecturer = make_lecturer()
+        self.course = make_course('DBT301', self.lecturer)
+
+    def test_letter_grade_boundaries(self):
+        # Single 100%-weight scores, so the weighted total is the score itself.
+        for index, (value, letter) in enumerate([(85, 'A'), (84.99, 'A-'), (70, 'B'), (55, 'C'), (44.99, 'E')]):
+            enroll(make_student(f's{index}'), self.course, scores=(('Final Exam', value, 100),))
+        enroll(make_student('unscored'), self.course, scores=())
+
+        grades = list(
+            Enrollment.objects.with_final_grade().order_by('pk').values_list('final_total', 'letter_grade')
+        )
+        self.assertEqual(grades, [
+            (Decimal('85'), 'A'), (Decimal('84.99'), 'A-'), (Decimal('70'), 'B'),
+            (Decimal('55'), 'C'), (Decimal('44.99'), 'E'), (None, None),
+        ])
+
+    def test_ungraded_enrollment_has_no_final_grade(self):
+        student = make_student()
+        enroll(student, self.course, scores=())
+        client = authenticated_client(self.lecturer)
+
+        roster = client.get(reverse('course_students', args=['DBT301'])).json()
+        self.assertEqual((roster[0]['weightedTotal'], roster[0]['letterGrade']), (None, None))
+        classes = authenticated_client(student).get(reverse('student_dashboard')).json()
+        self.assertEqual((classes[0]['weightedTotal'], classes[0]['letterGrade']), (None, None))
+        courses = authenticated_client(student).get(reverse('student_transcript')).json()
+        self.assertEqual((courses[0]['weightedTotal'], courses[0]['letterGrade']), (None, None))
+
+        response = client.patch(
+            reverse('course_student_grades', args=['DBT301', student.pk]), {'finals': 0}, format='json',
+        )
+        self.assertEqual((response.json()['weightedTotal'], response.json()['letterGrade']), (0.0, 'E'))
+
+    def test_roster_and_dashboards_expose_final_grade(self):
+        student = make_student()
+        enroll(student, self.course)  # 80*30% + 70*30% + 90*40% = 81
+        enroll(make_student('bob'), self.course, scores=(('Final Exam', 50, 100),))
+
+        client = authenticated_client(self.lecturer)
+        # course + ETag fingerprint + enrollments with their totals
+        with self.assertNumQueries(3):
+            roster = client.get(reverse('course_students', args=['DBT301'])).json()
+        self.assertEqual([(row['weightedTotal'], row['letterGrade']) for row in roster], [(81.0, 'A-'), (50.0, 'D')])
+
+        course = client.get(reverse('lecturer_dashboard')).json()[0]
+        self.assertEqual(course['averageTotal'], 65.5)
+        self.assertEqual(course['students'][1]['letterGrade'], 'D')
+
+        classes = authenticated_client(student).get(reverse('student_dashboard')).json()
+        self.assertEqual((classes[0]['weightedTotal'], classes[0]['letterGrade']), (81.0, 'A-'))
+
+        response = client.patch(
+            reverse('course_student_grades', args=['DBT301', student.pk]), {'finals': 40}, format='json',
+        )
+        self.assertEqual((response.json()['weightedTotal'], response.json()['letterGrade']), (61.0, 'C+'))
+
+
+@skipUnless(np is not None, 'NumPy is not installed')
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class CourseStatisticsTests(TestCase):
+    def setUp(self):
+        statistics_cache.clear()
+        self.lecturer = make_lecturer()
+        self.course = make_course('DBT401', self.lecturer)
+        self.other = make_course('DBT402', self.lecturer)
+        self.midterms = [55, 62.5, 71, 71, 88, 100]
+        for index, value in enumerate(self.midterms):
+            enroll(make_student(f's{index}'), self.course, scores=(('Midterm', value, 30), ('Final Exam', 90 - index, 40)))
+        self.url = reverse('lecturer_statistics')
+
+    def test_statistics_match_numpy_per_group(self):
+        statistics = course_statistics([self.course.pk, self.other.pk])
+        self.assertEqual(statistics[self.other.pk], [])
+        finals, midterm = statistics[self.course.pk]
+        self.assertEqual((finals['name'], midterm['name']), ('Final Exam', 'Midterm'))
+
+        values = np.array(self.midterms)
+        self.assertEqual(midterm['count'], 6)
+        self.assertEqual(midterm['mean'], round(float(values.mean()), 2))
+        self.assertEqual(midterm['median'], 71.0)
+        self.assertEqual(midterm['std'], round(float(values.std()), 2))
+        self.assertEqual((midterm['min'], midterm['max']), (55.0, 100.0))
+        self.assertEqual(midterm['percentiles'], {
+            str(q): round(float(np.percentile(values, q)), 2) for q in (10, 25, 75, 90)
+        })
+        self.assertEqual(midterm['histogram']['counts'], [0, 0, 0, 0, 0, 1, 1, 2, 1, 1])
+        self.assertEqual(finals['histogram']['counts'], [0, 0, 0, 0, 0, 0, 0, 0, 5, 1])
+
+    def test_endpoint_is_cached_until_scores_change(self):
+        client = authenticated_client(self.lecturer)
+        # courses + every score of both courses
+        with self.assertNumQueries(2):
+            first = client.get(self.url)
+        with self.assertNumQueries(1):
+            self.assertEqual(client.get(self.url).json(), first.json())
+
+        Score.objects.filter(enrollment__course=self.course, assessment_name='Midterm').update(score=50)
+        midterm = client.get(self.url).json()[0]['assessments'][1]
+        self.assertEqual((midterm['mean'], midterm['std']), (50.0, 0.0))
+
+    def test_endpoint_rejects_students(self):
+        response = authenticated_client(make_student('eve')).get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class DashboardCacheTests(TestCase):
+    def setUp(self):
+        dashboard_cache.clear()
+        self.lecturer = make_lecturer()
+        self.student = make_student()
+        self.course = make_course('DBT201', self.lecturer)
+        self.enrollment = enroll(self.student, self.course)
+        self.student_client = authenticated_client(self.student)
+        self.lecturer_client = authenticated_client(self.lecturer)
+
+    def test_cached_dashboards_need_no_queries(self):
+        first = self.student_client.get(reverse('student_dashboard'))
+        self.lecturer_client.get(reverse('lecturer_dashboard'))
+
+        with self.assertNumQueries(0):
+            second = self.student_client.get(reverse('student_dashboard'))
+        with self.assertNumQueries(0):
+            self.lecturer_client.get(reverse('lecturer_dashboard'))
+
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(second['Cache-Control'], 'private, no-cache, must-revalidate, max-age=0')
+        self.assertEqual(dashboard_cache.stats()['hits'], 2)
+        self.assertEqual(dashboard_cache.stats()['misses'], 2)
+
+    def test_score_change_evicts_student_and_lecturer(self):
+        self.student_client.get(reverse('student_dashboard'))
+        self.lecturer_client.get(reverse('lecturer_dashboard'))
+
+        Score.objects.filter(enrollment=self.enrollment, assessment_name='Midterm').update(score=55)
+
+        student_view = self.student_client.get(reverse('student_dashboard')).json()
+        lecturer_view = self.lecturer_client.get(reverse('lecturer_dashboard')).json()
+        self.assertEqual(student_view[0]['grades']['midterm'], 55.0)
+        self.assertEqual(lecturer_view[0]['students'][0]['grades']['midterm'], 55.0)
+        self.assertEqual(dashboard_cache.stats()['hits'], 0)
+
+    def test_schedule_and_course_changes_evict_audience(self):
+        self.student_client.get(reverse('student_dashboard'))
+
+        schedule = CourseSchedule.objects.get(course=self.course, room='R0')
+        schedule.room = 'X9'
+        schedule.save()
+        self.assertEqual(self.student_client.get(reverse('student_dashboard')).json()[0]['schedule']['room'], 'X9')
+
+        self.course.name = 'Renamed'
+        self.course.save()
+        self.assertEqual(self.student_client.get(reverse('student_dashboard')).json()[0]['name'], 'Renamed')
+
+    def test_lru_bound_and_counters(self):
+        cache = ScopedLRUCache(max_entries=2, timeout=60)
+        cache.set(('student', 1, 'Fall 2023'), ['a'])
+        cache.set(('student', 2, 'Fall 2023'), ['b'])
+        self.assertEqual(cache.get(('student', 1, 'Fall 2023')), ['a'])
+        cache.set(('student', 3, 'Fall 2023'), ['c'])
+
+        self.assertIsNone(cache.get(('student', 2, 'Fall 2023')))
+        cache.invalidate_owners([1])
+        self.assertIsNone(cache.get(('student', 1, 'Fall 2023')))
+        self.assertEqual(
+            cache.stats(),
+            {
+                'size': 1, 'max_entries': 2, 'hits': 1, 'misses': 2, 'hit_rate': 1 / 3,
+                'evictions': 1, 'invalidations': 1,
+            },
+        )
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ETagRevalidationTests(TestCase):
+    def setUp(self):
+        dashboard_cache.clear()
+        self.lecturer = make_lecturer()
+        self.student = make_student()
+        self.course = make_course('DBT201', self.lecturer)
+        self.enrollment = enroll(self.student, self.course)
+
+    def assertRevalidates(self, client, url, queries):
+        first = client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['Cache-Control'], 'private, no-cache, must-revalidate, max-age=0')
+
+        dashboard_cache.clear()
+        with self.assertNumQueries(queries):
+            second = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b'')
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        score = self.enrollment.scores.get(assessment_name='Midterm')
+        score.score = 12
+        score.save()
+        third = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(third.status_code, 200)
+        self.assertNotEqual(third['ETag'], first['ETag'])
+
+    def test_student_dashboard(self):
+        # fingerprint only
+        self.assertRevalidates(authenticated_client(self.student), reverse('student_dashboard'), 1)
+
+    def test_lecturer_dashboard(self):
+        # fingerprint only
+        self.assertRevalidates(authenticated_client(self.lecturer), reverse('lecturer_dashboard'), 1)
+
+    def test_course_roster(self):
+        # course + fingerprint
+        self.assertRevalidates(authenticated_client(self.lecturer), reverse('course_students', args=['DBT201']), 2)
+
+    def test_schedule_change_changes_dashboard_etag(self):
+        dashboards = (
+            (authenticated_client(self.student), reverse('student_dashboard')),
+            (authenticated_client(self.lecturer), reverse('lecturer_dashboard')),
+        )
+
+        def assertChanges(change):
+            etags = [client.get(url)['ETag'] for client, url in dashboards]
+            change()
+            for (client, url), etag in zip(dashboards, etags):
+                self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200, url)
+
+        first, second = self.course.schedules.order_by('pk')
+        # Not the most recently updated schedule, so only the count can notice.
+        assertChanges(first.delete)
+        second.room = 'Lab 9'
+        assertChanges(second.save)
+
+    def assertUserChangeChangesETag(self, client, url, user, **changes):
+        first = client.get(url)
+        for field, value in changes.items():
+            setattr(user, field, value)
+        user.save()
+        dashboard_cache.clear()
+        second = client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        return second
+
+    def test_lecturer_rename_changes_student_dashboard_etag(self):
+        response = self.assertUserChangeChangesETag(
+            authenticated_client(self.student), reverse('student_dashboard'), self.lecturer,
+            first_name='Ada', last_name='Lovelace',
+        )
+        self.assertEqual(response.json()[0]['lecturer'], 'Ada Lovelace')
+
+    def test_student_rename_changes_lecturer_dashboard_etag(self):
+        response = self.assertUserChangeChangesETag(
+            authenticated_client(self.lecturer), reverse('lecturer_dashboard'), self.student, full_name='Renamed',
+        )
+        self.assertEqual(response.json()[0]['students'][0]['name'], 'Renamed')
+
+    def test_student_email_change_changes_roster_etag(self):
+        response = self.assertUserChangeChangesETag(
+            authenticated_client(self.lecturer), reverse('course_students', args=['DBT201']), self.student,
+            email='renamed@student.prasetiyamulya.ac.id',
+        )
+        self.assertEqual(response.json()[0]['email'], 'renamed@student.prasetiyamulya.ac.id')
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class GradebookUploadTests(TestCase):
+    def setUp(self):
+        self.lecturer = make_lecturer()
+        self.course = make_course('DBT201', self.lecturer)
+        self.client = authenticated_client(self.lecturer)
+        self.url = reverse('course_gradebook', args=['dbt201'])
+
+    def _roster(self, size, start=0):
+        return [
+            enroll(make_student(f's{index}'), self.course, scores=(('Midterm', 10, 0),)).student
+            for index in range(start, start + size)
+        ]
+
+    def _upload(self, students):
+        rows = [{'student_id': student.pk, 'classwork': 81, 'midterm': 72, 'finals': 93} for student in students]
+        Semester.objects.active()  # cached per process, as in a warm worker
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {'grades': rows}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json(), len(queries)
+
+    def test_query_count_does_not_grow_with_roster(self):
+        small, small_queries = self._upload(self._roster(3))
+        large, large_queries = self._upload(self._roster(40, start=3))
+
+        self.assertEqual(small, {'students': 3, 'created': 6, 'updated': 3})
+        self.assertEqual(large, {'students': 40, 'created': 80, 'updated': 40})
+        self.assertEqual(small_queries, large_queries)
+        self.assertLess(large_queries, 25)
+
+        summary = GradeSummary.objects.get(enrollment__student__username='s10')
+        self.assertEqual(summary.as_grades(), {'classwork': 81.0, 'midterm': 72.0, 'finals': 93.0})
+        # the existing zero weight is replaced by the default, as in CourseStudentsView.patch
+        self.assertEqual(summary.weighted_total, Decimal('83.10'))
+
+    def test_invalid_rows_are_reported_and_nothing_is_saved(self):
+        student = self._roster(1)[0]
+        outsider = make_student('outsider')
+        response = self.client.post(self.url, [
+            {'student_id': student.pk, 'midterm': 50},
+            {'student_id': student.pk, 'finals': 'abc'},
+            {'email': outsider.email, 'finals': 60},
+            {'student_id': student.pk, 'classwork': 140},
+            {'classwork': 10},
+        ], format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], [
+            {'row': 2, 'errors': ['Duplicate of row 1.', 'finals must be a number.']},
+            {'row': 3, 'errors': ['Student is not enrolled in this course.']},
+            {'row': 4, 'errors': ['Duplicate of row 1.', 'classwork must be between 0 and 100.']},
+            {'row': 5, 'errors': ['Either student_id or email is required.']},
+        ])
+        self.assertEqual(Score.objects.get(enrollment__student=student).score, Decimal('10'))
+
+    def test_csv_body_and_command(self):
+        first, second = self._roster(2)
+        csv_text = f'email,classwork,midterm\n{first.email.upper()},55,\n'
+        response = self.client.generic('POST', self.url, csv_text, content_type='text/csv')
+        self.assertEqual(response.json(), {'students': 1, 'created': 1, 'updated': 0})
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'grades.json'
+            path.write_text(json.dumps([{'student_id': second.pk, 'finals': 77}]))
+            call_command('import_gradebook', 'DBT201', str(path), stdout=StringIO())
+        self.assertEqual(GradeSummary.objects.get(enrollment__student=second).finals, Decimal('77'))
+
+    def test_other_lecturers_are_forbidden(self):
+        response = authenticated_client(make_lecturer('other')).post(self.url, [], format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_retaken_course_is_graded_in_the_active_semester(self):
+        student = make_student()
+        earlier = enroll(student, self.course, semester='Fall 2023', scores=(('Midterm', 10, 30),))
+        current = enroll(student, self.course, semester='Spring 2024', scores=(('Midterm', 20, 30),))
+
+        response = self.client.post(self.url, [{'student_id': student.pk, 'midterm': 66}], format='json')
+        self.assertEqual(response.json(), {'students': 1, 'created': 0, 'updated': 1})
+        self.assertEqual(earlier.scores.get().score, Decimal('10'))
+        self.assertEqual(current.scores.get().score, Decimal('66'))
+
+        grades = reverse('course_student_grades', args=['DBT201', student.pk])
+        response = self.client.patch(grades, {'midterm': 70}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(current.scores.get().score, Decimal('70'))
+
+        response = self.client.patch(f'{grades}?semester=Fall 2023', {'midterm': 40}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(earlier.scores.get().score, Decimal('40'))
+        self.assertEqual(current.scores.get().score, Decimal('70'))
+
+        response = self.client.post(f'{self.url}?semester=Fall 2022', [{'student_id': student.pk}], format='json')
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class RosterPaginationTests(TestCase):
+    def setUp(self):
+        dashboard_cache.clear()
+        self.lecturer = make_lecturer()
+        self.course = make_course('DBT201', self.lecturer)
+        self.students = [enroll(make_student(f's{index:02d}'), self.course).student for index in range(25)]
+        self.client = authenticated_client(self.lecturer)
+
+    def test_cursor_walk_forward_and_back(self):
+        url = reverse('course_students', args=['DBT201'])
+        seen = []
+        pages = []
+        next_url = f'{url}?page_size=10'
+        while next_url:
+            # course + fingerprint + page
+            with self.assertNumQueries(3):
+                page = self.client.get(next_url).json()
+            seen.extend(student['id'] for student in page['results'])
+            pages.append(page)
+            next_url = page['next']
+
+        self.assertEqual(seen, sorted(student.pk for student in self.students))
+        self.assertEqual([len(page['results']) for page in pages], [10, 10, 5])
+        self.assertIsNone(pages[0]['previous'])
+        back = self.client.get(pages[-1]['previous']).json()
+        self.assertEqual(back['results'], pages[1]['results'])
+
+    def test_unpaginated_roster_is_unchanged(self):
+        response = self.client.get(reverse('course_students', args=['DBT201']))
+        self.assertIsInstance(response.json(), list)
+        self.assertEqual(len(response.json()), 25)
+
+    def test_lecturer_dashboard_first_page_links_to_roster(self):
+        # fingerprint + courses + schedules + sliced enrollments + scores
+        with self.assertNumQueries(5):
+            course = self.client.get(reverse('lecturer_dashboard'), {'page_size': 20}).json()[0]
+        self.assertEqual(course['totalStudents'], 25)
+        self.assertEqual(len(course['students']), 20)
+
+        rest = self.client.get(course['studentsNext']).json()
+        self.assertEqual(len(rest['results']), 5)
+        self.assertIsNone(rest['next'])
+        self.assertEqual(
+            [student['id'] for student in course['students']] + [student['id'] for student in rest['results']],
+            [student.pk for student in self.students],
+        )
+
+        self.assertNotIn('studentsNext', self.client.get(reverse('lecturer_dashboard')).json()[0])
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class StreamingResponseTests(TestCase):
+    def setUp(self):
+        dashboard_cache.clear()
+        self.lecturer = make_lecturer()
+        self.client = authenticated_client(self.lecturer)
+        for code in ('DBT201', 'AIR220'):
+            course = make_course(code, self.lecturer)
+            for index in range(4):
+                enroll(make_student(f'{code.lower()}_{index}'), course)
+        student = User.objects.get(username='dbt201_0')
+        student.full_name = 'Dewi \u2028 Ananda \u00e9'
+        student.save()
+        make_course('EMPTY1', self.lecturer)
+
+    def assertStreamsSameBytes(self, url):
+        buffered = self.client.get(url)
+        dashboard_cache.clear()
+        streamed = self.client.get(url, {'stream': '1'})
+
+        self.assertTrue(streamed.streaming)
+        self.assertEqual(b''.join(streamed.streaming_content), buffered.content)
+        self.assertEqual(streamed['Content-Type'], buffered['Content-Type'])
+        self.assertEqual(streamed['ETag'], buffered['ETag'])
+        self.assertEqual(streamed['Cache-Control'], buffered['Cache-Control'])
+
+    def test_roster_stream_is_byte_compatible(self):
+        self.assertStreamsSameBytes(reverse('course_students', args=['DBT201']))
+        self.assertStreamsSameBytes(reverse('course_students', args=['EMPTY1']))
+
+    def test_lecturer_dashboard_stream_is_byte_compatible(self):
+        self.assertStreamsSameBytes(reverse('lecturer_dashboard'))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class GradebookExportTests(TestCase):
+    def setUp(self):
+        self.lecturer = make_lecturer()
+        self.course = make_course('DBT201', self.lecturer)
+        self.other = make_course('AIR220', make_lecturer('other'))
+        self.first = enroll(make_student('first'), self.course)
+        self.second = enroll(make_student('second'), self.course, scores=(('Quiz 1', 66, 10),))
+        enroll(make_student('spring'), self.course, semester='Spring 2024')
+        enroll(self.first.student, self.other)
+        self.client = authenticated_client(self.lecturer)
+
+    def read_csv(self, response):
+        self.assertTrue(response.streaming)
+        return list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_course_csv_has_one_row_per_student_and_column_per_assessment(self):
+        url = reverse('course_gradebook_export', args=['dbt201', 'csv'])
+        rows = self.read_csv(self.client.get(url, {'semester': 'Fall 2023'}))
+
+        self.assertEqual(rows[0], [
+            'course', 'semester', 'student_id', 'username', 'name', 'email',
+            'Classwork', 'Final Exam', 'Midterm', 'Quiz 1', 'weighted_total',
+        ])
+        self.assertEqual(rows[1][3:], ['first', 'First', 'first@student.prasetiyamulya.ac.id', '80.00', '90.00', '70.00', '', '81.00'])
+        self.assertEqual(rows[2][6:], ['', '', '', '66.00', '6.60'])
+        self.assertEqual(len(rows), 3)
+
+    def test_semester_csv_only_includes_own_courses(self):
+        response = self.client.get(reverse('semester_gradebook_export', args=['Fall 2023', 'csv']))
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="fall-2023-grades.csv"')
+        rows = self.read_csv(response)
+        self.assertEqual([row[0] for row in rows[1:]], ['DBT201', 'DBT201'])
+
+    def test_xlsx_export(self):
+        response = self.client.get(reverse('course_gradebook_export', args=['DBT201', 'xlsx']))
+        self.assertEqual(response.status_code, 200)
+        workbook = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        sheet = workbook.read('xl/worksheets/sheet1.xml').decode()
+        self.assertIn('<v>81</v>', sheet)
+
+    def test_students_cannot_export(self):
+        client = authenticated_client(self.first.student)
+        self.assertEqual(client.get(reverse('course_gradebook_export', args=['DBT201', 'csv'])).status_code, 403)
+        self.assertEqual(client.get(reverse('semester_gradebook_export', args=['Fall 2023', 'csv'])).status_code, 403)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.student = make_student()
+        self.token = Token.objects.create(user=self.student)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_second_request_skips_token_query(self):
+        authentication = CachedTokenAuthentication()
+        with self.assertNumQueries(1):
+            user, token = authentication.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            cached_user, cached_token = authentication.authenticate_credentials(self.token.key)
+
+        self.assertEqual(cached_user, self.student)
+        self.assertTrue(cached_user.is_student)
+        self.assertEqual(cached_token.key, self.token.key)
+        self.assertEqual(cached_token.user_id, self.student.pk)
+        self.assertEqual(token_cache.stats()['hits'], 1)
+        self.assertEqual(token_cache.stats()['misses'], 1)
+        # deferred columns still load on demand
+        self.assertTrue(cached_user.check_password('student123'))
+
+    def test_logout_revokes_cached_token(self):
+        self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 200)
+        self.assertEqual(self.client.post(reverse('logout')).status_code, 200)
+        self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 401)
+
+    def test_deactivation_revokes_cached_token(self):
+        self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 200)
+        self.student.is_active = False
+        self.student.save()
+        self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 401)
+
+    def test_unknown_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token missing')
+        self.assertEqual(self.client.get(reverse('student_dashboard')).status_code, 401)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ClaimsJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        dashboard_cache.clear()
+        self.lecturer = make_lecturer()
+        self.student = make_student()
+        self.course = make_course('DBT201', self.lecturer)
+        enroll(self.student, self.course)
+        Semester.objects.active()
+
+    def jwt_client(self, username, password):
+        response = APIClient().post(reverse('token_obtain_pair'), {'username': username, 'password': password})
+        self.assertEqual(response.status_code, 200, response.content)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.json()['access']}")
+        return client
+
+    def test_reads_authorize_from_claims_without_user_query(self):
+        student = self.jwt_client('student', 'student123')
+        lecturer = self.jwt_client('lecturer', 'lecturer123')
+        student.get(reverse('student_dashboard'))
+        lecturer.get(reverse('lecturer_dashboard'))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(student.get(reverse('student_dashboard')).status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(lecturer.get(reverse('lecturer_dashboard')).status_code, 200)
+        self.assertEqual(student.get(reverse('lecturer_dashboard')).status_code, 403)
+
+    def test_writes_load_the_user(self):
+        lecturer = self.jwt_client('lecturer', 'lecturer123')
+        url = reverse('course_student_grades', args=['DBT201', self.student.pk])
+        self.assertEqual(lecturer.patch(url, {'midterm': 50}, format='json').status_code, 200)
+
+        self.lecturer.is_active = False
+        self.lecturer.save()
+        self.assertEqual(lecturer.patch(url, {'midterm': 60}, format='json').status_code, 401)
+
+    def test_refresh_reissues_role_claims_from_the_user_row(self):
+        other_course = make_course('AIR220', make_lecturer('other'))
+        enroll(self.student, other_course)
+        self.lecturer.is_staff = True
+        self.lecturer.save()
+        response = APIClient().post(reverse('token_obtain_pair'), {'username': 'lecturer', 'password': 'lecturer123'})
+        refresh = response.json()['refresh']
+
+        self.lecturer.is_staff = False
+        self.lecturer.is_lecturer = False
+        self.lecturer.save()
+        response = APIClient().post(reverse('token_refresh'), {'refresh': refresh})
+        self.assertEqual(response.status_code, 200, response.content)
+        access = AccessToken(response.json()['access'])
+        self.assertFalse(access['is_staff'])
+        self.assertFalse(access['is_lecturer'])
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(client.get(reverse('course_students', args=['AIR220'])).status_code, 403)
+        self.assertEqual(client.get(reverse('lecturer_dashboard')).status_code, 403)
+
+        self.lecturer.is_active = False
+        self.lecturer.save()
+        self.assertEqual(APIClient().post(reverse('token_refresh'), {'refresh': refresh}).status_code, 401)
+
+    def test_tokens_without_role_claims_fall_back_to_database(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.student)}')
+        # user row + ETag fingerprint + enrollments + schedules
+        with self.assertNumQueries(4):
+            self.assertEqual(client.get(reverse('student_dashboard')).status_code, 200)
+
+
+@override_settings(PASSWORD_HASHERS=COUNTING_HASHERS)
+class EmailLoginTests(TestCase):
+    def setUp(self):
+        self.student = make_student('alice')
+        CountingMD5PasswordHasher.calls = 0
+        throttle_store.clear()
+        self.url = reverse('login')
+
+    def login(self, identifier, password='student123'):
+        return APIClient().post(self.url, {'username': identifier, 'password': password}, format='json')
+
+    def test_email_login_hashes_once(self):
+        response = self.login('Alice@Student.Prasetiyamulya.ac.id')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['username'], 'alice')
+        self.assertEqual(CountingMD5PasswordHasher.calls, 1)
+
+    def test_username_login_hashes_once(self):
+        self.assertEqual(self.login('alice').status_code, 200)
+        self.assertEqual(CountingMD5PasswordHasher.calls, 1)
+
+    def test_failed_logins_hash_once(self):
+        self.assertEqual(self.login('alice@student.prasetiyamulya.ac.id', 'wrong').status_code, 401)
+        self.assertEqual(self.login('nobody@example.com').status_code, 401)
+        self.assertEqual(CountingMD5PasswordHasher.calls, 2)
+
+    def test_username_match_wins_over_email_match(self):
+        impostor = make_student('bob')
+        impostor.username = 'alice@student.prasetiyamulya.ac.id'
+        impostor.set_password('impostor123')
+        impostor.save()
+
+        response = self.login('alice@student.prasetiyamulya.ac.id', 'impostor123')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['id'], impostor.pk)
+
+    def test_inactive_user_cannot_log_in(self):
+        User.objects.filter(pk=self.student.pk).update(is_active=False)
+        self.assertEqual(self.login('alice@student.prasetiyamulya.ac.id').status_code, 401)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class PasswordHashingAdmissionTests(TestCase):
+    def setUp(self):
+        make_student('alice')
+        throttle_store.clear()
+        self.url = reverse('login')
+
+    def login(self, identifier='alice', password='student123', ip='10.0.0.1'):
+        return APIClient(REMOTE_ADDR=ip).post(self.url, {'username': identifier, 'password': password}, format='json')
+
+    def test_full_slots_reject_immediately_with_retry_after(self):
+        held = 0
+        while hashing_slots.try_acquire():
+            held += 1
+        try:
+            response = self.login()
+        finally:
+            for _ in range(held):
+                hashing_slots.release()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(self.login().status_code, 200)
+
+    def test_identity_throttle_spans_addresses(self):
+        limit = LoginIdentityThrottle().num_requests
+        for attempt in range(limit):
+            self.assertEqual(self.login(password='wrong', ip=f'10.0.1.{attempt}').status_code, 401)
+
+        response = self.login(ip='10.0.2.1')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(self.login('ALICE@student.prasetiyamulya.ac.id', ip='10.0.2.2').status_code, 200)
+
+    def test_reads_are_not_throttled(self):
+        lecturer = make_lecturer()
+        for _ in range(LoginIdentityThrottle().num_requests + 1):
+            self.login(password='wrong')
+        response = authenticated_client(lecturer).get(reverse('lecturer_dashboard'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_sliding_window_weights_previous_window(self):
+        store = SlidingWindowStore()
+        for _ in range(4):
+            self.assertIsNone(store.hit('key', 4, 60, now=0))
+        self.assertAlmostEqual(store.hit('key', 4, 60, now=30), 30.0)
+        # One second into the next window the previous four still count as 3.93.
+        self.assertIsNone(store.hit('key', 4, 60, now=61))
+        # The next slot opens once a quarter of the previous window has slid out (t=75).
+        self.assertAlmostEqual(store.hit('key', 4, 60, now=61), 14.0)
+        self.assertIsNone(store.hit('other', 4, 60, now=61))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class ProvisionUsersCommandTests(TestCase):
+    def write_csv(self, rows):
+        handle = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, newline='')
+        self.addCleanup(Path(handle.name).unlink)
+        writer = csv.writer(handle)
+        writer.writerow(['username', 'email', 'password', 'first_name', 'last_name'])
+        writer.writerows(rows)
+        handle.close()
+        return handle.name
+
+    def test_provisions_roles_and_tokens_idempotently(self):
+        make_student('existing')
+        path = self.write_csv([
+            ['dina', 'Dina@student.prasetiyamulya.ac.id', 'dina-pass', 'Dina', 'Putri'],
+            ['eko', 'eko@prasetiyamulya.ac.id', 'eko-pass', 'Eko', 'Wibowo'],
+            ['existing', 'other@student.prasetiyamulya.ac.id', 'x', 'Ex', 'Isting'],
+            ['gmail', 'someone@gmail.com', 'x', 'G', 'Mail'],
+            ['dina2', 'dina@student.prasetiyamulya.ac.id', 'x', 'Dina', 'Again'],
+        ])
+
+        out = StringIO()
+        call_command('provision_users', path, '--workers', '2', '--batch-size', '1', stdout=out, stderr=StringIO())
+
+        self.assertIn('Created 2 users, skipped 3 of 5 rows', out.getvalue())
+        dina = User.objects.get(username='dina')
+        self.assertEqual((dina.email, dina.role, dina.is_student, dina.full_name),
+                         ('dina@student.prasetiyamulya.ac.id', 'student', True, 'Dina Putri'))
+        self.assertTrue(dina.check_password('dina-pass'))
+        eko = User.objects.get(username='eko')
+        self.assertEqual((eko.role, eko.is_lecturer), ('lecturer', True))
+        self.assertEqual(Token.objects.filter(user__in=[dina, eko]).count(), 2)
+
+        out = StringIO()
+        call_command('provision_users', path, '--workers', '1', stdout=out, stderr=StringIO())
+        self.assertIn('Created 0 users', out.getvalue())
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class SyntheticDatasetTests(TestCase):
+    def generate(self, seed=7):
+        call_command(
+            'create_dummy_data', '--students', '40', '--lecturers', '3', '--courses', '6',
+            '--semesters', '2', '--courses-per-student', '3', '--seed', str(seed), stdout=StringIO(),
+        )
+        return list(
+            Enrollment.objects.filter(student__username__startswith='load.')
+            .order_by('pk')
+            .values_list('student__username', 'course__code', 'semester__name', 'grade_summary__weighted_total')
+        )
+
+    def test_generates_requested_shape_deterministically(self):
+        first = self.generate()
+
+        self.assertEqual(len(first), 40 * 2 * 3)
+        self.assertEqual({row[2] for row in first}, {'Spring 2023', 'Fall 2023'})
+        self.assertEqual(Score.objects.filter(enrollment__student__username__startswith='load.').count(), 40 * 2 * 3 * 3)
+        self.assertEqual(self.generate(), first)
+        self.assertNotEqual(self.generate(seed=8), first)
+
+    def test_summaries_match_a_rebuild(self):
+        self.generate()
+        enrollments = Enrollment.objects.filter(student__username__startswith='load.')
+        before = list(GradeSummary.objects.filter(enrollment__in=enrollments).order_by('enrollment_id')
+                      .values_list('enrollment_id', 'classwork', 'midterm', 'finals', 'weighted_total'))
+
+        GradeSummary.objects.refresh(enrollments.values_list('pk', flat=True))
+
+        after = list(GradeSummary.objects.filter(enrollment__in=enrollments).order_by('enrollment_id')
+                     .values_list('enrollment_id', 'classwork', 'midterm', 'finals', 'weighted_total'))
+        self.assertEqual(len(before), 240)
+        self.assertEqual(before, after)
+
+
+class EndpointRegressionSuiteTests(TestCase):
+    """Runs benchmark_endpoints at two sizes so an N+1 on any route fails the test suite."""
+
+    def test_query_counts_do_not_grow_with_dataset(self):
+        output = Path(tempfile.mkdtemp()) / 'endpoints.json'
+        self.addCleanup(output.unlink, missing_ok=True)
+
+        call_command(
+            'benchmark_endpoints', '--sizes', 'small', 'medium', '--repeat', '1', '--output', str(output),
+            stdout=StringIO(), stderr=StringIO(),
+        )
+
+        report = json.loads(output.read_text())
+        self.assertEqual(report['failures'], [])
+        self.assertIn('lecturer_dashboard', report['results'])
+        self.assertEqual(set(report['results']['course_students']), {'small', 'medium'})
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, SERVER_TIMING_ENABLED=True, SERVER_TIMING_SLOW_MS=0)
+class ServerTimingMiddlewareTests(TestCase):
+    def setUp(self):
+        dashboard_cache.clear()
+        self.lecturer = make_lecturer()
+        course = make_course('DBT201', self.lecturer)
+        enroll(make_student('alice'), course)
+
+    def test_reports_phases_and_logs_slow_requests(self):
+        with self.assertLogs('users.timing', 'WARNING') as logs:
+            response = authenticated_client(self.lecturer).get(reverse('lecturer_dashboard'))
+
+        timing = {entry.split(';')[0]: entry for entry in response['Server-Timing'].split(', ')}
+        self.assertEqual(set(timing), {'auth', 'db', 'view', 'render', 'total'})
+        self.assertIn('desc="5 queries"', timing['db'])
+        self.assertIn('Slow request GET /api/auth/dashboard/lecturer/', logs.output[0])
+
+    @override_settings(SERVER_TIMING_ENABLED=False)
+    def test_disabled_by_default(self):
+        response = authenticated_client(self.lecturer).get(reverse('lecturer_dashboard'))
+        self.assertNotIn('Server-Timing', response)
+
+    def test_repeated_statements_are_grouped_without_parameters(self):
+        def run(sql, params, many, context):
+            return None
+
+        timings = RequestTimings()
+        for pk in (1, 2, 3):
+            timings.execute(run, 'SELECT * FROM users_score WHERE enrollment_id = %s', (pk,), False, {})
+        timings.execute(run, 'SELECT 1', (), False, {})
+
+        (sql, count, _seconds), = timings.repeated_statements()
+        self.assertEqual((sql, count), ('SELECT * FROM users_score WHERE enrollment_id = %s', 3))
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS, SERVER_TIMING_ENABLED=True)
+class ServerTimingConnectionTests(TransactionTestCase):
+    # Other connections only see committed rows.
+    @override_settings(DATABASE_REPLICA='replica', DATABASE_ROUTERS=['users.routers.ReplicaRouter'])
+    def test_counts_replica_queries(self):
+        dashboard_cache.clear()
+        student = make_student()
+        enroll(student, make_course('DBT201', make_lecturer()))
+        Semester.objects.active()
+        client = authenticated_client(student)
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / 'replica.sqlite3')
+            call_command('sync_replica', '--replica', path, stdout=StringIO())
+            connections['replica'] = SQLiteDatabaseWrapper(
+                dict(connections['default'].settings_dict, NAME=f'file:{path}?mode=ro'), 'replica',
+            )
+            try:
+                with CaptureQueriesContext(connections['replica']) as replica_queries:
+                    response = client.get(reverse('student_dashboard'))
+            finally:
+                connections['replica'].close()
+                del connections['replica']
+        self.assertTrue(replica_queries.captured_queries)
+        self.assertIn(f'desc="{len(replica_queries)} queries"', response['Server-Timing'])
+
+    def test_counts_queries_from_orm_threads(self):
+        def query():
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+            finally:
+                connection.close()
+
+        def view(request):
+            # What an async view's ORM call does: a worker thread with its own connection.
+            async_to_sync(sync_to_async(query, thread_sensitive=False))()
+            return HttpResponse()
+
+        response = ServerTimingMiddleware(view)(RequestFactory().get('/'))
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class HotLookupIndexTests(TestCase):
+    def setUp(self):
+        self.student = make_student('alice')
+        self.enrollment = enroll(self.student, make_course('DBT201', make_lecturer()))
+
+    def test_find_course_is_case_insensitive_and_indexed(self):
+        self.assertEqual(find_course('dbt201').code, 'DBT201')
+        self.assertIsNone(find_course('dbt2'))
+        plan = Course.objects.alias(code_upper=Upper('code')).filter(code_upper='DBT201').explain()
+        self.assertIn('course_code_upper_idx', plan)
+
+    def test_hot_filters_use_composite_indexes(self):
+        plans = [
+            Enrollment.objects.filter(student=self.student, semester=self.enrollment.semester_id).explain(),
+            Score.objects.filter(enrollment=self.enrollment, assessment_name='Midterm').explain(),
+        ]
+        self.assertIn('enrollment_student_sem_idx', plans[0])
+        self.assertIn('score_enrollment_name_idx', plans[1])
+
+
+class SQLiteProfileTests(TestCase):
+    def test_profile_is_applied_to_new_connections(self):
+        with tempfile.TemporaryDirectory() as directory:
+            wrapper = SQLiteDatabaseWrapper(
+                {**connection.settings_dict, 'NAME': str(Path(directory) / 'profile.sqlite3'),
+                 'OPTIONS': connection_options()},
+                alias='profile',
+            )
+            try:
+                with wrapper.cursor() as cursor:
+                    values = {
+                        name: cursor.execute(f'PRAGMA {name}').fetchone()[0]
+                        for name in ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size', 'temp_store')
+                    }
+            finally:
+                wrapper.close()
+
+        self.assertEqual(values, {
+            'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': PRAGMAS['busy_timeout'],
+            'cache_size': PRAGMAS['cache_size'], 'temp_store': 2,
+        })
+        self.assertEqual(wrapper.transaction_mode, 'IMMEDIATE')
+
+
+@override_settings(DATABASE_REPLICA='replica')
+class ReplicaRoutingTests(TestCase):
+    def route(self, method, view_class, write=False):
+        """Aliases chosen for a read, and for a read after an optional write, inside one request."""
+        router = ReplicaRouter()
+        view = view_class.as_view()
+        aliases = []
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            aliases.append(router.db_for_read(Enrollment))
+            if write:
+                router.db_for_write(Score)
+            aliases.append(router.db_for_read(Enrollment))
+
+        middleware = ReplicaReadsMiddleware(get_response)
+        middleware(getattr(RequestFactory(), method)('/'))
+        return aliases
+
+    def test_dashboard_gets_read_the_replica_until_they_write(self):
+        self.assertEqual(self.route('get', StudentDashboardView), ['replica', 'replica'])
+        self.assertEqual(self.route('get', LecturerStatisticsView, write=True), ['replica', 'default'])
+
+    def test_other_requests_use_the_primary(self):
+        self.assertEqual(self.route('patch', StudentDashboardView), ['default', 'default'])
+        self.assertEqual(self.route('get', UserLoginView), ['default', 'default'])
+        self.assertEqual(ReplicaRouter().db_for_read(Enrollment), 'default')
+        self.assertFalse(ReplicaRouter().allow_migrate('replica', 'users'))
+
+    def test_authentication_reads_the_primary(self):
+        router = ReplicaRouter()
+        aliases = []
+
+        def get_response(request):
+            middleware.process_view(request, StudentDashboardView.as_view(), (), {})
+            aliases.extend(router.db_for_read(model) for model in (Token, User, Enrollment))
+
+        middleware = ReplicaReadsMiddleware(get_response)
+        middleware(RequestFactory().get('/'))
+        self.assertEqual(aliases, ['default', 'default', 'replica'])
+
+    @override_settings(DATABASE_REPLICA=None)
+    def test_middleware_is_off_without_a_replica(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ReplicaReadsMiddleware(lambda request: None)
+
+
+class SyncReplicaCommandTests(TransactionTestCase):
+    # Committed data: the backup API waits for the primary's open write transaction.
+    def test_sync_replica_copies_the_primary(self):
+        make_student()
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / 'replica.sqlite3')
+            call_command('sync_replica', '--replica', path, stdout=StringIO())
+            replica = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+            try:
+                users = replica.execute('SELECT username FROM users_customuser').fetchall()
+                journal_mode = replica.execute('PRAGMA journal_mode').fetchone()[0]
+            finally:
+                replica.close()
+        self.assertEqual(users, [('student',)])
+        self.assertEqual(journal_mode, 'delete')
+
+    @override_settings(DATABASE_REPLICA='replica', DATABASE_ROUTERS=['users.routers.ReplicaRouter'])
+    def test_token_issued_after_the_last_sync_authenticates(self):
+        dashboard_cache.clear()
+        token_cache.clear()
+        student = make_student()
+        enroll(student, make_course('DBT201', make_lecturer()))
+        Semester.objects.forget_active()
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / 'replica.sqlite3')
+            call_command('sync_replica', '--replica', path, stdout=StringIO())
+            # Logged in after the copy: the replica has no such token yet.
+            key = Token.objects.create(user=student).key
+            connections['replica'] = SQLiteDatabaseWrapper(
+                dict(connections['default'].settings_dict, NAME=f'file:{path}?mode=ro'), 'replica',
+            )
+            try:
+                client = APIClient()
+                client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+                with CaptureQueriesContext(connections['replica']) as replica_queries:
+                    response = client.get(reverse('student_dashboard'))
+            finally:
+                connections['replica'].close()
+                del connections['replica']
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([row['code'] for row in response.json()], ['DBT201'])
+        self.assertTrue(replica_queries.captured_queries)
+
+    @override_settings(DATABASE_REPLICA='replica', DATABASE_ROUTERS=['users.routers.ReplicaRouter'])
+    def test_grade_written_before_a_sync_shows_after_it(self):
+        dashboard_cache.clear()
+        student = make_student()
+        enrollment = enroll(student, make_course('DBT201', make_lecturer()))
+        Semester.objects.forget_active()
+        client = authenticated_client(student)
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / 'replica.sqlite3')
+            call_command('sync_replica', '--replica', path, stdout=StringIO())
+            connections['replica'] = SQLiteDatabaseWrapper(
+                dict(connections['default'].settings_dict, NAME=f'file:{path}?mode=ro'), 'replica',
+            )
+            def midterm():
+                return client.get(reverse('student_dashboard')).json()[0]['grades']['midterm']
+
+            try:
+                self.assertEqual(midterm(), 70.0)
+
+                score = enrollment.scores.get(assessment_name='Midterm')
+                score.score = 11
+                score.save()
+                # Replica lag: the next sync catches it up ...
+                self.assertEqual(midterm(), 70.0)
+                call_command('sync_replica', '--replica', path, stdout=StringIO())
+                # ... and nothing read before it is served from a cache afterwards.
+                self.assertEqual(midterm(), 11.0)
+            finally:
+                connections['replica'].close()
+                del connections['replica']
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class AsyncViewTests(TestCase):
+    # Sync tests driving the views through async_to_sync, so the async ORM's
+    # thread hops land on the test's connection and assertNumQueries sees them.
+    def setUp(self):
+        dashboard_cache.clear()
+        token_cache.clear()
+        self.lecturer = make_lecturer()
+        self.student = make_student()
+        for code in ('DBT201', 'AIR220'):
+            course = make_course(code, self.lecturer)
+            enroll(self.student, course)
+            for index in range(3):
+                enroll(make_student(f'{code.lower()}_{index}'), course)
+        make_course('EMPTY1', self.lecturer)
+        Semester.objects.active()
+        self.tokens = {user.username: Token.objects.create(user=user).key for user in (self.lecturer, self.student)}
+
+    def call(self, view, route, username=None, data=None, method='get', authorization=None, **kwargs):
+        if username:
+            authorization = f'Token {self.tokens[username]}'
+        headers = {'Authorization': authorization} if authorization else {}
+        request = getattr(AsyncRequestFactory(), method)(reverse(route, kwargs=kwargs), data, headers=headers)
+
+        async def respond():
+            response = await view.as_view()(request, **kwargs)
+            if response.streaming:
+                return response, b''.join([chunk async for chunk in response])
+            return response, response.render().content
+
+        response, response.body = async_to_sync(respond)()
+        return response
+
+    def assertSameAsSync(self, view, route, username, data=None, **kwargs):
+        client = authenticated_client(User.objects.get(username=username))
+        # Streamed bodies match the buffered ones (StreamingResponseTests).
+        expected = client.get(reverse(route, kwargs=kwargs), None if data and 'stream' in data else data)
+        dashboard_cache.clear()
+        response = self.call(view, route, username, data, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, expected.content)
+        self.assertEqual(response['ETag'], expected['ETag'])
+        self.assertEqual(response['Cache-Control'], expected['Cache-Control'])
+        dashboard_cache.clear()
+
+    def test_async_views_return_what_the_sync_views_return(self):
+        self.assertSameAsSync(AsyncStudentDashboardView, 'student_dashboard', 'student')
+        for data in (None, {'page_size': 2}, {'stream': '1'}):
+            self.assertSameAsSync(AsyncLecturerDashboardView, 'lecturer_dashboard', 'lecturer', data)
+        for code in ('DBT201', 'EMPTY1'):
+            for data in (None, {'page_size': 2}, {'stream': '1'}):
+                self.assertSameAsSync(AsyncCourseStudentsView, 'course_students', 'lecturer', data, course_id=code)
+
+    def test_async_views_keep_the_query_budgets(self):
+        # The first request loads each token with afirst(); later ones hit token_cache.
+        with self.assertNumQueries(4):
+            self.call(AsyncStudentDashboardView, 'student_dashboard', 'student')
+        self.call(AsyncLecturerDashboardView, 'lecturer_dashboard', 'lecturer')
+        dashboard_cache.clear()
+        for view, route, username, kwargs, queries in (
+            (AsyncStudentDashboardView, 'student_dashboard', 'student', {}, 3),
+            (AsyncLecturerDashboardView, 'lecturer_dashboard', 'lecturer', {}, 5),
+            (AsyncCourseStudentsView, 'course_students', 'lecturer', {'course_id': 'dbt201'}, 3),
+        ):
+            with self.subTest(view=view.__name__), self.assertNumQueries(queries):
+                self.assertEqual(self.call(view, route, username, **kwargs).status_code, 200)
+
+        with self.assertNumQueries(0):
+            cached = self.call(AsyncStudentDashboardView, 'student_dashboard', 'student')
+        self.assertEqual(len(json.loads(cached.body)), 2)
+
+    def test_async_authentication_and_permissions(self):
+        response = self.call(AsyncStudentDashboardView, 'student_dashboard')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+        for view, route, username, kwargs, expected in (
+            (AsyncStudentDashboardView, 'student_dashboard', 'lecturer', {}, 403),
+            (AsyncLecturerDashboardView, 'lecturer_dashboard', 'student', {}, 403),
+            (AsyncCourseStudentsView, 'course_students', 'student', {'course_id': 'DBT201'}, 403),
+            (AsyncCourseStudentsView, 'course_students', 'lecturer', {'course_id': 'NOPE'}, 404),
+        ):
+            self.assertEqual(self.call(view, route, username, **kwargs).status_code, expected)
+        self.assertEqual(
+            self.call(AsyncStudentDashboardView, 'student_dashboard', authorization='Token nope').status_code, 401,
+        )
+        self.assertEqual(
+            self.call(AsyncCourseStudentsView, 'course_students', 'lecturer', method='patch', course_id='DBT201')
+            .status_code,
+            405,
+        )
+
+        access = CustomTokenObtainPairSerializer.get_token(self.student).access_token
+        # Role claims, so no user query: ETag fingerprint + enrollments + schedules.
+        with self.assertNumQueries(3):
+            response = self.call(AsyncStudentDashboardView, 'student_dashboard', authorization=f'Bearer {access}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.body)), 2)
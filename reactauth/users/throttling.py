@@ -0,0 +1,139 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class HashingSlots:
+    """Caps how many requests in this process may hash a password at once.
+
+    ``try_acquire()`` never blocks: when every slot is taken the caller is
+    turned away immediately instead of queueing behind the busy workers.
+    """
+
+    def __init__(self, slots):
+        self.slots = slots
+        self._semaphore = threading.BoundedSemaphore(slots)
+        self.rejected = 0
+
+    def try_acquire(self):
+        if self._semaphore.acquire(blocking=False):
+            return True
+        self.rejected += 1
+        return False
+
+    def release(self):
+        self._semaphore.release()
+
+
+class SlidingWindowStore:
+    """Approximate sliding-window counters kept in a bounded in-process LRU.
+
+    Each key holds only ``(window start, previous count, current count)``; the
+    previous window's count is weighted by how much of it still overlaps the
+    sliding window. The least recently used keys are dropped past ``max_keys``.
+    """
+
+    def __init__(self, max_keys=50000):
+        self.max_keys = max_keys
+        self._windows = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, duration, now=None):
+        """Count a request for ``key``; return None if allowed, else seconds to wait."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            started, previous, current = self._windows.pop(key, (now, 0, 0))
+            elapsed = now - started
+            if elapsed >= 2 * duration:
+                started, previous, current, elapsed = now, 0, 0, 0.0
+            elif elapsed >= duration:
+                started, previous, current = started + duration, current, 0
+                elapsed -= duration
+
+            self._windows[key] = (started, previous, current)
+            while len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+
+            if previous * (1 - elapsed / duration) + current < limit:
+                self._windows[key] = (started, previous, current + 1)
+                return None
+
+            if current < limit:
+                # The previous window's share decays enough within this window.
+                return duration * (1 - (limit - current) / previous) - elapsed
+            # Wait for this window to end and for its count to decay in the next.
+            return duration - elapsed + duration * (1 - limit / current)
+
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+
+
+hashing_slots = HashingSlots(getattr(settings, 'PASSWORD_HASHING_SLOTS', 4))
+throttle_store = SlidingWindowStore(getattr(settings, 'THROTTLE_MAX_KEYS', 50000))
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """SimpleRateThrottle backed by ``throttle_store`` instead of the Django cache."""
+
+    store = throttle_store
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        self.wait_time = self.store.hit(self.key, self.num_requests, self.duration)
+        return self.wait_time is None
+
+    def wait(self):
+        return self.wait_time
+
+
+class HashingIPThrottle(SlidingWindowThrottle):
+    scope = 'hashing_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginIdentityThrottle(SlidingWindowThrottle):
+    """Limits attempts per submitted username/email, whichever address they come from."""
+
+    scope = 'login_identity'
+
+    def get_cache_key(self, request, view):
+        identifier = request.data.get('username') or request.data.get('usernameOrEmail') or request.data.get('email')
+        if not isinstance(identifier, str) or not identifier.strip():
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': identifier.strip().lower()}
+
+
+class PasswordHashingMixin:
+    """Throttles a password-hashing view and admits it only while a hashing slot is free.
+
+    Throttles run first, so rejected requests never take a slot. A full house
+    answers 429 with ``Retry-After`` straight away rather than tying up a worker.
+    """
+
+    throttle_classes = [HashingIPThrottle, LoginIdentityThrottle]
+    retry_after = getattr(settings, 'PASSWORD_HASHING_RETRY_AFTER', 1)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not hashing_slots.try_acquire():
+            raise Throttled(wait=self.retry_after, detail='Server is busy, please retry shortly.')
+        self._holds_hashing_slot = True
+
+    def dispatch(self, request, *args, **kwargs):
+        self._holds_hashing_slot = False
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._holds_hashing_slot:
+                hashing_slots.release()
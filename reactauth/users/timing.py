@@ -0,0 +1,150 @@
+import logging
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('server_timing', default=None)
+
+
+class RequestTimings:
+    """Per-request counters filled in by the middleware, the DB wrapper and ``timed()``."""
+
+    def __init__(self):
+        self.durations = defaultdict(float)  # name -> seconds
+        self.queries = 0
+        self.statements = Counter()
+        self.statement_time = defaultdict(float)
+        self.view_started = None
+
+    def execute(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.durations['db'] += elapsed
+            # Parameters are not interpolated, so an N+1 repeats the same text.
+            self.statements[sql] += 1
+            self.statement_time[sql] += elapsed
+
+    def repeated_statements(self, limit=3):
+        return [(sql, count, self.statement_time[sql]) for sql, count in self.statements.most_common(limit) if count > 1]
+
+    def header(self):
+        entries = []
+        for name, seconds in self.durations.items():
+            entry = f'{name};dur={seconds * 1000:.1f}'
+            if name == 'db':
+                entry += f';desc="{self.queries} queries"'
+            entries.append(entry)
+        return ', '.join(entries)
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to ``name`` when the current request is being timed."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[name] += time.perf_counter() - started
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper left on every connection; counts only while a request is timed."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.execute(execute, sql, params, many, context)
+
+
+def install_query_recorder(sender=None, connection=None, **kwargs):
+    # First, so a caller's ``with connection.execute_wrapper()`` pops its own wrapper.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_query)
+
+
+class ServerTimingMiddleware:
+    """Reports SQL, auth, view and render time per request in a ``Server-Timing`` header.
+
+    Opt-in through ``SERVER_TIMING_ENABLED``. ``db`` is the total SQL time and
+    overlaps ``auth`` and ``view``; ``view`` includes authentication, and
+    ``render`` is DRF's content negotiation and serialization. Requests slower
+    than ``SERVER_TIMING_SLOW_MS`` are logged with their most repeated queries.
+
+    Queries are counted on every database alias, including the replica, and on
+    the connections of the threads async views run their ORM calls on, which
+    see this request's timings through the copied context.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'SERVER_TIMING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, 'SERVER_TIMING_SLOW_MS', 500)
+        connection_created.connect(install_query_recorder, dispatch_uid='users.timing.install_query_recorder')
+
+    def __call__(self, request):
+        # Connections of this thread that were opened before the receiver was connected.
+        for connection in connections.all():
+            install_query_recorder(connection=connection)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        finished = time.perf_counter()
+        if timings.view_started is not None and 'view' not in timings.durations:
+            # Plain and streaming responses skip process_template_response().
+            timings.durations['view'] = finished - timings.view_started
+        timings.durations['total'] = finished - started
+
+        response['Server-Timing'] = timings.header()
+        if timings.durations['total'] * 1000 >= self.slow_ms:
+            self.log_slow_request(request, timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timings = _current.get()
+        if timings is not None:
+            timings.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        timings = _current.get()
+        if timings is None or timings.view_started is None:
+            return response
+        timings.durations['view'] += time.perf_counter() - timings.view_started
+        render = response.render
+
+        def timed_render():
+            with timed('render'):
+                return render()
+
+        response.render = timed_render
+        return response
+
+    def log_slow_request(self, request, timings):
+        lines = [
+            f'{sql} -- {count}x, {seconds * 1000:.1f} ms'
+            for sql, count, seconds in timings.repeated_statements()
+        ]
+        logger.warning(
+            'Slow request %s %s: %.1f ms, %d queries (%s)%s',
+            request.method, request.get_full_path(), timings.durations['total'] * 1000, timings.queries,
+            timings.header(), ''.join(f'\n  {line}' for line in lines),
+        )
@@ -1,24 +1,51 @@
+from django.conf import settings
 from django.urls import path
 
 from .views import (
+    AsyncCourseStudentsView,
+    AsyncLecturerDashboardView,
+    AsyncStudentDashboardView,
     LecturerDashboardView,
     LecturerRegistrationView,
+    LecturerStatisticsView,
+    CourseGradebookExportView,
+    CourseGradebookView,
     CourseStudentsView,
+    SemesterGradebookExportView,
     StudentDashboardView,
     StudentRegistrationView,
+    StudentTranscriptView,
+    TokenObtainView,
+    TokenRefreshView,
     UserLoginView,
     UserLogoutView,
     UnifiedRegistrationView,
 )
 
+if getattr(settings, 'ASYNC_VIEWS', False):
+    student_dashboard = AsyncStudentDashboardView
+    lecturer_dashboard = AsyncLecturerDashboardView
+    course_roster = AsyncCourseStudentsView
+else:
+    student_dashboard = StudentDashboardView
+    lecturer_dashboard = LecturerDashboardView
+    course_roster = CourseStudentsView
+
 urlpatterns = [
     path('register/', UnifiedRegistrationView.as_view(), name='register'),
     path('register/student/', StudentRegistrationView.as_view(), name='register_student'),
     path('register/lecturer/', LecturerRegistrationView.as_view(), name='register_lecturer'),
     path('login/', UserLoginView.as_view(), name='login'),
     path('logout/', UserLogoutView.as_view(), name='logout'),
-    path('dashboard/student/', StudentDashboardView.as_view(), name='student_dashboard'),
-    path('dashboard/lecturer/', LecturerDashboardView.as_view(), name='lecturer_dashboard'),
-    path('courses/<str:course_id>/students/', CourseStudentsView.as_view(), name='course_students'),
+    path('token/', TokenObtainView.as_view(), name='token_obtain_pair'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('dashboard/student/', student_dashboard.as_view(), name='student_dashboard'),
+    path('dashboard/student/transcript/', StudentTranscriptView.as_view(), name='student_transcript'),
+    path('dashboard/lecturer/', lecturer_dashboard.as_view(), name='lecturer_dashboard'),
+    path('dashboard/lecturer/statistics/', LecturerStatisticsView.as_view(), name='lecturer_statistics'),
+    path('courses/<str:course_id>/students/', course_roster.as_view(), name='course_students'),
     path('courses/<str:course_id>/students/<int:student_id>/grades/', CourseStudentsView.as_view(), name='course_student_grades'),
+    path('courses/<str:course_id>/gradebook/', CourseGradebookView.as_view(), name='course_gradebook'),
+    path('courses/<str:course_id>/gradebook/export/<str:file_format>/', CourseGradebookExportView.as_view(), name='course_gradebook_export'),
+    path('semesters/<str:semester>/gradebook/export/<str:file_format>/', SemesterGradebookExportView.as_view(), name='semester_gradebook_export'),
 ]
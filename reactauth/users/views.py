@@ -1,37 +1,196 @@
+import csv
+import inspect
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth import authenticate, get_user_model
-from rest_framework import permissions, status
-from rest_framework.authentication import TokenAuthentication
+from django.db.models import Avg, Count, Prefetch
+from django.db.models.functions import Upper
+from django.http import FileResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.text import slugify
+from rest_framework import exceptions, permissions, status
 from rest_framework.authtoken.models import Token
+from rest_framework.parsers import BaseParser, FormParser, JSONParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import Course, CourseSchedule, Enrollment, Score
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView as BaseTokenRefreshView
+from .archive import transcript
+from .authentication import CachedTokenAuthentication, ClaimsJWTAuthentication
+from .cache import dashboard_cache, statistics_cache
+from .etags import (
+    acourse_roster_etag,
+    alecturer_dashboard_etag,
+    astudent_dashboard_etag,
+    course_roster_etag,
+    etag_matches,
+    lecturer_dashboard_etag,
+    make_etag,
+    student_dashboard_etag,
+)
+from .exports import csv_chunks, gradebook_rows, write_xlsx, xlsxwriter
+from .gradebook import SCORE_MAP, GradebookImport, parse_gradebook_csv, write_scores
+from .models import Course, CourseSchedule, Enrollment, GradeSummary, Semester, role_for_email
+from .pagination import RosterCursorPagination
+from .routers import reading_replica
+from .serializers import CustomTokenObtainPairSerializer, CustomTokenRefreshSerializer
+from .statistics import course_statistics, np
+from .streaming import (
+    CHUNK_SIZE as STREAM_CHUNK_SIZE,
+    ajson_array_chunks,
+    ajson_object_chunks,
+    json_array_chunks,
+    json_object_chunks,
+    streaming_json_response,
+)
+from .throttling import PasswordHashingMixin
 
 User = get_user_model()
 
 
 def _apply_no_cache_headers(response):
-    """Prevent dashboard responses from being cached (no back button revisit)."""
-    response['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
+    """Keep dashboard responses out of shared caches and force revalidation on every visit.
+
+    Browsers may keep a private copy, but must check its ETag with the server
+    before reusing it, so a logged-out client gets a 401 instead of stale data.
+    """
+    response['Cache-Control'] = 'private, no-cache, must-revalidate, max-age=0'
     response['Pragma'] = 'no-cache'
     response['Expires'] = '0'
     return response
 
 
-def summarize_scores(score_qs):
-    summary = {'classwork': 0, 'midterm': 0, 'finals': 0}
-    for score in score_qs:
-        label = score.assessment_name.lower()
-        value = float(score.score)
-        if 'class' in label or 'assignment' in label:
-            summary['classwork'] = value
-        elif 'mid' in label:
-            summary['midterm'] = value
-        elif 'final' in label:
-            summary['finals'] = value
-    return summary
+def _versioned_response(request, data, etag):
+    """200 with ``data``, or an empty 304 when the client already holds ``etag``."""
+    if etag_matches(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data, status=status.HTTP_200_OK)
+    response['ETag'] = etag
+    return _apply_no_cache_headers(response)
+
+
+def wants_stream(request):
+    """Opt-in incremental JSON rendering with ?stream=1."""
+    return request.query_params.get('stream') in ('1', 'true')
+
+
+def find_course(course_code):
+    # UPPER(code) = ? can use course_code_upper_idx; code__iexact compiles to a LIKE that cannot.
+    try:
+        return Course.objects.alias(code_upper=Upper('code')).get(code_upper=course_code.upper())
+    except Course.DoesNotExist:
+        return None
+
+
+async def afind_course(course_code):
+    try:
+        return await Course.objects.alias(code_upper=Upper('code')).aget(code_upper=course_code.upper())
+    except Course.DoesNotExist:
+        return None
+
+
+def grading_semester(request):
+    # A student can take a course again in a later semester; grades go to the
+    # ?semester= named one, or the active one, never to whichever row comes first.
+    name = request.query_params.get('semester')
+    if name:
+        return Semester.objects.filter(name=name).first()
+    return Semester.objects.active()
+
 
+def enrollment_grades(enrollment):
+    """Read the grade columns from the enrollment's materialized GradeSummary row."""
+    try:
+        return enrollment.grade_summary.as_grades()
+    except GradeSummary.DoesNotExist:
+        return {'classwork': 0, 'midterm': 0, 'finals': 0}
+
+
+def final_grade(enrollment):
+    """Payload fields for an enrollment loaded through ``with_final_grade()``; null until graded."""
+    return {
+        'weightedTotal': None if enrollment.final_total is None else float(enrollment.final_total),
+        'letterGrade': enrollment.letter_grade,
+    }
+
+
+def ordered_schedules_prefetch(lookup='schedules'):
+    """Prefetch schedules in primary key order so ``first_schedule`` matches ``.first()``."""
+    return Prefetch(
+        lookup,
+        queryset=CourseSchedule.objects.order_by('pk'),
+        to_attr='ordered_schedules',
+    )
+
+
+def first_schedule(course):
+    schedules = getattr(course, 'ordered_schedules', None)
+    if schedules is None:
+        return course.schedules.first()
+    return schedules[0] if schedules else None
+
+
+def serialize_schedule(schedule):
+    if not schedule:
+        return None
+    return {
+        'day': schedule.day,
+        'start': schedule.start_time.strftime('%H:%M'),
+        'end': schedule.end_time.strftime('%H:%M'),
+        'room': schedule.room,
+    }
 
-class BaseRegistrationView(APIView):
+
+class AsyncAPIViewMixin:
+    """Lets an APIView's handlers be coroutines, for ASGI deployments (``ASYNC_VIEWS``).
+
+    APIView.dispatch() is synchronous. This one keeps DRF's request wrapping,
+    permission checks, exception handling and rendering, but awaits the handler
+    and authenticates with each class's ``aauthenticate()`` (classes without one
+    run in a thread). Every handler of the view must be async.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.aperform_authentication(request)
+            self.initial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            # OPTIONS is answered by APIView.options(), which is sync.
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def aperform_authentication(self, request):
+        """Async Request._authenticate(): the first authenticator to return a user wins."""
+        for authenticator in request.authenticators:
+            authenticate = getattr(authenticator, 'aauthenticate', None) or sync_to_async(authenticator.authenticate)
+            try:
+                user_auth_tuple = await authenticate(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        request._not_authenticated()
+
+
+class BaseRegistrationView(PasswordHashingMixin, APIView):
     permission_classes = [permissions.AllowAny]
     role_flag = None  # 'is_student' or 'is_lecturer'
     role_value = None  # optional string stored in CustomUser.role
@@ -76,7 +235,7 @@ class LecturerRegistrationView(BaseRegistrationView):
     role_value = 'instructor'
 
 
-class UnifiedRegistrationView(APIView):
+class UnifiedRegistrationView(PasswordHashingMixin, APIView):
     permission_classes = [permissions.AllowAny]
 
     def post(self, request):
@@ -89,12 +248,7 @@ class UnifiedRegistrationView(APIView):
             )
 
         email = request.data['email'].strip().lower()
-        role = None
-        if email.endswith('@student.prasetiyamulya.ac.id'):
-            role = 'student'
-        elif email.endswith('@prasetiyamulya.ac.id'):
-            role = 'lecturer'
-
+        role = role_for_email(email)
         if role is None:
             return Response(
                 {'detail': 'Email must use a Prasetiya Mulya domain.'},
@@ -133,7 +287,7 @@ class UnifiedRegistrationView(APIView):
         )
 
 
-class UserLoginView(APIView):
+class UserLoginView(PasswordHashingMixin, APIView):
     permission_classes = [permissions.AllowAny]
 
     def post(self, request):
@@ -143,18 +297,8 @@ class UserLoginView(APIView):
         if not username or not password:
             return Response({'detail': 'Username/Email and password are required.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # First try to authenticate with the provided username/email directly
+        # The EmailOrUsernameBackend resolves either identifier and hashes only once.
         user = authenticate(request, username=username, password=password)
-        
-        # If that fails and the username looks like an email, try to find the user by email
-        if user is None and '@' in username:
-            try:
-                user_obj = User.objects.get(email=username)
-                # Try to authenticate with the found username
-                user = authenticate(request, username=user_obj.username, password=password)
-            except User.DoesNotExist:
-                return Response({'detail': 'Invalid credentials.'}, status=status.HTTP_401_UNAUTHORIZED)
-        
         if user is None:
             return Response({'detail': 'Invalid credentials.'}, status=status.HTTP_401_UNAUTHORIZED)
 
@@ -182,8 +326,16 @@ class UserLoginView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+class TokenObtainView(PasswordHashingMixin, TokenObtainPairView):
+    serializer_class = CustomTokenObtainPairSerializer
+
+
+class TokenRefreshView(BaseTokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
+
+
 class UserLogoutView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request):
@@ -192,124 +344,312 @@ class UserLogoutView(APIView):
 
 
 class StudentDashboardView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication, ClaimsJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    # GETs may read from the replica (users.routers.ReplicaReadsMiddleware).
+    replica_reads = True
 
     def get(self, request):
         if not request.user.is_student:
             return Response({'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN)
 
-        # Get current semester enrollments for the student
-        current_semester = "Fall 2023"  # You might want to make this dynamic
-        enrollments = (
+        # Get current semester enrollments for the student. The active semester
+        # is cached in-process, so this is normally free.
+        semester = Semester.objects.active()
+        semester_id = semester.pk if semester else None
+        cache_key = ('student', request.user.pk, semester_id)
+        cached = dashboard_cache.get(cache_key)
+        if cached is None:
+            etag = student_dashboard_etag(request.user, semester_id)
+            if etag_matches(request, etag):
+                return _versioned_response(request, None, etag)
+            cached = (etag, self.get_classes(request.user, semester_id))
+            if not reading_replica():
+                dashboard_cache.set(cache_key, cached)
+
+        etag, classes = cached
+        return _versioned_response(request, classes, etag)
+
+    def get_classes(self, user, semester_id):
+        return [self._class_payload(enrollment) for enrollment in self._class_enrollments(user, semester_id)]
+
+    def _class_enrollments(self, user, semester_id):
+        return (
             Enrollment.objects.filter(
-                student=request.user,
-                semester=current_semester,
+                student=user,
+                semester_id=semester_id,
             )
-            .select_related('course', 'course__lecturer')
-            .prefetch_related('scores')
+            .with_final_grade()
+            .select_related('course', 'course__lecturer', 'grade_summary')
+            .prefetch_related(ordered_schedules_prefetch('course__schedules'))
         )
 
-        classes = []
-        for enrollment in enrollments:
-            course = enrollment.course
-            schedule = course.schedules.first()
-            schedule_info = None
-            if schedule:
-                schedule_info = {
-                    'day': schedule.day,
-                    'start': schedule.start_time.strftime('%H:%M'),
-                    'end': schedule.end_time.strftime('%H:%M'),
-                    'room': schedule.room,
-                }
-
-            classes.append({
-                'id': course.code,
-                'code': course.code,
-                'name': course.name,
-                'schedule': schedule_info,
-                'lecturer': course.lecturer.get_full_name() if course.lecturer else 'TBA',
-                'grades': summarize_scores(enrollment.scores.all()),
-            })
-
-        response = Response(classes, status=status.HTTP_200_OK)
-        return _apply_no_cache_headers(response)
+    def _class_payload(self, enrollment):
+        course = enrollment.course
+        return {
+            'id': course.code,
+            'code': course.code,
+            'name': course.name,
+            'schedule': serialize_schedule(first_schedule(course)),
+            'lecturer': course.lecturer.get_full_name() if course.lecturer else 'TBA',
+            'grades': enrollment_grades(enrollment),
+            **final_grade(enrollment),
+        }
+
+
+class AsyncStudentDashboardView(AsyncAPIViewMixin, StudentDashboardView):
+    async def get(self, request):
+        if not request.user.is_student:
+            return Response({'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN)
+
+        semester = await Semester.objects.aactive()
+        semester_id = semester.pk if semester else None
+        cache_key = ('student', request.user.pk, semester_id)
+        cached = dashboard_cache.get(cache_key)
+        if cached is None:
+            etag = await astudent_dashboard_etag(request.user, semester_id)
+            if etag_matches(request, etag):
+                return _versioned_response(request, None, etag)
+            enrollments = self._class_enrollments(request.user, semester_id)
+            cached = (etag, [self._class_payload(enrollment) async for enrollment in enrollments])
+            if not reading_replica():
+                dashboard_cache.set(cache_key, cached)
+
+        etag, classes = cached
+        return _versioned_response(request, classes, etag)
+
+
+class StudentTranscriptView(APIView):
+    """Every course the student has taken, including semesters moved to the archive."""
+
+    authentication_classes = [CachedTokenAuthentication, ClaimsJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    replica_reads = True
+
+    def get(self, request):
+        if not request.user.is_student:
+            return Response({'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN)
+        return Response(transcript(request.user))
 
 
 class LecturerDashboardView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication, ClaimsJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    replica_reads = True
 
     def get(self, request):
         if not request.user.is_lecturer:
             return Response({'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN)
-            
-        # Get courses taught by the lecturer
-        courses = Course.objects.filter(lecturer=request.user).prefetch_related('schedules', 'enrollments')
-        
+
+        # Opt-in: ?page_size=N returns the first N students of each course plus a
+        # cursor link into CourseStudentsView for the rest.
+        paginator = RosterCursorPagination()
+        page_size = paginator.get_page_size(request) if paginator.is_requested(request) else None
+        host = request.get_host() if page_size else None
+
+        if not page_size and wants_stream(request):
+            etag = make_etag(lecturer_dashboard_etag(request.user), page_size, host)
+            if etag_matches(request, etag):
+                return _versioned_response(request, None, etag)
+            response = streaming_json_response(self.stream_courses_data(request.user))
+            response['ETag'] = etag
+            return _apply_no_cache_headers(response)
+
+        # The lecturer dashboard spans every semester the lecturer has taught.
+        cache_key = ('lecturer', request.user.pk, None, page_size, host)
+        cached = dashboard_cache.get(cache_key)
+        if cached is None:
+            etag = make_etag(lecturer_dashboard_etag(request.user), page_size, host)
+            if etag_matches(request, etag):
+                return _versioned_response(request, None, etag)
+            cached = (etag, self.get_courses_data(request.user, page_size, request))
+            if not reading_replica():
+                dashboard_cache.set(cache_key, cached)
+
+        etag, courses_data = cached
+        return _versioned_response(request, courses_data, etag)
+
+    def _courses(self, user):
+        return (
+            Course.objects.filter(lecturer=user)
+            # grade_summary is one-to-one, so joining it does not inflate the count.
+            .annotate(
+                total_students=Count('enrollments'),
+                average_total=Avg('enrollments__grade_summary__weighted_total'),
+            )
+        )
+
+    def _enrollments(self):
+        return (
+            Enrollment.objects.with_final_grade()
+            .select_related('student', 'grade_summary')
+            .prefetch_related('scores')
+        )
+
+    def _course_head(self, course):
+        return {
+            'id': course.code,
+            'code': course.code,
+            'name': course.name,
+            'totalStudents': course.total_students,
+            'averageTotal': round(float(course.average_total or 0), 2),
+            'schedule': serialize_schedule(first_schedule(course)),
+        }
+
+    def _student_payload(self, enrollment):
+        return {
+            'id': enrollment.student.id,
+            'name': enrollment.student.full_name,
+            'email': enrollment.student.email,
+            'grades': enrollment_grades(enrollment),
+            **final_grade(enrollment),
+            'scores': [{
+                'name': score.assessment_name,
+                'score': float(score.score),
+                'weight': float(score.weight)
+            } for score in enrollment.scores.all()]
+        }
+
+    def get_courses_data(self, user, page_size=None, request=None):
+        return self._courses_payload(self._listed_courses(user, page_size), page_size, request)
+
+    def _listed_courses(self, user, page_size=None):
+        # Get courses taught by the lecturer. Every relation the payload touches is
+        # prefetched up front so the query count does not grow with the roster.
+        enrollments = self._enrollments()
+        if page_size:
+            # Sliced prefetches are limited per course with a window function.
+            enrollments = enrollments.order_by(*RosterCursorPagination.ordering)[:page_size + 1]
+        else:
+            enrollments = enrollments.order_by('pk')
+        return self._courses(user).prefetch_related(
+            ordered_schedules_prefetch(),
+            Prefetch('enrollments', queryset=enrollments, to_attr='listed_enrollments'),
+        )
+
+    def _courses_payload(self, courses, page_size=None, request=None):
         courses_data = []
         for course in courses:
-            schedule = course.schedules.first()  # Get the first schedule for this course
-            enrollments = course.enrollments.select_related('student').all()
-            
-            # Calculate course statistics
-            total_students = enrollments.count()
-            course_data = {
-                'id': course.code,
-                'code': course.code,
-                'name': course.name,
-                'totalStudents': total_students,
-                'schedule': {
-                    'day': schedule.day if schedule else None,
-                    'start': schedule.start_time.strftime('%H:%M') if schedule else None,
-                    'end': schedule.end_time.strftime('%H:%M') if schedule else None,
-                    'room': schedule.room if schedule else None
-                } if schedule else None,
-                'students': [{
-                    'id': enrollment.student.id,
-                    'name': enrollment.student.full_name,
-                    'email': enrollment.student.email,
-                    'scores': [{
-                        'name': score.assessment_name,
-                        'score': float(score.score),
-                        'weight': float(score.weight)
-                    } for score in enrollment.scores.all()]
-                } for enrollment in enrollments]
-            }
+            enrollments = course.listed_enrollments
+            students_next = None
+            if page_size:
+                roster_url = request.build_absolute_uri(reverse('course_students', args=[course.code]))
+                students_next = RosterCursorPagination().first_page_next_link(roster_url, enrollments, page_size)
+                enrollments = enrollments[:page_size]
+            course_data = self._course_head(course)
+            course_data['students'] = [self._student_payload(enrollment) for enrollment in enrollments]
+            if page_size:
+                course_data['studentsNext'] = students_next
             courses_data.append(course_data)
-        
-        response = Response(courses_data, status=status.HTTP_200_OK)
-        return _apply_no_cache_headers(response)
+        return courses_data
+
+    def stream_courses_data(self, user):
+        """Yield the get_courses_data() payload as JSON, reading each roster in chunks."""
+        courses = list(self._courses(user).prefetch_related(ordered_schedules_prefetch()))
+
+        def course_chunks(course):
+            enrollments = (
+                self._enrollments().filter(course=course).order_by('pk')
+                .iterator(chunk_size=STREAM_CHUNK_SIZE)
+            )
+            students = (self._student_payload(enrollment) for enrollment in enrollments)
+            return json_object_chunks(self._course_head(course), 'students', students)
+
+        yield b'['
+        for index, course in enumerate(courses):
+            if index:
+                yield b','
+            yield from course_chunks(course)
+        yield b']'
+
+
+class AsyncLecturerDashboardView(AsyncAPIViewMixin, LecturerDashboardView):
+    async def get(self, request):
+        if not request.user.is_lecturer:
+            return Response({'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN)
+
+        paginator = RosterCursorPagination()
+        page_size = paginator.get_page_size(request) if paginator.is_requested(request) else None
+        host = request.get_host() if page_size else None
+
+        if not page_size and wants_stream(request):
+            etag = make_etag(await alecturer_dashboard_etag(request.user), page_size, host)
+            if etag_matches(request, etag):
+                return _versioned_response(request, None, etag)
+            response = streaming_json_response(self.astream_courses_data(request.user))
+            response['ETag'] = etag
+            return _apply_no_cache_headers(response)
+
+        cache_key = ('lecturer', request.user.pk, None, page_size, host)
+        cached = dashboard_cache.get(cache_key)
+        if cached is None:
+            etag = make_etag(await alecturer_dashboard_etag(request.user), page_size, host)
+            if etag_matches(request, etag):
+                return _versioned_response(request, None, etag)
+            courses = [course async for course in self._listed_courses(request.user, page_size)]
+            cached = (etag, self._courses_payload(courses, page_size, request))
+            if not reading_replica():
+                dashboard_cache.set(cache_key, cached)
+
+        etag, courses_data = cached
+        return _versioned_response(request, courses_data, etag)
+
+    async def astream_courses_data(self, user):
+        courses = [course async for course in self._courses(user).prefetch_related(ordered_schedules_prefetch())]
+        yield b'['
+        for index, course in enumerate(courses):
+            if index:
+                yield b','
+            enrollments = (
+                self._enrollments().filter(course=course).order_by('pk')
+                .aiterator(chunk_size=STREAM_CHUNK_SIZE)
+            )
+            students = (self._student_payload(enrollment) async for enrollment in enrollments)
+            async for chunk in ajson_object_chunks(self._course_head(course), 'students', students):
+                yield chunk
+        yield b']'
+
+
+class LecturerStatisticsView(APIView):
+    """Score statistics per assessment for every course on the lecturer's dashboard."""
+
+    authentication_classes = [CachedTokenAuthentication, ClaimsJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    replica_reads = True
+
+    def get(self, request):
+        if not request.user.is_lecturer:
+            return Response({'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN)
+        if np is None:
+            return Response(
+                {'detail': 'Course statistics require NumPy.'}, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        courses = list(Course.objects.filter(lecturer=request.user).order_by('pk').values_list('pk', 'code', 'name'))
+        cached = {course_id: statistics_cache.get(('course', course_id)) for course_id, _code, _name in courses}
+        # Every course that is not cached is computed from one query.
+        missing = [course_id for course_id, assessments in cached.items() if assessments is None]
+        if missing:
+            for course_id, assessments in course_statistics(missing).items():
+                if not reading_replica():
+                    statistics_cache.set(('course', course_id), assessments)
+                cached[course_id] = assessments
+
+        return Response([
+            {'id': code, 'code': code, 'name': name, 'assessments': cached[course_id]}
+            for course_id, code, name in courses
+        ])
 
 
 class CourseStudentsView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication, ClaimsJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    replica_reads = True
 
-    SCORE_MAP = {
-        'classwork': ('Classwork', 30.0),
-        'midterm': ('Midterm', 30.0),
-        'finals': ('Final Exam', 40.0),
-    }
+    SCORE_MAP = SCORE_MAP
 
     def _get_course(self, course_code):
-        lookup = course_code.upper()
-        try:
-            return Course.objects.get(code__iexact=lookup)
-        except Course.DoesNotExist:
-            return None
-
-    def _grades_from_scores(self, enrollment):
-        grades = {key: 0 for key in self.SCORE_MAP}
-        for score in enrollment.scores.all():
-            name = score.assessment_name.lower()
-            if 'class' in name or 'assignment' in name:
-                grades['classwork'] = float(score.score)
-            elif 'mid' in name:
-                grades['midterm'] = float(score.score)
-            elif 'final' in name:
-                grades['finals'] = float(score.score)
-        return grades
+        return find_course(course_code)
 
     def _enrollment_response(self, enrollment):
         student = enrollment.student
@@ -317,58 +657,241 @@ class CourseStudentsView(APIView):
             'id': student.id,
             'name': student.full_name or student.get_full_name() or student.username,
             'email': student.email,
-            'grades': self._grades_from_scores(enrollment),
+            'grades': enrollment_grades(enrollment),
+            **final_grade(enrollment),
         }
 
+    def _roster(self, course):
+        return (
+            Enrollment.objects.filter(course=course)
+            .with_final_grade()
+            .select_related('student', 'grade_summary')
+        )
+
     def get(self, request, course_id):
         course = self._get_course(course_id)
         if not course:
             return Response({'detail': 'Course not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        if not request.user.is_staff and request.user != course.lecturer:
+        if not request.user.is_staff and request.user.pk != course.lecturer_id:
             return Response({'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN)
 
-        enrollments = (
-            Enrollment.objects.filter(course=course)
-            .select_related('student')
-            .prefetch_related('scores')
-        )
+        paginator = RosterCursorPagination()
+        paginated = paginator.is_requested(request)
+
+        etag = course_roster_etag(course)
+        if paginated:
+            etag = make_etag(etag, request.build_absolute_uri())
+        if etag_matches(request, etag):
+            return _versioned_response(request, None, etag)
+
+        enrollments = self._roster(course)
+        if not paginated and wants_stream(request):
+            enrollments = enrollments.iterator(chunk_size=STREAM_CHUNK_SIZE)
+            response = streaming_json_response(
+                json_array_chunks(self._enrollment_response(enrollment) for enrollment in enrollments)
+            )
+            response['ETag'] = etag
+            return _apply_no_cache_headers(response)
+
+        if paginated:
+            page = paginator.paginate_queryset(enrollments, request, view=self)
+            data = {
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+                'results': [self._enrollment_response(enrollment) for enrollment in page],
+            }
+            return _versioned_response(request, data, etag)
 
         data = [self._enrollment_response(enrollment) for enrollment in enrollments]
-        return Response(data, status=status.HTTP_200_OK)
+        return _versioned_response(request, data, etag)
 
     def patch(self, request, course_id, student_id):
         course = self._get_course(course_id)
         if not course:
             return Response({'detail': 'Course not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        if not request.user.is_staff and request.user != course.lecturer:
+        if not request.user.is_staff and request.user.pk != course.lecturer_id:
             return Response({'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN)
 
+        semester = grading_semester(request)
+        if semester is None:
+            return Response({'detail': 'Semester not found.'}, status=status.HTTP_404_NOT_FOUND)
+
         try:
             enrollment = Enrollment.objects.select_related('student').get(
-                course=course, student_id=student_id
+                course=course, student_id=student_id, semester=semester
             )
         except Enrollment.DoesNotExist:
             return Response({'detail': 'Enrollment not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        updated = {}
-        for key, (label, default_weight) in self.SCORE_MAP.items():
-            if key not in request.data:
-                continue
-            value = float(request.data[key])
-            score_obj, _created = Score.objects.get_or_create(
-                enrollment=enrollment,
-                assessment_name=label,
-                defaults={'score': value, 'weight': default_weight},
+        updated = {key: float(request.data[key]) for key in self.SCORE_MAP if key in request.data}
+        if updated:
+            write_scores({enrollment.pk: updated})
+
+        # Re-read the refreshed summary and its letter grade in one query.
+        enrollment = (
+            Enrollment.objects.with_final_grade()
+            .select_related('student', 'grade_summary')
+            .get(pk=enrollment.pk)
+        )
+        # As the roster shows it: a category with several scores is their average.
+        return Response(self._enrollment_response(enrollment), status=status.HTTP_200_OK)
+
+
+class AsyncCourseStudentsView(AsyncAPIViewMixin, CourseStudentsView):
+    # Grade PATCHes stay on CourseStudentsView (course_student_grades).
+    http_method_names = ['get', 'head', 'options']
+
+    async def get(self, request, course_id):
+        course = await afind_course(course_id)
+        if not course:
+            return Response({'detail': 'Course not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        if not request.user.is_staff and request.user.pk != course.lecturer_id:
+            return Response({'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN)
+
+        paginator = RosterCursorPagination()
+        paginated = paginator.is_requested(request)
+
+        etag = await acourse_roster_etag(course)
+        if paginated:
+            etag = make_etag(etag, request.build_absolute_uri())
+        if etag_matches(request, etag):
+            return _versioned_response(request, None, etag)
+
+        enrollments = self._roster(course)
+        if not paginated and wants_stream(request):
+            enrollments = enrollments.aiterator(chunk_size=STREAM_CHUNK_SIZE)
+            response = streaming_json_response(
+                ajson_array_chunks(self._enrollment_response(enrollment) async for enrollment in enrollments)
             )
-            score_obj.score = value
-            if score_obj.weight in (None, 0):
-                score_obj.weight = default_weight
-            score_obj.save()
-            updated[key] = value
+            response['ETag'] = etag
+            return _apply_no_cache_headers(response)
+
+        if paginated:
+            # CursorPagination fetches the page itself, synchronously.
+            page = await sync_to_async(paginator.paginate_queryset)(enrollments, request, view=self)
+            data = {
+                'next': paginator.get_next_link(),
+                'previous': paginator.get_previous_link(),
+                'results': [self._enrollment_response(enrollment) for enrollment in page],
+            }
+            return _versioned_response(request, data, etag)
 
-        response_data = self._enrollment_response(enrollment)
-        if updated:
-            response_data['grades'].update(updated)
-        return Response(response_data, status=status.HTTP_200_OK)
+        data = [self._enrollment_response(enrollment) async for enrollment in enrollments]
+        return _versioned_response(request, data, etag)
+
+
+class CSVTextParser(BaseParser):
+    media_type = 'text/csv'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream.read().decode('utf-8-sig')
+
+
+class CourseGradebookView(APIView):
+    """Upload a whole course's grades as JSON or CSV in a single request."""
+
+    authentication_classes = [CachedTokenAuthentication, ClaimsJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [JSONParser, CSVTextParser, MultiPartParser, FormParser]
+
+    def _rows(self, request):
+        if isinstance(request.data, str):
+            return parse_gradebook_csv(request.data)
+        upload = request.FILES.get('file')
+        if upload is not None:
+            return parse_gradebook_csv(upload.read().decode('utf-8-sig'))
+        if isinstance(request.data, dict):
+            return request.data.get('grades')
+        return request.data
+
+    def post(self, request, course_id):
+        course = find_course(course_id)
+        if not course:
+            return Response({'detail': 'Course not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        if not request.user.is_staff and request.user.pk != course.lecturer_id:
+            return Response({'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            rows = self._rows(request)
+        except (UnicodeDecodeError, csv.Error):
+            return Response({'detail': 'Gradebook file could not be read.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        semester = grading_semester(request)
+        if semester is None:
+            return Response({'detail': 'Semester not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        gradebook = GradebookImport(course, rows, semester)
+        if not gradebook.is_valid():
+            return Response(
+                {'detail': 'Gradebook contains errors; nothing was saved.', 'errors': gradebook.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        students = gradebook.save()
+        return Response(
+            {'students': students, 'created': gradebook.created, 'updated': gradebook.updated},
+            status=status.HTTP_200_OK,
+        )
+
+
+class GradebookExportMixin:
+    """Stream an enrollment queryset as a CSV or constant-memory XLSX gradebook."""
+
+    def export(self, enrollments, file_format, filename):
+        rows = gradebook_rows(enrollments)
+        if file_format == 'csv':
+            response = StreamingHttpResponse(csv_chunks(rows), content_type='text/csv; charset=utf-8')
+        elif file_format == 'xlsx':
+            if xlsxwriter is None:
+                return Response(
+                    {'detail': 'XLSX export requires the xlsxwriter package.'},
+                    status=status.HTTP_501_NOT_IMPLEMENTED,
+                )
+            response = FileResponse(
+                write_xlsx(rows),
+                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            )
+        else:
+            return Response({'detail': 'Format must be csv or xlsx.'}, status=status.HTTP_404_NOT_FOUND)
+
+        response['Content-Disposition'] = f'attachment; filename="{filename}.{file_format}"'
+        return _apply_no_cache_headers(response)
+
+
+class CourseGradebookExportView(GradebookExportMixin, APIView):
+    authentication_classes = [CachedTokenAuthentication, ClaimsJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, course_id, file_format):
+        course = find_course(course_id)
+        if not course:
+            return Response({'detail': 'Course not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+        if not request.user.is_staff and request.user.pk != course.lecturer_id:
+            return Response({'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN)
+
+        enrollments = Enrollment.objects.filter(course=course)
+        semester = request.query_params.get('semester')
+        if semester:
+            enrollments = enrollments.filter(semester__name=semester)
+        return self.export(enrollments, file_format, f'{course.code}-grades')
+
+
+class SemesterGradebookExportView(GradebookExportMixin, APIView):
+    """Every course the lecturer teaches (or every course, for staff) in one semester."""
+
+    authentication_classes = [CachedTokenAuthentication, ClaimsJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, semester, file_format):
+        if not (request.user.is_staff or request.user.is_lecturer):
+            return Response({'detail': 'Forbidden.'}, status=status.HTTP_403_FORBIDDEN)
+
+        enrollments = Enrollment.objects.filter(semester__name=semester)
+        if not request.user.is_staff:
+            enrollments = enrollments.filter(course__lecturer=request.user)
+        return self.export(enrollments, file_format, f"{slugify(semester)}-grades")